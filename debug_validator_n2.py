@@ -1,10 +1,5 @@
-import sys
-import os
 import time
 
-# Adjust sys.path to allow importing
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))
-
 try:
     from solvers.heuristic import solve_k4_n_greater_equal_6_heuristic, validate_solution
 except ImportError as e:
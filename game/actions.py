@@ -0,0 +1,119 @@
+from functools import lru_cache
+
+from game.environment import GameState
+from game.compact import get_engine
+
+class ActionSpace:
+    """
+    Stable integer indexing of every safe boat load of size 1..K for a given (N, K).
+
+    Action i is CompactEngine.boat_groups[i]: groups are ordered by size, then by the
+    bit positions of their members (a_1..a_N, then A_1..A_N), so an index means the
+    same load on every run and machine. Legal-action masks are "bit-arrays" packed
+    into a Python int (bit i set = action i is legal), like every other mask here.
+    """
+
+    def __init__(self, N: int, K: int):
+        self.N = N
+        self.K = K
+        self.engine = get_engine(N, K)
+        self.groups = self.engine.boat_groups
+        self.all_actions = (1 << len(self.groups)) - 1
+        self._index = {group: i for i, group in enumerate(self.groups)}
+        # containing[b]: bit-array of the actions whose load includes individual b
+        containing = [0] * (2 * N)
+        for i, group in enumerate(self.groups):
+            while group:
+                low = group & -group
+                containing[low.bit_length() - 1] |= 1 << i
+                group ^= low
+        self._containing = containing
+        without_agents = self.all_actions
+        for agent_bit in range(N, 2 * N):
+            without_agents &= ~containing[agent_bit]
+        self._without_agents = without_agents
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def index(self, move) -> int:
+        """Action index of a paper-format move; ValueError if it is not a safe load of size 1..K."""
+        mask = self.engine.group_to_mask(move)
+        if mask not in self._index:
+            raise ValueError(f"{move!r} is not a safe boat load of size 1..{self.K}.")
+        return self._index[mask]
+
+    def group_index(self, group: int) -> int | None:
+        """Action index of a boat-group bitmask, or None if it is not an action."""
+        return self._index.get(group)
+
+    def move(self, action: int) -> list[str]:
+        """Paper-format move of an action index, e.g. ['A_2', 'a_2']."""
+        return self.engine.mask_to_group(self.groups[action])
+
+    def legal_action_mask(self, state) -> int:
+        """
+        Bit-array of the actions that are legal from `state` (a GameState or compact code).
+        Works on whole bit-arrays of actions, O(N) big-int operations per call, instead of
+        trying each load: a load is legal iff it lies on the boat's bank (the source) and
+        both the source without it and the destination with it are safe.
+        """
+        code = self.engine.encode(state) if isinstance(state, GameState) else state
+        N = self.N
+        containing = self._containing
+        left = code >> 1
+        source = left if code & 1 else self.engine.full_mask ^ left
+        destination = self.engine.full_mask ^ source
+
+        # Loads made only of people on the source bank
+        legal = self.all_actions
+        for bit in range(2 * N):
+            if not (source >> bit) & 1:
+                legal &= ~containing[bit]
+        if not legal:
+            return 0
+
+        # Source stays safe: every agent leaves, or every actor left behind keeps its agent
+        all_agents_leave = legal
+        actors_covered = legal
+        for i in range(N):
+            actor_bit, agent_bit = i, N + i
+            if (source >> agent_bit) & 1:
+                all_agents_leave &= containing[agent_bit]
+            if (source >> actor_bit) & 1:
+                # The actor leaves, or its agent is on the source bank and stays
+                stays_with_agent = ~containing[agent_bit] if (source >> agent_bit) & 1 else 0
+                actors_covered &= containing[actor_bit] | stays_with_agent
+        legal &= all_agents_leave | actors_covered
+
+        # Destination stays safe: no agent there afterwards, or every actor there has its agent
+        no_agents_arrive = self._without_agents if not destination >> N else 0
+        actors_paired = legal
+        for i in range(N):
+            actor_bit, agent_bit = i, N + i
+            if (destination >> agent_bit) & 1:
+                continue # Whoever of actor i ends up there is with their agent
+            if (destination >> actor_bit) & 1:
+                actors_paired &= containing[agent_bit]
+            else:
+                actors_paired &= ~containing[actor_bit] | containing[agent_bit]
+        return legal & (no_agents_arrive | actors_paired)
+
+    def legal_actions(self, state) -> list[int]:
+        """Indexes of the legal actions from `state`, in increasing order."""
+        mask = self.legal_action_mask(state)
+        actions = []
+        while mask:
+            low = mask & -mask
+            actions.append(low.bit_length() - 1)
+            mask ^= low
+        return actions
+
+@lru_cache(maxsize=None)
+def get_action_space(N: int, K: int) -> ActionSpace:
+    """Shared, cached ActionSpace for (N, K)."""
+    return ActionSpace(N, K)
+
+def legal_action_mask(state: GameState) -> int:
+    """Bit-array of the legal actions from `state` over get_action_space(state.N, state.boat_capacity)."""
+    return get_action_space(state.N, state.boat_capacity).legal_action_mask(state)
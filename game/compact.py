@@ -0,0 +1,184 @@
+import itertools
+from functools import cached_property, lru_cache
+
+from game.environment import GameState
+from game.rules import ACTOR_AGENT
+
+# Failure reasons reported by CompactEngine.check_moves, in the order validate_solution checks them.
+INVALID_BOAT_SIZE = "invalid_boat_size"
+NOT_ON_SOURCE_BANK = "not_on_source_bank"
+UNSAFE_BOAT = "unsafe_boat"
+UNSAFE_BANK = "unsafe_bank"
+NOT_WIN = "not_win"
+
+class CompactEngine:
+    """
+    Integer ("compact") encoding of puzzle states for a fixed N, K and rule set
+    (game.rules; Actor-Agent by default).
+
+    Individuals are mapped to bits: actor a_i is bit (i-1), agent A_i is bit (N+i-1)
+    (for Missionaries & Cannibals, M_i and C_i). A bank is the bitmask of the
+    individuals standing on it, and a full state is packed into a single int:
+
+        code = (left_bank_mask << 1) | boat_on_left
+
+    The right bank is implied (everyone not on the left), so codes are unique
+    and can be used directly as dict keys or stored in flat integer arrays.
+    """
+
+    def __init__(self, N: int, boat_capacity: int, rules=ACTOR_AGENT):
+        self.N = N
+        self.boat_capacity = boat_capacity
+        self.rules = rules
+        # is_safe(mask): the variant's safety rule compiled for this N (for Actor-Agent: every
+        # actor in the group has its own agent present, unless there are no agents at all)
+        self.is_safe = rules.compile_is_safe(N)
+        self.actor_mask = (1 << N) - 1 # Individuals of the first kind (actors, missionaries)
+        self.full_mask = (1 << (2 * N)) - 1
+        self.initial_code = (self.full_mask << 1) | 1
+        self.goal_code = 0 # Nobody on the left, boat on the right
+
+    @cached_property
+    def boat_groups(self) -> tuple[int, ...]:
+        """
+        All allowed boat loads of size 1..K (the safe ones, if the rules check the boat),
+        ordered by size then by bit positions.
+        Built on first use: it is O((2N)^K) and not needed for plain encoding/decoding.
+        """
+        check_boat = self.rules.check_boat
+        groups = []
+        for k_boat in range(1, self.boat_capacity + 1):
+            for bits in itertools.combinations(range(2 * self.N), k_boat):
+                mask = 0
+                for bit in bits:
+                    mask |= 1 << bit
+                if not check_boat or self.is_safe(mask):
+                    groups.append(mask)
+        return tuple(groups)
+
+    def is_valid_code(self, code: int) -> bool:
+        left = code >> 1
+        if left & ~self.full_mask:
+            return False
+        return self.is_safe(left) and self.is_safe(self.full_mask ^ left)
+
+    def apply(self, code: int, group: int) -> int | None:
+        """Moves `group` across with the boat. Returns the new code, or None if the move is illegal."""
+        left = code >> 1
+        source = left if code & 1 else self.full_mask ^ left
+        if group & source != group or (self.rules.check_boat and not self.is_safe(group)):
+            return None
+        new_left = left ^ group
+        if not (self.is_safe(new_left) and self.is_safe(self.full_mask ^ new_left)):
+            return None
+        return (new_left << 1) | ((code & 1) ^ 1)
+
+    def successors(self, code: int) -> list[tuple[int, int]]:
+        """All legal (boat_group, next_code) pairs from `code`."""
+        left = code >> 1
+        boat_on_left = code & 1
+        source = left if boat_on_left else self.full_mask ^ left
+        full_mask = self.full_mask
+        is_safe = self.is_safe
+        result = []
+        for group in self.boat_groups:
+            if group & source != group:
+                continue
+            new_left = left ^ group
+            if is_safe(new_left) and is_safe(full_mask ^ new_left):
+                result.append((group, (new_left << 1) | (boat_on_left ^ 1)))
+        return result
+
+    def check_moves(self, masks, start_code: int | None = None) -> tuple[str | None, int, int]:
+        """
+        Replays boat-group masks from `start_code` (default: the initial state), with the
+        same checks as validate_solution but without building any GameState.
+        Returns (failure_reason, moves_applied, reached_code); failure_reason is None
+        when every move was legal and the final state is the win state.
+        """
+        code = self.initial_code if start_code is None else start_code
+        if self.N == 0 and start_code is None: # Mirrors validate_solution: N=0 is won by doing nothing
+            code = self.goal_code
+        full_mask = self.full_mask
+        is_safe = self.is_safe
+        check_boat = self.rules.check_boat
+        applied = 0
+        for group in masks:
+            if not 1 <= group.bit_count() <= self.boat_capacity:
+                return INVALID_BOAT_SIZE, applied, code
+            left = code >> 1
+            source = left if code & 1 else full_mask ^ left
+            if group & source != group:
+                return NOT_ON_SOURCE_BANK, applied, code
+            if check_boat and not is_safe(group):
+                return UNSAFE_BOAT, applied, code
+            new_left = left ^ group
+            if not (is_safe(new_left) and is_safe(full_mask ^ new_left)):
+                return UNSAFE_BANK, applied, code
+            code = (new_left << 1) | ((code & 1) ^ 1)
+            applied += 1
+        if code != self.goal_code:
+            return NOT_WIN, applied, code
+        return None, applied, code
+
+    def canonical_code(self, code: int) -> int:
+        """
+        Representative of `code` up to relabellings the rules cannot tell apart.
+        For Actor-Agent that is relabelling the pairs (a_i, A_i) -> (a_j, A_j): only how
+        many pairs are together on the left, split with just the actor on the left, or
+        split with just the agent on the left matters, so the representative puts those
+        pairs first, in that order. There are at most C(N+3, 3) * 2 distinct canonical codes.
+        """
+        return (self.rules.canonical_left(self.N, code >> 1) << 1) | (code & 1)
+
+    # --- Conversion to and from the string-based representation ---
+
+    def individual_bit(self, name: str) -> int:
+        """
+        Bit index of an individual such as "a_3" or "A_3". Only the exact spelling counts,
+        as with the name sets of GameState: "a_03", "a_+3" or "a_ 3" are nobody.
+        """
+        first, second = self.rules.prefixes
+        number = name[2:]
+        if number.isascii() and number.isdigit() and number == str(int(number)) and 1 <= int(number) <= self.N:
+            if name[:2] == first:
+                return int(number) - 1
+            if name[:2] == second:
+                return self.N + int(number) - 1
+        raise ValueError(f"Unknown individual {name!r} for N={self.N}.")
+
+    def individual_name(self, bit: int) -> str:
+        first, second = self.rules.prefixes
+        if bit < self.N:
+            return f"{first}{bit + 1}"
+        return f"{second}{bit - self.N + 1}"
+
+    def group_to_mask(self, individuals) -> int:
+        mask = 0
+        for name in individuals:
+            mask |= 1 << self.individual_bit(name)
+        return mask
+
+    def mask_to_group(self, mask: int) -> list[str]:
+        """Individuals in `mask`, sorted the same way as format_actor_agent_path."""
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self.individual_name(low.bit_length() - 1))
+            mask ^= low
+        return sorted(names)
+
+    def encode(self, state: GameState) -> int:
+        return (self.group_to_mask(state.left_bank) << 1) | int(state.boat_on_left)
+
+    def decode(self, code: int) -> GameState:
+        left = code >> 1
+        return GameState(N=self.N, boat_capacity=self.boat_capacity,
+                         left_bank_individuals=set(self.mask_to_group(left)),
+                         right_bank_individuals=set(self.mask_to_group(self.full_mask ^ left)),
+                         boat_on_left=bool(code & 1), rules=self.rules)
+
+@lru_cache(maxsize=None)
+def get_engine(N: int, boat_capacity: int, rules=ACTOR_AGENT) -> CompactEngine:
+    """Shared, cached CompactEngine for (N, K) and rule set so its tables are only built once."""
+    return CompactEngine(N, boat_capacity, rules)
@@ -1,16 +1,30 @@
 import itertools
+from functools import lru_cache
+
+from game.rules import ACTOR_AGENT
+
+@lru_cache(maxsize=None)
+def _compiled_rules(rules, N: int):
+    """(is_safe(mask), {name: bit}) of a game.rules variant for N, shared by all states of that size."""
+    first, second = rules.prefixes
+    bits = {f"{first}{i+1}": i for i in range(N)}
+    bits.update({f"{second}{i+1}": N + i for i in range(N)})
+    return rules.compile_is_safe(N), bits
 
 class GameState:
     def __init__(self, N: int, boat_capacity: int,
                  left_bank_individuals: set[str] | None = None,
                  right_bank_individuals: set[str] | None = None,
-                 boat_on_left: bool = True):
+                 boat_on_left: bool = True,
+                 rules=ACTOR_AGENT):
         self.N = N
         self.boat_capacity = boat_capacity
         self.boat_on_left = boat_on_left
+        self.rules = rules # game.rules variant; names and safety follow it (Actor-Agent by default)
 
-        self.actors = {f"a_{i+1}" for i in range(N)}
-        self.agents = {f"A_{i+1}" for i in range(N)}
+        first, second = rules.prefixes
+        self.actors = {f"{first}{i+1}" for i in range(N)} # First kind: actors (missionaries for M&C)
+        self.agents = {f"{second}{i+1}" for i in range(N)} # Second kind: agents (cannibals for M&C)
         self.all_individuals = self.actors.union(self.agents)
 
         if left_bank_individuals is None and right_bank_individuals is None:
@@ -52,9 +66,26 @@ class GameState:
                     return False # Actor is with another agent, without its own agent present. Unsafe.
         return True
 
+    def group_is_safe(self, group_individuals) -> bool:
+        """
+        is_group_safe under this state's rules: the Actor-Agent check above by default,
+        else the rules' compiled predicate over the group's bitmask (game.rules).
+        """
+        if self.rules is ACTOR_AGENT:
+            if not isinstance(group_individuals, (set, frozenset)):
+                group_individuals = set(group_individuals)
+            return GameState.is_group_safe(group_individuals, self.actors, self.agents)
+        is_safe, bits = _compiled_rules(self.rules, self.N)
+        mask = 0
+        for name in group_individuals:
+            bit = bits.get(name)
+            if bit is not None: # As is_group_safe, people outside the puzzle are ignored
+                mask |= 1 << bit
+        return is_safe(mask)
+
     def is_valid_state(self) -> bool:
         """
-        Checks for overall state consistency and Actor-Agent safety rules on both banks.
+        Checks for overall state consistency and the safety rules (Actor-Agent by default) on both banks.
         """
         # 1. Structural Validity Checks
         on_left_and_right = self.left_bank.intersection(self.right_bank)
@@ -65,10 +96,10 @@ class GameState:
         if on_left_or_right != self.all_individuals:
             return False # Some individuals are missing or extra individuals appeared
 
-        # 2. Actor-Agent Safety Rules for each bank
-        if not GameState.is_group_safe(self.left_bank, self.actors, self.agents):
+        # 2. Safety Rules for each bank
+        if not self.group_is_safe(self.left_bank):
             return False # Left bank is unsafe
-        if not GameState.is_group_safe(self.right_bank, self.actors, self.agents):
+        if not self.group_is_safe(self.right_bank):
             return False # Right bank is unsafe
 
         return True
@@ -88,7 +119,8 @@ class GameState:
                 self.right_bank == other.right_bank and
                 self.boat_on_left == other.boat_on_left and
                 self.N == other.N and
-                self.boat_capacity == other.boat_capacity)
+                self.boat_capacity == other.boat_capacity and
+                self.rules is other.rules)
 
     def __hash__(self):
         return hash((frozenset(self.left_bank), frozenset(self.right_bank),
@@ -116,9 +148,45 @@ class GameState:
                 f"{boat_line}\n"
                 f"Right Bank: {right_bank_str}")
 
+    def apply_move(self, boat_group) -> frozenset[str]:
+        """
+        Moves `boat_group` across the river *in place* and flips the boat side.
+        No legality checks are made (the caller decides what to check and when);
+        the returned group can be passed to undo_move() to restore this state.
+        """
+        moved = frozenset(boat_group)
+        if self.boat_on_left: # Moving L -> R
+            self.left_bank -= moved
+            self.right_bank |= moved
+        else: # Moving R -> L
+            self.right_bank -= moved
+            self.left_bank |= moved
+        self.boat_on_left = not self.boat_on_left
+        return moved
+
+    def undo_move(self, boat_group) -> None:
+        """Reverts apply_move(boat_group): the same group rows back and the boat returns."""
+        self.apply_move(boat_group)
+
+    def banks_are_safe(self) -> bool:
+        """Safety rules on both banks only; enough after apply_move from a valid state, which keeps the structure intact."""
+        return self.group_is_safe(self.left_bank) and self.group_is_safe(self.right_bank)
+
+    def state_key(self) -> tuple[frozenset[str], bool]:
+        """Hashable snapshot of the mutable parts of the state (N and K never change in place)."""
+        return frozenset(self.left_bank), self.boat_on_left
+
+    def iter_safe_boat_groups(self):
+        """Yields every allowed boat load (as a tuple) of size 1..K from the bank the boat is on (safe ones, if the rules check the boat)."""
+        source_bank = self.left_bank if self.boat_on_left else self.right_bank
+        for k_boat in range(1, self.boat_capacity + 1):
+            for boat_occupants_tuple in itertools.combinations(source_bank, k_boat):
+                if not self.rules.check_boat or self.group_is_safe(boat_occupants_tuple):
+                    yield boat_occupants_tuple
+
     def get_valid_next_states(self) -> list['GameState']:
         """
-        Generates all valid successor states from the current state for Actor-Agent puzzle.
+        Generates all valid successor states from the current state (Actor-Agent puzzle unless other rules were given).
         """
         valid_successors = []
         source_bank = self.left_bank if self.boat_on_left else self.right_bank
@@ -127,8 +195,8 @@ class GameState:
             for boat_occupants_tuple in itertools.combinations(source_bank, k_boat):
                 boat_occupants_set = set(boat_occupants_tuple)
 
-                # 1. Check boat safety
-                if not GameState.is_group_safe(boat_occupants_set, self.actors, self.agents):
+                # 1. Check boat safety (if the rules check the boat at all)
+                if self.rules.check_boat and not self.group_is_safe(boat_occupants_set):
                     continue
 
                 # 2. Create potential new bank configurations
@@ -148,7 +216,8 @@ class GameState:
                                                  boat_capacity=self.boat_capacity,
                                                  left_bank_individuals=new_left_bank_set,
                                                  right_bank_individuals=new_right_bank_set,
-                                                 boat_on_left=new_boat_on_left_val)
+                                                 boat_on_left=new_boat_on_left_val,
+                                                 rules=self.rules)
 
                 if potential_next_state.is_valid_state():
                     valid_successors.append(potential_next_state)
@@ -0,0 +1,134 @@
+import io
+import re
+
+# Parser for move lists written in the paper's format, e.g.
+#
+#     moves = [["A_2", "a_2"], ["A_2"], ["A_1", "A_2"], ["A_1"], ["A_1", "a_1"]]
+#
+# straight into compact-engine boat masks (a_i -> bit i-1, A_i -> bit N+i-1), without
+# eval/literal_eval. Accepted variants: "A_2" or "A2", single, double or no quotes,
+# arbitrary whitespace/newlines, trailing commas and an optional "name =" prefix.
+
+# One token per match. Group 4 is the (possibly empty) opening quote; \4 requires the same closing quote.
+_TOKEN_RE = re.compile(r"""\s*(?:(\[)|(\])|(,)|(["']?)([aA])_?(\d+)\4|(\S))""")
+_PREFIX_RE = re.compile(r"\s*[A-Za-z_]\w*\s*=")
+
+# Tokens never get anywhere near this long; when fewer characters than this remain
+# in the buffer, more input is read before matching so no token is split across chunks.
+_LOOKAHEAD = 256
+
+class MoveParseError(ValueError):
+    """Raised for malformed move text. `position` is a 0-based character offset; `line`/`column` are 1-based."""
+
+    def __init__(self, message: str, position: int, line: int, column: int):
+        super().__init__(f"{message} at line {line}, column {column} (offset {position})")
+        self.position = position
+        self.line = line
+        self.column = column
+
+def iter_parse_moves(source, N: int, chunk_size: int = 1 << 16):
+    """
+    Streams boat masks out of `source` (a string or a text file object), one per
+    completed move, reading at most `chunk_size` characters at a time.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+
+    buffer = ""
+    eof = False
+    pos = 0
+    offset = 0 # Absolute offset of buffer[0]
+    line = 1 # Line number at buffer[0]
+    line_start = 0 # Absolute offset of the start of that line
+
+    def refill():
+        nonlocal buffer, eof, pos, offset, line, line_start
+        while not eof and len(buffer) - pos < _LOOKAHEAD:
+            more = source.read(chunk_size)
+            eof = len(more) < chunk_size
+            line += buffer.count("\n", 0, pos)
+            last_newline = buffer.rfind("\n", 0, pos)
+            if last_newline >= 0:
+                line_start = offset + last_newline + 1
+            offset += pos
+            buffer = buffer[pos:] + more
+            pos = 0
+
+    def error(message: str, at: int):
+        absolute = offset + at
+        error_line = line + buffer.count("\n", 0, at)
+        last_newline = buffer.rfind("\n", 0, at)
+        error_line_start = offset + last_newline + 1 if last_newline >= 0 else line_start
+        return MoveParseError(message, absolute, error_line, absolute - error_line_start + 1)
+
+    refill()
+    prefix = _PREFIX_RE.match(buffer)
+    if prefix:
+        pos = prefix.end()
+
+    depth = 0 # 0: before the outer list, 1: inside the outer list, 2: inside a move, 3: after the outer list
+    expect_item = True # Whether the next token may start an item (as opposed to needing ',' or ']')
+    mask = 0
+    while True:
+        if not eof and len(buffer) - pos < _LOOKAHEAD:
+            refill()
+        match = _TOKEN_RE.match(buffer, pos)
+        if match is None: # Only whitespace is left in the buffer
+            if eof:
+                break
+            pos = len(buffer)
+            continue
+        kind = match.lastindex # 6 for an individual (its digits group closes last)
+        token_start = match.start(4 if kind == 6 else kind)
+        if not eof and token_start > len(buffer) - _LOOKAHEAD:
+            # Long whitespace run: the token may be cut off by the chunk boundary, so re-read from it
+            pos = token_start
+            continue
+        pos = match.end()
+
+        if kind == 1: # '['
+            if depth == 0:
+                depth = 1
+            elif depth == 1 and expect_item:
+                depth = 2
+                mask = 0
+            elif depth == 3:
+                raise error("Unexpected content after the move list", token_start)
+            else:
+                raise error("Unexpected '['", token_start)
+            expect_item = True
+        elif kind == 2: # ']'
+            if depth == 2:
+                yield mask # An empty move is syntactically fine; the validator rejects its boat size
+                depth = 1
+                expect_item = False
+            elif depth == 1:
+                depth = 3
+            else:
+                raise error("Unexpected ']'", token_start)
+        elif kind == 3: # ','
+            if depth not in (1, 2) or expect_item:
+                raise error("Unexpected ','", token_start)
+            expect_item = True
+        elif kind == 6: # Individual
+            if depth != 2 or not expect_item:
+                raise error("Unexpected individual", token_start)
+            index = int(match.group(6))
+            if not 1 <= index <= N:
+                raise error(f"Pair index {index} out of range for N={N}", token_start)
+            if match.group(5) == "a":
+                mask |= 1 << (index - 1)
+            else:
+                mask |= 1 << (N + index - 1)
+            expect_item = False
+        else:
+            if depth == 3:
+                raise error("Unexpected content after the move list", token_start)
+            raise error(f"Unexpected character {match.group(7)!r}", token_start)
+
+    if depth != 3:
+        raise error("Unexpected end of input", len(buffer))
+
+def parse_moves(source, N: int) -> list[int]:
+    """Parses a whole move list into compact boat masks. See iter_parse_moves."""
+    return list(iter_parse_moves(source, N))
@@ -0,0 +1,136 @@
+from functools import cached_property
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT
+
+class MultiBankEngine:
+    """
+    Compact states for the river-crossing puzzle with L locations (banks and islands)
+    joined by an undirected adjacency graph, for a fixed N, K and rule set (game.rules).
+
+    Individuals use the same bits as CompactEngine. Location i (0 <= i < L) holds a
+    bitmask of individuals; the last location is implied (everyone not elsewhere), and
+    the boat has a position index. A state is packed into a single int:
+
+        code = (mask_0 | mask_1 << 2N | ... | mask_{L-2} << (L-2)*2N) << boat_bits | boat_position
+
+    Everyone starts on location 0 with the boat; the goal is everyone on location L-1.
+    A move takes a boat load (one of CompactEngine.boat_groups) from the boat's location
+    to an adjacent one; both locations must be safe afterwards. With L=2 and the single
+    edge (0, 1) this is exactly the two-bank puzzle.
+    """
+
+    def __init__(self, N: int, boat_capacity: int, locations: int = 3, edges=None, rules=ACTOR_AGENT):
+        if locations < 2:
+            raise ValueError("At least two locations are needed.")
+        self.N = N
+        self.boat_capacity = boat_capacity
+        self.locations = locations
+        self.rules = rules
+        self.is_safe = rules.compile_is_safe(N)
+        if edges is None: # Default: a chain of islands from the start bank to the far bank
+            edges = [(i, i + 1) for i in range(locations - 1)]
+        neighbours = [set() for _ in range(locations)]
+        for a, b in edges:
+            if not (0 <= a < locations and 0 <= b < locations) or a == b:
+                raise ValueError(f"Invalid edge ({a}, {b}) for {locations} locations.")
+            neighbours[a].add(b)
+            neighbours[b].add(a)
+        self.neighbours = tuple(tuple(sorted(n)) for n in neighbours)
+        self.width = 2 * N # Bits per location mask
+        self.full_mask = (1 << self.width) - 1
+        self.boat_bits = (locations - 1).bit_length()
+        self.initial_code = self.pack([self.full_mask] + [0] * (locations - 1), 0)
+        self.goal_code = self.pack([0] * (locations - 1) + [self.full_mask], locations - 1)
+
+    @cached_property
+    def boat_groups(self) -> tuple[int, ...]:
+        """Allowed boat loads of size 1..K, shared with the two-bank engine."""
+        return get_engine(self.N, self.boat_capacity, self.rules).boat_groups
+
+    def pack(self, masks, boat: int) -> int:
+        """Code of per-location masks (all L of them; the last is not stored) and a boat position."""
+        packed = 0
+        for i in range(self.locations - 2, -1, -1):
+            packed = (packed << self.width) | masks[i]
+        return (packed << self.boat_bits) | boat
+
+    def unpack(self, code: int) -> tuple[list[int], int]:
+        """Per-location masks (all L of them) and the boat position of a code."""
+        boat = code & ((1 << self.boat_bits) - 1)
+        packed = code >> self.boat_bits
+        masks = []
+        rest = self.full_mask
+        for _ in range(self.locations - 1):
+            mask = packed & self.full_mask
+            masks.append(mask)
+            rest ^= mask
+            packed >>= self.width
+        masks.append(rest)
+        return masks, boat
+
+    def successors(self, code: int) -> list[tuple[tuple[int, int], int]]:
+        """All legal ((boat_group, destination), next_code) pairs from `code`."""
+        masks, boat = self.unpack(code)
+        source = masks[boat]
+        is_safe = self.is_safe
+        result = []
+        for group in self.boat_groups:
+            if group & source != group:
+                continue
+            remaining = source ^ group
+            if not is_safe(remaining):
+                continue
+            for destination in self.neighbours[boat]:
+                arrived = masks[destination] | group
+                if is_safe(arrived):
+                    masks[boat], masks[destination] = remaining, arrived
+                    result.append(((group, destination), self.pack(masks, destination)))
+                    masks[boat], masks[destination] = source, arrived ^ group
+        return result
+
+    def apply(self, code: int, group: int, destination: int) -> int | None:
+        """Takes `group` with the boat to `destination`. Returns the new code, or None if the move is illegal."""
+        masks, boat = self.unpack(code)
+        source = masks[boat]
+        if (destination not in self.neighbours[boat] or not 1 <= group.bit_count() <= self.boat_capacity
+                or group & source != group or (self.rules.check_boat and not self.is_safe(group))):
+            return None
+        masks[boat] = source ^ group
+        masks[destination] |= group
+        if not (self.is_safe(masks[boat]) and self.is_safe(masks[destination])):
+            return None
+        return self.pack(masks, destination)
+
+    def canonical_code(self, code: int) -> int:
+        """
+        Representative of `code` up to relabellings the rules cannot tell apart (pairs for
+        Actor-Agent, individuals within a kind for Missionaries & Cannibals): individuals are
+        reassigned in sorted order of their locations, so equivalent states share one code.
+        """
+        masks, boat = self.unpack(code)
+        N = self.N
+        where = [0] * (2 * N)
+        for location, mask in enumerate(masks):
+            while mask:
+                low = mask & -mask
+                where[low.bit_length() - 1] = location
+                mask ^= low
+        if self.rules.symmetry == "pairs":
+            pairs = sorted(zip(where[:N], where[N:]))
+            where = [first for first, _ in pairs] + [second for _, second in pairs]
+        else: # "kinds"
+            where = sorted(where[:N]) + sorted(where[N:])
+        canonical = [0] * self.locations
+        for bit, location in enumerate(where):
+            canonical[location] |= 1 << bit
+        return self.pack(canonical, boat)
+
+    def individual_name(self, bit: int) -> str:
+        return get_engine(self.N, 0, self.rules).individual_name(bit)
+
+    def describe(self, code: int) -> list[list[str]]:
+        """Names of the individuals at each location, e.g. [['A_1', 'a_1'], [], ['A_2', 'a_2']]."""
+        engine = get_engine(self.N, 0, self.rules)
+        masks, _ = self.unpack(code)
+        return [engine.mask_to_group(mask) for mask in masks]
@@ -0,0 +1,136 @@
+# Puzzle rules for the compact engine (game.compact).
+#
+# Every variant here has N individuals of each of two kinds: kind one on bits 0..N-1 and kind two
+# on bits N..2N-1 (actors and agents, or missionaries and cannibals). A variant compiles its safety
+# rule for a given N into a predicate over such bitmasks, once, so the engine, the solvers and the
+# batch validator never look at names or sets. compile_array_is_safe gives the same predicate
+# over NumPy uint64 arrays for the vectorized paths.
+
+from abc import ABC, abstractmethod
+
+def array_bit_count(masks):
+    """Per-element popcount of a NumPy uint64 array: np.bitwise_count, which needs NumPy >= 2.0, or _swar_bit_count."""
+    import numpy as np
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks)
+    return _swar_bit_count(masks)
+
+def _swar_bit_count(masks):
+    # Bit counts of 2, 4 and 8 bit fields in turn, then the bytes summed by one multiplication
+    # (it wraps around in uint64, keeping the total in the top byte).
+    import numpy as np
+    masks = masks - ((masks >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    masks = (masks & np.uint64(0x3333333333333333)) + ((masks >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    masks = (masks + (masks >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return (masks * np.uint64(0x0101010101010101)) >> np.uint64(56)
+
+class PuzzleRules(ABC):
+    """
+    Base class for a puzzle variant. Subclasses set `name`, `prefixes` (the name prefix of each
+    kind, e.g. ("a_", "A_")), `check_boat` (whether the boat load itself must be safe) and
+    `symmetry` (which relabellings leave the rule unchanged: "pairs" swaps (a_i, A_i) with
+    (a_j, A_j), "kinds" swaps any two individuals of the same kind), and implement
+    compile_is_safe / compile_array_is_safe / canonical_left.
+    """
+
+    name = None
+    prefixes = None
+    check_boat = True
+    symmetry = "pairs"
+
+    @abstractmethod
+    def compile_is_safe(self, N: int):
+        """Returns is_safe(mask) -> bool for a group of individuals (a bank or a boat load)."""
+
+    @abstractmethod
+    def compile_array_is_safe(self, N: int):
+        """Returns is_safe(masks) -> bool array for a NumPy uint64 array of masks."""
+
+    @abstractmethod
+    def canonical_left(self, N: int, left: int) -> int:
+        """Representative of a left-bank mask up to relabellings that the rule cannot tell apart."""
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name!r}>"
+
+class ActorAgentRules(PuzzleRules):
+    """
+    Actor a_i is bit i-1, agent A_i is bit N+i-1. A group is safe if it has no agents,
+    or if every actor in it is with its own agent. The boat load must be safe too.
+    """
+
+    name = "actor_agent"
+    prefixes = ("a_", "A_")
+    check_boat = True
+    symmetry = "pairs"
+
+    def compile_is_safe(self, N: int):
+        actor_mask = (1 << N) - 1
+
+        def is_safe(mask: int) -> bool:
+            agents = mask >> N
+            return agents == 0 or (mask & actor_mask & ~agents) == 0
+        return is_safe
+
+    def compile_array_is_safe(self, N: int):
+        import numpy as np
+        actor_mask = np.uint64((1 << N) - 1)
+        shift = np.uint64(N)
+
+        def is_safe(masks):
+            agents = masks >> shift
+            return (agents == 0) | ((masks & actor_mask & ~agents) == 0)
+        return is_safe
+
+    def canonical_left(self, N: int, left: int) -> int:
+        # Only the number of pairs together, actor-only and agent-only on the left matters:
+        # put those pairs first, in that order.
+        actors = left & ((1 << N) - 1)
+        agents = left >> N
+        together = (actors & agents).bit_count()
+        actor_only = (actors & ~agents).bit_count()
+        agent_only = (agents & ~actors).bit_count()
+        canonical_actors = (1 << (together + actor_only)) - 1
+        canonical_agents = ((1 << together) - 1) | (((1 << agent_only) - 1) << (together + actor_only))
+        return (canonical_agents << N) | canonical_actors
+
+class MissionariesCannibalsRules(PuzzleRules):
+    """
+    Missionary M_i is bit i-1, cannibal C_i is bit N+i-1. A group is safe if it has no
+    missionaries or at least as many missionaries as cannibals (a count check on the two
+    halves of the mask). As in docs/no_solutions.md, only the banks are checked, not the boat.
+    """
+
+    name = "missionaries_cannibals"
+    prefixes = ("M_", "C_")
+    check_boat = False
+    symmetry = "kinds"
+
+    def compile_is_safe(self, N: int):
+        missionary_mask = (1 << N) - 1
+
+        def is_safe(mask: int) -> bool:
+            missionaries = (mask & missionary_mask).bit_count()
+            return missionaries == 0 or missionaries >= (mask >> N).bit_count()
+        return is_safe
+
+    def compile_array_is_safe(self, N: int):
+        import numpy as np
+        missionary_mask = np.uint64((1 << N) - 1)
+        shift = np.uint64(N)
+
+        def is_safe(masks):
+            missionaries = array_bit_count(masks & missionary_mask)
+            return (missionaries == 0) | (missionaries >= array_bit_count(masks >> shift))
+        return is_safe
+
+    def canonical_left(self, N: int, left: int) -> int:
+        # Individuals of one kind are interchangeable: only the counts on the left matter.
+        missionaries = (left & ((1 << N) - 1)).bit_count()
+        cannibals = (left >> N).bit_count()
+        return (((1 << cannibals) - 1) << N) | ((1 << missionaries) - 1)
+
+ACTOR_AGENT = ActorAgentRules()
+MISSIONARIES_CANNIBALS = MissionariesCannibalsRules()
+
+RULES = {rules.name: rules for rules in (ACTOR_AGENT, MISSIONARIES_CANNIBALS)}
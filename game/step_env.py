@@ -0,0 +1,183 @@
+import numpy as np
+
+from game.environment import GameState
+from game.actions import get_action_space
+from game.compact import get_engine
+
+# Step-based ("Gymnasium-style") interface to the Actor-Agent puzzle for RL and agent loops.
+#
+# Actions are integers from game.actions.ActionSpace (every safe boat load of size 1..K, ordered
+# by size then by bit positions), so the action space is fixed for a given (N, K). Observations are int8 vectors of length 2N+1: one entry per individual
+# (1 = on the left bank, actors a_1..a_N first, then agents A_1..A_N) followed by the boat side
+# (1 = left). Rewards: WIN_REWARD on reaching the goal, ILLEGAL_MOVE_REWARD for an illegal action
+# (which ends the episode, as a wrong move ends a puzzle attempt), 0 otherwise.
+
+WIN_REWARD = 1.0
+ILLEGAL_MOVE_REWARD = -1.0
+
+class RiverCrossingEnv:
+    """
+    Single environment: reset(N, K) then step(action) until terminated or truncated.
+    step() accepts an action index or a paper-format move such as ['A_2', 'a_2'].
+    The current position is kept as a compact code; `state` gives it as a GameState.
+    """
+
+    def __init__(self, max_steps: int | None = None):
+        self.max_steps = max_steps # Episodes are truncated after this many moves (None = never)
+        self.engine = None
+        self.code = None
+        self.steps = 0
+
+    def reset(self, N: int, K: int, state: GameState | None = None):
+        """Starts an episode from `state` (default: everyone on the left). Returns (observation, info)."""
+        self.engine = get_engine(N, K)
+        self.action_space = get_action_space(N, K)
+        self.code = self.engine.initial_code if state is None else self.engine.encode(state)
+        self.steps = 0
+        return self._observation(), {'action_mask': self.action_mask()}
+
+    @property
+    def num_actions(self) -> int:
+        return len(self.action_space)
+
+    @property
+    def state(self) -> GameState:
+        return self.engine.decode(self.code)
+
+    def action_index(self, move) -> int:
+        """Action index of a paper-format move; ValueError if it is not a safe load of size 1..K."""
+        return self.action_space.index(move)
+
+    def action_mask(self) -> np.ndarray:
+        """Boolean mask over action indexes: True where the action is legal from the current state."""
+        mask = self.action_space.legal_action_mask(self.code)
+        packed = np.frombuffer(mask.to_bytes((self.num_actions + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(packed, count=self.num_actions, bitorder='little').astype(bool)
+
+    def step(self, action):
+        """Applies one move. Returns (observation, reward, terminated, truncated, info)."""
+        engine = self.engine
+        if isinstance(action, (int, np.integer)):
+            if not 0 <= action < len(engine.boat_groups): # Negative indexes would pick a load from the end
+                raise ValueError(f"Action {action} is out of range: actions are 0..{len(engine.boat_groups) - 1}.")
+            group = engine.boat_groups[action]
+        else:
+            group = 0
+            for name in action:
+                group |= 1 << engine.individual_bit(name)
+        self.steps += 1
+        child = engine.apply(self.code, group)
+        truncated = self.max_steps is not None and self.steps >= self.max_steps
+        if child is None:
+            info = {'illegal_reason': self._illegal_reason(group), 'action_mask': self.action_mask()}
+            return self._observation(), ILLEGAL_MOVE_REWARD, True, False, info
+        self.code = child
+        won = child == engine.goal_code
+        return (self._observation(), WIN_REWARD if won else 0.0, won, truncated and not won,
+                {'action_mask': self.action_mask()})
+
+    def _illegal_reason(self, group: int) -> str:
+        reason, _, _ = self.engine.check_moves([group], start_code=self.code)
+        return reason
+
+    def _observation(self) -> np.ndarray:
+        bits = 2 * self.engine.N
+        left = self.code >> 1
+        observation = np.empty(bits + 1, dtype=np.int8)
+        for bit in range(bits):
+            observation[bit] = (left >> bit) & 1
+        observation[bits] = self.code & 1
+        return observation
+
+class VectorRiverCrossingEnv:
+    """
+    `num_envs` independent environments for one (N, K), stepped together with NumPy.
+    States live in flat arrays (left-bank masks as uint64, boat side as bool), so
+    one step() costs a handful of array operations regardless of the batch size.
+    Finished environments (won, illegal move or truncated) are reset to the start
+    state within the same step(); their final observation is in info['final_observation'].
+    Requires 2N <= 63 so that a bank fits in a uint64. Legal-action masks cost
+    O(num_envs * num_actions) per step; pass with_action_masks=False to leave them out of info.
+    """
+
+    def __init__(self, N: int, K: int, num_envs: int, max_steps: int | None = None,
+                 with_action_masks: bool = True):
+        if 2 * N > 63:
+            raise ValueError(f"N={N} is too large for uint64 bank masks (at most N=31).")
+        engine = get_engine(N, K)
+        self.N = N
+        self.K = K
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.with_action_masks = with_action_masks
+        self.engine = engine
+        self.groups = np.array(engine.boat_groups, dtype=np.uint64) # Action index -> boat mask
+        self.actor_mask = np.uint64(engine.actor_mask)
+        self.full_mask = np.uint64(engine.full_mask)
+        self.left = np.full(num_envs, engine.full_mask, dtype=np.uint64)
+        self.boat_on_left = np.ones(num_envs, dtype=bool)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self._bit_shifts = np.arange(2 * N, dtype=np.uint64)
+
+    @property
+    def num_actions(self) -> int:
+        return len(self.groups)
+
+    def reset(self):
+        """Puts every environment back at the start. Returns (observations, info)."""
+        self.left[:] = self.engine.full_mask
+        self.boat_on_left[:] = True
+        self.steps[:] = 0
+        return self._observations(), {'action_mask': self.action_masks()}
+
+    def _is_safe(self, masks: np.ndarray) -> np.ndarray:
+        agents = masks >> np.uint64(self.N)
+        return (agents == 0) | ((masks & self.actor_mask & ~agents) == 0)
+
+    def _sources(self) -> np.ndarray:
+        return np.where(self.boat_on_left, self.left, self.full_mask ^ self.left)
+
+    def action_masks(self) -> np.ndarray:
+        """(num_envs, num_actions) boolean array of legal actions."""
+        groups = self.groups[None, :]
+        new_left = self.left[:, None] ^ groups
+        return (((groups & self._sources()[:, None]) == groups) &
+                self._is_safe(new_left) & self._is_safe(self.full_mask ^ new_left))
+
+    def step(self, actions):
+        """Applies actions[i] to environment i. Returns (observations, rewards, terminated, truncated, info)."""
+        actions = np.asarray(actions, dtype=np.int64)
+        out_of_range = (actions < 0) | (actions >= len(self.groups))
+        if out_of_range.any():
+            raise ValueError(f"Actions {actions[out_of_range].tolist()} are out of range: actions are 0..{len(self.groups) - 1}.")
+        groups = self.groups[actions]
+        new_left = self.left ^ groups
+        legal = (((groups & self._sources()) == groups) &
+                 self._is_safe(new_left) & self._is_safe(self.full_mask ^ new_left))
+        self.left = np.where(legal, new_left, self.left)
+        self.boat_on_left = np.where(legal, ~self.boat_on_left, self.boat_on_left)
+        self.steps += 1
+
+        won = legal & (self.left == 0) & ~self.boat_on_left
+        terminated = won | ~legal
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_steps)
+        rewards = np.where(won, WIN_REWARD, np.where(legal, 0.0, ILLEGAL_MOVE_REWARD))
+
+        info = {'legal': legal}
+        done = terminated | truncated
+        if done.any():
+            info['final_observation'] = self._observations()
+            self.left[done] = self.engine.full_mask
+            self.boat_on_left[done] = True
+            self.steps[done] = 0
+        if self.with_action_masks:
+            info['action_mask'] = self.action_masks()
+        return self._observations(), rewards, terminated, truncated, info
+
+    def _observations(self) -> np.ndarray:
+        observations = np.empty((self.num_envs, 2 * self.N + 1), dtype=np.int8)
+        observations[:, :-1] = (self.left[:, None] >> self._bit_shifts) & np.uint64(1)
+        observations[:, -1] = self.boat_on_left
+        return observations
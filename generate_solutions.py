@@ -1,47 +1,65 @@
+import argparse
+import contextlib
 import csv
 import os
-import sys
-
-# Adjust sys.path to allow importing from game and solvers directories
-# generate_solutions.py is in the root, so adding its directory to sys.path
-# allows Python to find game/ and solvers/ as packages.
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 from game.environment import GameState
-from solvers.search import bfs_solve, format_actor_agent_path
+from solvers.certificates import find_unsolvability_certificate
+from solvers.k_sweep import k_sweep
+from solvers.search import COST_MODELS, bfs_solve, iddfs_solve, format_actor_agent_path, weighted_cost_sweep
+from solvers.solution_io import save_solution_blob
+
+# Move lists are also written as binary blobs here; the CSV stores their paths relative to the repo root.
+REPO_ROOT = os.path.abspath(os.path.dirname(__file__))
+SOLUTIONS_DIR = os.path.join(REPO_ROOT, "solutions")
+
+# Both return an optimal path; iddfs_solve trades time for memory linear in the solution length.
+SOLVERS = {"bfs": bfs_solve, "iddfs": iddfs_solve}
 
-def get_all_solutions():
+def get_all_solutions(solver_name="bfs", profiler=None):
     """
     Generates solutions for the puzzle for n from 1 to 10.
     Determines primary_k based on n (2 if n<=3, else 3).
     Additionally, for n between 6 and 10, solves for k=4.
+    `solver_name` picks the optimal solver from SOLVERS.
+    With a `profiler` (solvers.profiling.CellProfiler), each cell's certificate check and solve is profiled.
     Collects and returns a list of dictionaries containing solution details.
     """
+    solve = SOLVERS[solver_name]
+    profile_cell = profiler.cell if profiler else lambda label: contextlib.nullcontext()
     results = []
     for n in range(1, 11):  # Loop n from 1 to 10
         # Determine and process primary k
         primary_k = 2 if n <= 3 else 3
         print(f"Processing n={n}, k={primary_k}...")
 
-        initial_state_pk = GameState(N=n, boat_capacity=primary_k)
-        solution_states_pk = bfs_solve(initial_state_pk)
+        with profile_cell(f"n{n}_k{primary_k}_{solver_name}"):
+            initial_state_pk = GameState(N=n, boat_capacity=primary_k)
+            certificate_pk = find_unsolvability_certificate(n, primary_k)
+            solution_states_pk = None if certificate_pk is not None else solve(initial_state_pk)
+        if certificate_pk is not None: # Certified unsolvable: no need to exhaust the search
+            print(f"  No solution ({certificate_pk.kind}): {certificate_pk.explanation}")
 
         if solution_states_pk:
             formatted_moves_pk = format_actor_agent_path(solution_states_pk)
             solvable_pk = True
             num_moves_pk = len(formatted_moves_pk)
             solution_str_pk = str(formatted_moves_pk)
+            solution_blob_pk = save_solution_blob(SOLUTIONS_DIR, n, primary_k, formatted_moves_pk, solver=solver_name,
+                                                   relative_to=REPO_ROOT)
         else:
             solvable_pk = False
             num_moves_pk = 0
             solution_str_pk = "NO_SOLUTION"
+            solution_blob_pk = ""
 
         results.append({
             'n': n,
             'k': primary_k,
             'solvable': solvable_pk,
             'num_moves': num_moves_pk,
-            'solution_path': solution_str_pk
+            'solution_path': solution_str_pk,
+            'solution_blob': solution_blob_pk
         })
 
         # If n is between 6 and 10 (inclusive), also solve for k=4
@@ -49,29 +67,60 @@ def get_all_solutions():
             secondary_k = 4
             print(f"Processing n={n}, k={secondary_k}...")
 
-            initial_state_sk = GameState(N=n, boat_capacity=secondary_k)
-            solution_states_sk = bfs_solve(initial_state_sk)
+            with profile_cell(f"n{n}_k{secondary_k}_{solver_name}"):
+                initial_state_sk = GameState(N=n, boat_capacity=secondary_k)
+                certificate_sk = find_unsolvability_certificate(n, secondary_k)
+                solution_states_sk = None if certificate_sk is not None else solve(initial_state_sk)
+            if certificate_sk is not None:
+                print(f"  No solution ({certificate_sk.kind}): {certificate_sk.explanation}")
 
             if solution_states_sk:
                 formatted_moves_sk = format_actor_agent_path(solution_states_sk)
                 solvable_sk = True
                 num_moves_sk = len(formatted_moves_sk)
                 solution_str_sk = str(formatted_moves_sk)
+                solution_blob_sk = save_solution_blob(SOLUTIONS_DIR, n, secondary_k, formatted_moves_sk, solver=solver_name,
+                                                      relative_to=REPO_ROOT)
             else:
                 solvable_sk = False
                 num_moves_sk = 0
                 solution_str_sk = "NO_SOLUTION"
+                solution_blob_sk = ""
 
             results.append({
                 'n': n,
                 'k': secondary_k,
                 'solvable': solvable_sk,
                 'num_moves': num_moves_sk,
-                'solution_path': solution_str_sk
+                'solution_path': solution_str_sk,
+                'solution_blob': solution_blob_sk
             })
 
     return results
 
+def generation_cells():
+    """The (n, k) cells get_all_solutions covers, in its order."""
+    cells = []
+    for n in range(1, 11):
+        cells.append((n, 2 if n <= 3 else 3))
+        if 6 <= n <= 10:
+            cells.append((n, 4))
+    return cells
+
+def print_cost_sweep():
+    """Prints the optimal cost of every cell under every cost model in solvers.search.COST_MODELS."""
+    print(f"{'n':<3} {'k':<3} " + " ".join(f"{name:>16}" for name in COST_MODELS))
+    for row in weighted_cost_sweep(generation_cells()):
+        values = ["NO_SOLUTION" if row[name] is None else str(row[name]) for name in COST_MODELS]
+        print(f"{row['n']:<3} {row['k']:<3} " + " ".join(f"{value:>16}" for value in values))
+
+def print_k_sweep(k_max):
+    """Prints the optimal length for every n in 1..10 and every K <= k_max, one state graph per n (solvers.k_sweep)."""
+    print(f"{'n':<3} " + " ".join(f"{f'k={K}':>12}" for K in range(1, k_max + 1)))
+    for n in range(1, 11):
+        lengths = k_sweep(n, k_max)
+        print(f"{n:<3} " + " ".join(f"{'NO_SOLUTION' if lengths[K] is None else lengths[K]:>12}" for K in range(1, k_max + 1)))
+
 def write_to_csv(results_list, filename="solution.csv"):
     """
     Writes the given list of results to a CSV file.
@@ -80,7 +129,7 @@ def write_to_csv(results_list, filename="solution.csv"):
         print("No results to write.")
         return
 
-    fieldnames = ["n", "k", "solvable", "num_moves", "solution_path"]
+    fieldnames = ["n", "k", "solvable", "num_moves", "solution_path", "solution_blob"]
     with open(filename, mode='w', newline='') as csvfile:
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
@@ -88,7 +137,32 @@ def write_to_csv(results_list, filename="solution.csv"):
     print(f"Solutions written to {filename}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate optimal Actor-Agent solutions and write them to solution.csv.")
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default="bfs",
+                        help="Optimal solver to use (iddfs needs far less memory than bfs on large cells).")
+    parser.add_argument("--profile", nargs="?", const=os.path.join("reports", "profile"), metavar="DIR",
+                        help="Profile each (n, k) solve with cProfile and tracemalloc; reports go to DIR (default: reports/profile).")
+    parser.add_argument("--cost-sweep", action="store_true",
+                        help="Print the optimum of every cell under each weighted cost model (Dijkstra) instead of generating solutions.")
+    parser.add_argument("--k-sweep", type=int, metavar="K_MAX",
+                        help="Print the optimal length for every K <= K_MAX, building each n's state graph once, instead of generating solutions.")
+    args = parser.parse_args()
+
+    if args.k_sweep:
+        print_k_sweep(args.k_sweep)
+        raise SystemExit
+    if args.cost_sweep:
+        print_cost_sweep()
+        raise SystemExit
+
+    profiler = None
+    if args.profile:
+        from solvers.profiling import CellProfiler
+        profiler = CellProfiler(args.profile)
+
     print("Starting solution generation...")
-    all_solutions_data = get_all_solutions()
+    all_solutions_data = get_all_solutions(solver_name=args.solver, profiler=profiler)
     write_to_csv(all_solutions_data, filename="solution.csv")
+    if profiler:
+        print(f"Profiling summary written to {profiler.finish()}")
     print("Solution generation complete. Output written to solution.csv")
@@ -1,16 +1,22 @@
+import argparse
+import contextlib
 import csv
 import os
-import sys
 import time
 
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))
-
 from solvers.heuristic import solve_k4_heuristic_2N_minus_3, validate_solution
 from game.environment import GameState # Needed for BFS
 from solvers.search import bfs_solve, format_actor_agent_path # Needed for BFS
+from solvers.solution_io import save_solution_blob
+
+# Move lists are also written as binary blobs here; the CSV stores their paths relative to the repo root.
+REPO_ROOT = os.path.abspath(os.path.dirname(__file__))
+SOLUTIONS_DIR = os.path.join(REPO_ROOT, "solutions")
 
-def generate_k4_solutions_and_write_csv():
+def generate_k4_solutions_and_write_csv(profiler=None):
     # This function content remains the same as the last successful run that produced solutions_k4.csv
+    # With a profiler (solvers.profiling.CellProfiler), each N's heuristic and validation is profiled.
+    profile_cell = profiler.cell if profiler else lambda label: contextlib.nullcontext()
     results = []
     k_value = 4
     output_filename = "solutions_k4.csv"
@@ -18,20 +24,24 @@ def generate_k4_solutions_and_write_csv():
     print("Solution VALIDATION IS ENABLED.")
     for n_value in range(6, 61):
         start_time = time.time()
-        heuristic_moves = solve_k4_heuristic_2N_minus_3(n_value)
+        with profile_cell(f"n{n_value}_k{k_value}_heuristic"):
+            heuristic_moves = solve_k4_heuristic_2N_minus_3(n_value)
+            is_valid_solution = bool(heuristic_moves) and validate_solution(n_value, k_value, heuristic_moves)
         solvable_status = False
         num_moves_heuristic = 0
         solution_str_heuristic = "NO_SOLUTION_BY_HEURISTIC"
+        solution_blob_heuristic = ""
         if n_value < 2 and not heuristic_moves:
             solvable_status = False
             num_moves_heuristic = 0
             solution_str_heuristic = "N/A_FOR_N<2"
         elif heuristic_moves:
             num_moves_heuristic = len(heuristic_moves)
-            is_valid_solution = validate_solution(n_value, k_value, heuristic_moves)
             if is_valid_solution:
                 solvable_status = True
                 solution_str_heuristic = str(heuristic_moves)
+                solution_blob_heuristic = save_solution_blob(SOLUTIONS_DIR, n_value, k_value, heuristic_moves,
+                                                             solver="heuristic_2N-3", relative_to=REPO_ROOT)
             else:
                 solution_str_heuristic = "INVALID_HEURISTIC_SOLUTION"
                 print(f"  N={n_value}, K={k_value}: CORRECTED HEURISTIC SOLUTION INVALID for N={n_value} after validation.")
@@ -44,9 +54,10 @@ def generate_k4_solutions_and_write_csv():
         results.append({
             'n': n_value, 'k': k_value, 'solver': 'heuristic_2N-3',
             'solvable': solvable_status, 'num_moves': num_moves_heuristic,
-            'solution_path': solution_str_heuristic, 'time_seconds': round(time_taken, 4)
+            'solution_path': solution_str_heuristic, 'solution_blob': solution_blob_heuristic,
+            'time_seconds': round(time_taken, 4)
         })
-    fieldnames = ["n", "k", "solver", "solvable", "num_moves", "solution_path", "time_seconds"]
+    fieldnames = ["n", "k", "solver", "solvable", "num_moves", "solution_path", "solution_blob", "time_seconds"]
     try:
         with open(output_filename, mode='w', newline='') as csvfile:
             writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
@@ -56,8 +67,9 @@ def generate_k4_solutions_and_write_csv():
     except IOError:
         print(f"Error: Could not write to CSV file {output_filename}.")
 
-def compare_heuristic_with_bfs_for_small_n():
+def compare_heuristic_with_bfs_for_small_n(profiler=None):
     k_value = 4
+    profile_cell = profiler.cell if profiler else lambda label: contextlib.nullcontext()
     # Adjusted range for BFS comparison: N=6 to N=10.
     # N=15 was suggested as "maybe", N=10 is safer for BFS performance.
     comparison_range_n = range(6, 11)
@@ -80,8 +92,9 @@ def compare_heuristic_with_bfs_for_small_n():
 
         print(f"N={n_value}: Calculating BFS... (K={k_value})")
         bfs_start_time = time.time()
-        initial_state_bfs = GameState(N=n_value, boat_capacity=k_value)
-        bfs_solution_path_states = bfs_solve(initial_state_bfs) # UNCOMMENTED
+        with profile_cell(f"n{n_value}_k{k_value}_bfs"):
+            initial_state_bfs = GameState(N=n_value, boat_capacity=k_value)
+            bfs_solution_path_states = bfs_solve(initial_state_bfs) # UNCOMMENTED
         bfs_duration = time.time() - bfs_start_time
 
         bfs_moves_count_str = "NO_SOLUTION"
@@ -111,6 +124,18 @@ def compare_heuristic_with_bfs_for_small_n():
         print("-" * 70)
 
 if __name__ == "__main__":
-    generate_k4_solutions_and_write_csv()
-    compare_heuristic_with_bfs_for_small_n() # Now this will run active BFS
+    parser = argparse.ArgumentParser(description="Generate K=4 heuristic solutions (solutions_k4.csv) and compare them with BFS.")
+    parser.add_argument("--profile", nargs="?", const=os.path.join("reports", "profile_k4"), metavar="DIR",
+                        help="Profile each heuristic and BFS run with cProfile and tracemalloc; reports go to DIR (default: reports/profile_k4).")
+    args = parser.parse_args()
+
+    profiler = None
+    if args.profile:
+        from solvers.profiling import CellProfiler
+        profiler = CellProfiler(args.profile)
+
+    generate_k4_solutions_and_write_csv(profiler)
+    compare_heuristic_with_bfs_for_small_n(profiler) # Now this will run active BFS
+    if profiler:
+        print(f"Profiling summary written to {profiler.finish()}")
     print("\nScript execution for CSV generation and BFS comparison complete.")
@@ -0,0 +1,124 @@
+
+import numpy as np
+
+from game.compact import INVALID_BOAT_SIZE, NOT_ON_SOURCE_BANK, NOT_WIN, UNSAFE_BANK, UNSAFE_BOAT, get_engine
+from game.rules import ACTOR_AGENT, array_bit_count
+
+def check_moves_batch(N: int, K: int, candidates: list[list[int]], rules=ACTOR_AGENT) -> list[tuple[str | None, int, int]]:
+    """
+    CompactEngine.check_moves for many candidates (lists of boat-group masks) at once.
+    Candidates are padded into a (count, longest) uint64 array and replayed one move
+    index at a time for all of them together, so the per-move work is a few NumPy
+    operations shared by the whole batch. Returns the same (failure_reason, moves_applied,
+    reached_code) triples, in order. Needs 2N < 64; larger N falls back to check_moves.
+    The safety checks are `rules`' own array predicate (game.rules).
+    """
+    engine = get_engine(N, K, rules)
+    if 2 * N >= 64 or any(mask >> 63 for candidate in candidates for mask in candidate):
+        return [engine.check_moves(candidate) for candidate in candidates]
+    count = len(candidates)
+    if count == 0:
+        return []
+    lengths = np.array([len(candidate) for candidate in candidates], dtype=np.int64)
+    longest = int(lengths.max())
+    moves = np.zeros((count, longest), dtype=np.uint64)
+    for i, candidate in enumerate(candidates):
+        moves[i, :len(candidate)] = candidate
+
+    full_mask = np.uint64(engine.full_mask)
+    is_safe = rules.compile_array_is_safe(N)
+
+    start = engine.goal_code if N == 0 else engine.initial_code # As check_moves: N=0 is won by doing nothing
+    left = np.full(count, start >> 1, dtype=np.uint64)
+    boat_on_left = np.full(count, bool(start & 1))
+    applied = np.zeros(count, dtype=np.int64)
+    reasons = np.full(count, -1, dtype=np.int8) # Index into FAILURES, -1 while still legal
+    failures = (INVALID_BOAT_SIZE, NOT_ON_SOURCE_BANK, UNSAFE_BOAT, UNSAFE_BANK)
+
+    for step in range(longest):
+        live = (reasons < 0) & (lengths > step)
+        if not live.any():
+            break
+        groups = moves[:, step]
+        sizes = array_bit_count(groups)
+        source = np.where(boat_on_left, left, full_mask ^ left)
+        new_left = left ^ groups
+        checks = (
+            (sizes < 1) | (sizes > K),
+            (groups & source) != groups,
+            ~is_safe(groups) if rules.check_boat else np.zeros(count, dtype=bool),
+            ~(is_safe(new_left) & is_safe(full_mask ^ new_left)),
+        )
+        failed = np.zeros(count, dtype=bool)
+        for index, check in enumerate(checks): # First failing check wins, in check_moves order
+            newly = live & ~failed & check
+            reasons[newly] = index
+            failed |= newly
+        moved = live & ~failed
+        left = np.where(moved, new_left, left)
+        boat_on_left = np.where(moved, ~boat_on_left, boat_on_left)
+        applied += moved
+
+    codes = (left.astype(object) << 1) | boat_on_left.astype(object)
+    results = []
+    for i in range(count):
+        code = int(codes[i])
+        if reasons[i] >= 0:
+            results.append((failures[reasons[i]], int(applied[i]), code))
+        elif code != engine.goal_code:
+            results.append((NOT_WIN, int(applied[i]), code))
+        else:
+            results.append((None, int(applied[i]), code))
+    return results
+
+def check_moves_trie(N: int, K: int, candidates: list[list[int]], rules=ACTOR_AGENT) -> list[tuple[str | None, int, int]]:
+    """
+    CompactEngine.check_moves for many candidates that share prefixes (e.g. samples for the
+    same (N, K)): every distinct prefix is replayed exactly once. Candidates are visited in
+    sorted order, which walks the trie of their moves depth first; the states along the
+    current path are kept on a stack, so the next candidate resumes from the end of its
+    common prefix with the previous one (or inherits the failure if that prefix already failed).
+    Returns the same (failure_reason, moves_applied, reached_code) triples, in input order.
+    """
+    engine = get_engine(N, K, rules)
+    full_mask, is_safe, check_boat = engine.full_mask, engine.is_safe, rules.check_boat
+    start = engine.goal_code if N == 0 else engine.initial_code # As check_moves: N=0 is won by doing nothing
+    codes = [start] # codes[d]: state after the first d moves of the current path
+    failure = None # (move_index, reason) if the current path contains an illegal move
+    previous = ()
+    results = [None] * len(candidates)
+    for i in sorted(range(len(candidates)), key=candidates.__getitem__):
+        candidate = candidates[i]
+        common = 0
+        for a, b in zip(previous, candidate):
+            if a != b:
+                break
+            common += 1
+        if failure is not None and failure[0] >= common: # The failing move is not shared
+            failure = None
+        del codes[common + 1:]
+        if failure is None: # Same checks as check_moves, inlined
+            code = codes[-1]
+            for index in range(len(codes) - 1, len(candidate)):
+                group = candidate[index]
+                left = code >> 1
+                new_left = left ^ group
+                if not 1 <= group.bit_count() <= K:
+                    failure = (index, INVALID_BOAT_SIZE)
+                elif group & (left if code & 1 else full_mask ^ left) != group:
+                    failure = (index, NOT_ON_SOURCE_BANK)
+                elif check_boat and not is_safe(group):
+                    failure = (index, UNSAFE_BOAT)
+                elif not (is_safe(new_left) and is_safe(full_mask ^ new_left)):
+                    failure = (index, UNSAFE_BANK)
+                else:
+                    code = (new_left << 1) | ((code & 1) ^ 1)
+                    codes.append(code)
+                    continue
+                break
+        if failure is not None:
+            results[i] = (failure[1], failure[0], codes[failure[0]])
+        else:
+            results[i] = (NOT_WIN if codes[-1] != engine.goal_code else None, len(candidate), codes[-1])
+        previous = candidate
+    return results
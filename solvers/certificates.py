@@ -0,0 +1,155 @@
+from math import comb
+
+# Pre-search unsolvability analysis.
+#
+# The rules only care about pairs (a_i, A_i) up to relabelling, so a state can be summarised by
+# its "pair types" on the left bank: (together, actor_only, agent_only, boat_on_left), where
+#   together    pairs with actor and agent both on the left,
+#   actor_only  pairs with only the actor on the left (its agent is on the right),
+#   agent_only  pairs with only the agent on the left (its actor is on the right).
+# There are at most 2 * C(N+3, 3) such summaries, versus 2^(2N+1) full states, and the goal
+# is reachable from a state iff the goal's summary (0, 0, 0, False) is reachable from its
+# summary. A set of summaries that contains the start, excludes the goal and is closed under
+# moves is therefore a certificate that no solution exists, and it can be re-checked without
+# any search.
+
+NO_SOLUTION = "NO_SOLUTION"
+
+# Certificate kinds, cheapest first
+NO_SAFE_FIRST_MOVE = "no_safe_first_move"
+SINGLE_SEAT_BOAT = "single_seat_boat"
+CLOSED_PAIR_TYPE_SET = "closed_pair_type_set"
+
+def pair_type_state(N: int, code: int) -> tuple[int, int, int, bool]:
+    """Pair-type summary of a compact-engine code (see the module comment)."""
+    left = code >> 1
+    actors = left & ((1 << N) - 1)
+    agents = left >> N
+    return ((actors & agents).bit_count(), (actors & ~agents).bit_count(),
+            (agents & ~actors).bit_count(), bool(code & 1))
+
+def _loads(source: tuple[int, int, int], K: int):
+    """
+    Safe boat loads from a bank with (together, actor_only, agent_only) pair types, as
+    (full_pairs, actors_from_together, agents_from_together, lone_actors, lone_agents).
+    A load with any agent may not contain an actor without its own agent, so loads are
+    either agents and full pairs only, or actors only.
+    """
+    together, actor_only, agent_only = source
+    for full_pairs in range(min(together, K // 2) + 1):
+        seats = K - 2 * full_pairs
+        for split_agents in range(min(together - full_pairs, seats) + 1):
+            for lone_agents in range(min(agent_only, seats - split_agents) + 1):
+                if full_pairs + split_agents + lone_agents:
+                    yield full_pairs, 0, split_agents, 0, lone_agents
+    for split_actors in range(min(together, K) + 1):
+        for lone_actors in range(min(actor_only, K - split_actors) + 1):
+            if split_actors + lone_actors:
+                yield 0, split_actors, 0, lone_actors, 0
+
+def pair_type_successors(N: int, K: int, state: tuple[int, int, int, bool]) -> list[tuple[int, int, int, bool]]:
+    """Summaries of all states reachable in one legal move from a state with summary `state`."""
+    together, actor_only, agent_only, boat_on_left = state
+    if boat_on_left:
+        source = (together, actor_only, agent_only)
+    else: # The right bank, seen the same way: its actor-only pairs are the left's agent-only ones
+        source = (N - together - actor_only - agent_only, agent_only, actor_only)
+    successors = set()
+    for full_pairs, split_actors, split_agents, lone_actors, lone_agents in _loads(source, K):
+        new_together = source[0] - full_pairs - split_actors - split_agents
+        new_actor_only = source[1] - lone_actors + split_agents
+        new_agent_only = source[2] - lone_agents + split_actors
+        # Source bank: agents there vs actors left without their agent
+        if new_together + new_agent_only and new_actor_only:
+            continue
+        # Destination bank: its lone actors are the source's agent-only pairs
+        if N - new_together - new_agent_only and new_agent_only:
+            continue
+        if boat_on_left:
+            successors.add((new_together, new_actor_only, new_agent_only, False))
+        else:
+            successors.add((N - new_together - new_actor_only - new_agent_only,
+                            new_agent_only, new_actor_only, True))
+    return list(successors)
+
+def _people_to_ferry(state: tuple[int, int, int, bool]) -> int:
+    """People on the left, plus the rower who must first bring the boat back if it is on the right."""
+    together, actor_only, agent_only, boat_on_left = state
+    return 2 * together + actor_only + agent_only + (0 if boat_on_left else 1)
+
+class UnsolvabilityCertificate:
+    """
+    Evidence that (N, K) has no solution from `start` (a pair-type summary).
+    `closed_set` is only set for CLOSED_PAIR_TYPE_SET certificates; verify() re-checks
+    the evidence without searching the full state space.
+    """
+
+    verdict = NO_SOLUTION
+
+    def __init__(self, N: int, K: int, kind: str, explanation: str,
+                 start: tuple[int, int, int, bool], closed_set: frozenset | None = None):
+        self.N = N
+        self.K = K
+        self.kind = kind
+        self.explanation = explanation
+        self.start = start
+        self.closed_set = closed_set
+
+    def verify(self) -> bool:
+        goal = (0, 0, 0, False)
+        if self.start == goal:
+            return False
+        if self.kind == NO_SAFE_FIRST_MOVE:
+            return not pair_type_successors(self.N, self.K, self.start)
+        if self.kind == SINGLE_SEAT_BOAT:
+            # Every crossing is followed by the only person on the far bank rowing back
+            return self.K == 1 and _people_to_ferry(self.start) >= 2
+        if self.kind == CLOSED_PAIR_TYPE_SET:
+            if self.start not in self.closed_set or goal in self.closed_set:
+                return False
+            return all(child in self.closed_set
+                       for state in self.closed_set
+                       for child in pair_type_successors(self.N, self.K, state))
+        return False
+
+    def __repr__(self):
+        return f"UnsolvabilityCertificate(N={self.N}, K={self.K}, kind={self.kind!r})"
+
+def find_unsolvability_certificate(N: int, K: int, start_code: int | None = None,
+                                   max_states: int | None = 1_000_000) -> UnsolvabilityCertificate | None:
+    """
+    Tries cheap sufficient conditions for "no solution" from `start_code` (default: everyone
+    on the left with the boat), cheapest first, and returns a certificate for the first that
+    holds. Returns None when the instance is solvable, or when the pair-type graph has more
+    than `max_states` summaries (inconclusive: fall back to a real search).
+    The pair-type check is exact, so with max_states=None a None result means "solvable".
+    """
+    start = (N, 0, 0, True) if start_code is None else pair_type_state(N, start_code)
+    goal = (0, 0, 0, False)
+    if start == goal:
+        return None
+    if not pair_type_successors(N, K, start):
+        return UnsolvabilityCertificate(N, K, NO_SAFE_FIRST_MOVE,
+                                        f"No safe boat load of size 1..{K} can leave the start.", start)
+    if K == 1 and _people_to_ferry(start) >= 2:
+        return UnsolvabilityCertificate(N, K, SINGLE_SEAT_BOAT,
+                                        "With one seat every round trip brings back whoever crossed, so the "
+                                        "left bank never shrinks by more than the single last crossing.", start)
+    if max_states is not None and 2 * comb(N + 3, 3) > max_states:
+        return None
+
+    seen = {start}
+    frontier = [start]
+    while frontier:
+        next_frontier = []
+        for state in frontier:
+            for child in pair_type_successors(N, K, state):
+                if child == goal:
+                    return None
+                if child not in seen:
+                    seen.add(child)
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return UnsolvabilityCertificate(N, K, CLOSED_PAIR_TYPE_SET,
+                                    f"The {len(seen)} pair-type summaries reachable from the start are closed "
+                                    f"under moves and do not include the goal.", start, frozenset(seen))
@@ -0,0 +1,291 @@
+import argparse
+import contextlib
+import io
+import random
+import time
+from functools import lru_cache
+
+from game.actions import get_action_space
+from game.compact import NOT_WIN, get_engine
+from game.environment import GameState
+from game.multibank import MultiBankEngine
+from .batch_validation import check_moves_batch, check_moves_trie
+from .heuristic import check_solution, validate_solution
+from .scoring import goal_distance_table, moves_to_masks, optimal_length, score_move_masks
+from .search import bfs_solve, iddfs_solve, multibank_bfs_solve
+
+# Seeded differential testing: every registered implementation gets the same generated cases
+# and must agree exactly with the reference: validate_solution itself for validators, GameState
+# for state engines and bfs_solve for solvers.
+#
+# VALIDATORS take (N, K, moves, masks) for a batch of candidates (paper-format move lists and
+# the same moves as boat masks) and return one (failure_reason, index) per candidate: index is
+# the failing move, or len(moves) when every move was legal. Entries registered with
+# reasons=False only report validity. STATE_ENGINES take (N, K, code) for a compact code of any
+# (possibly invalid) bank split and return None for an invalid state, else the set of successor
+# codes. SOLVERS take (N, K) and return the optimal number of moves, or None if unsolvable.
+# Register more implementations by adding entries to these dicts.
+
+def reference_check(N: int, K: int, moves: list[list[str]]) -> tuple[str | None, int]:
+    """The oracle: validate_solution's own replay (solvers.heuristic.check_solution), reporting the failing move and reason."""
+    return check_solution(N, K, moves)
+
+def _quiet_validate_solution(N, K, moves):
+    with contextlib.redirect_stdout(io.StringIO()): # It prints every failure
+        return validate_solution(N, K, moves)
+
+def _from_triples(triples):
+    return [(reason, applied) for reason, applied, _ in triples]
+
+def _from_score(score):
+    if score.failure_reason == NOT_WIN:
+        return NOT_WIN, score.candidate_length
+    return score.failure_reason, score.failed_move_index if score.failed_move_index is not None else score.candidate_length
+
+VALIDATORS = {
+    # name: (function, reports_reasons)
+    "reference": (lambda N, K, moves, masks: [reference_check(N, K, m) for m in moves], True),
+    "validate_solution": (lambda N, K, moves, masks: [_quiet_validate_solution(N, K, m) for m in moves], False),
+    "check_moves": (lambda N, K, moves, masks: _from_triples(get_engine(N, K).check_moves(m) for m in masks), True),
+    "check_moves_batch": (lambda N, K, moves, masks: _from_triples(check_moves_batch(N, K, masks)), True),
+    "check_moves_trie": (lambda N, K, moves, masks: _from_triples(check_moves_trie(N, K, masks)), True),
+    "score_move_masks": (lambda N, K, moves, masks: [_from_score(score_move_masks(N, K, m)) for m in masks], True),
+}
+
+def _reference_successors(N, K, code):
+    state = get_engine(N, K).decode(code)
+    if not state.is_valid_state():
+        return None
+    engine = get_engine(N, K)
+    return {engine.encode(child) for child in state.get_valid_next_states()}
+
+def _compact_successors(N, K, code):
+    engine = get_engine(N, K)
+    if not engine.is_valid_code(code):
+        return None
+    return {child for _, child in engine.successors(code)}
+
+def _action_mask_successors(N, K, code):
+    engine = get_engine(N, K)
+    if not engine.is_valid_code(code):
+        return None
+    space = get_action_space(N, K)
+    return {engine.apply(code, space.groups[action]) for action in space.legal_actions(code)}
+
+@lru_cache(maxsize=None)
+def _two_location_engine(N, K):
+    return MultiBankEngine(N, K, locations=2)
+
+def _multibank_successors(N, K, code):
+    # Two locations: location 0 is the left bank, boat position 0 means the boat is on the left
+    if not get_engine(N, K).is_valid_code(code):
+        return None
+    engine = _two_location_engine(N, K)
+    left = code >> 1
+    children = engine.successors(engine.pack([left, engine.full_mask ^ left], 0 if code & 1 else 1))
+    return {(masks[0] << 1) | (boat == 0) for masks, boat in (engine.unpack(child) for _, child in children)}
+
+STATE_ENGINES = {
+    "reference": _reference_successors,
+    "compact": _compact_successors,
+    "action_mask": _action_mask_successors,
+    "multibank": _multibank_successors,
+}
+
+def _path_length(path):
+    return len(path) - 1 if path else None
+
+SOLVERS = {
+    "reference": lambda N, K: _path_length(bfs_solve(GameState(N=N, boat_capacity=K))) if N else 0,
+    "distance_table": lambda N, K: optimal_length(N, K),
+    "iddfs": lambda N, K: _path_length(iddfs_solve(GameState(N=N, boat_capacity=K))) if N else 0,
+    "multibank": lambda N, K: (lambda moves: len(moves) if moves is not None else None)(
+        multibank_bfs_solve(MultiBankEngine(N, K, locations=2))),
+}
+
+class Disagreement:
+    """A case on which implementations disagree, with every implementation's answer."""
+
+    def __init__(self, kind: str, N: int, K: int, case, answers: dict):
+        self.kind = kind # "validator", "state_engine" or "solver"
+        self.N = N
+        self.K = K
+        self.case = case # Move list, compact code or None (solvers)
+        self.answers = answers
+
+    def __repr__(self):
+        return f"Disagreement({self.kind}, N={self.N}, K={self.K}, case={self.case!r}, answers={self.answers!r})"
+
+# --- Case generation ---
+
+def random_moves(rng: random.Random, N: int, K: int, max_moves: int) -> list[list[str]]:
+    """Arbitrary moves: sizes 0..K+1, repeated names and people who do not exist (some spelled almost like real ones)."""
+    names = [f"a_{i}" for i in range(1, N + 1)] + [f"A_{i}" for i in range(1, N + 1)]
+    strangers = [f"a_{N + 1}", f"A_{N + 1}", "A_0", "b_1", "a_01", "a_+1", "a_ 1", "a_1_0", "A_", "a1", "a_\u0661"]
+    moves = []
+    for _ in range(rng.randrange(max_moves + 1)):
+        size = rng.randrange(K + 2)
+        moves.append([rng.choice(strangers) if not names or rng.random() < 0.02 else rng.choice(names)
+                      for _ in range(size)])
+    return moves
+
+def adversarial_moves(rng: random.Random, N: int, K: int, max_moves: int) -> list[list[str]]:
+    """A random walk of legal moves, then one small mutation (most fail late and for one reason)."""
+    engine = get_engine(N, K)
+    code = engine.initial_code
+    masks = []
+    for _ in range(rng.randrange(max_moves + 1)):
+        successors = engine.successors(code)
+        if not successors:
+            break
+        group, code = rng.choice(successors)
+        masks.append(group)
+    moves = [engine.mask_to_group(mask) for mask in masks]
+    names = [engine.individual_name(bit) for bit in range(2 * N)]
+    mutation = rng.randrange(6)
+    if mutation == 0 and moves: # Someone extra gets in
+        rng.choice(moves).append(rng.choice(names) if names else "a_1")
+    elif mutation == 1 and moves: # Someone gets left behind
+        move = rng.choice(moves)
+        move.remove(rng.choice(move))
+    elif mutation == 2 and moves: # An actor and their agent swap roles
+        move = rng.choice(moves)
+        i = rng.randrange(len(move))
+        move[i] = ("A" if move[i][0] == "a" else "a") + move[i][1:]
+    elif mutation == 3 and len(moves) > 1: # Two moves in the wrong order
+        i = rng.randrange(len(moves) - 1)
+        moves[i], moves[i + 1] = moves[i + 1], moves[i]
+    elif mutation == 4: # A stray move
+        moves.insert(rng.randrange(len(moves) + 1), rng.sample(names, min(len(names), rng.randint(1, max(1, K)))))
+    return moves # mutation 5: unchanged (valid or unfinished)
+
+# --- Running and minimizing ---
+
+def _validator_answers(N, K, cases, validators):
+    masks = [moves_to_masks(N, K, moves) for moves in cases]
+    return {name: function(N, K, cases, masks) for name, (function, _) in validators.items()}
+
+def _agree(answer, expected, reports_reasons):
+    if reports_reasons:
+        return answer == expected
+    return answer == (expected[0] is None)
+
+def _validators_disagree(N, K, moves, validators) -> dict | None:
+    answers = {name: results[0] for name, results in _validator_answers(N, K, [moves], validators).items()}
+    expected = answers["reference"]
+    if all(_agree(answers[name], expected, validators[name][1]) for name in validators):
+        return None
+    return answers
+
+def minimize_moves(N: int, K: int, moves: list[list[str]], validators=None) -> list[list[str]]:
+    """
+    Shrinks a disagreeing move list while the disagreement persists: drops chunks of moves
+    (halving the chunk size, as in delta debugging), then single people from each move.
+    """
+    validators = validators or VALIDATORS
+    still_fails = lambda candidate: _validators_disagree(N, K, candidate, validators) is not None
+    chunk = max(1, len(moves) // 2)
+    while chunk >= 1:
+        i = 0
+        while i < len(moves):
+            candidate = moves[:i] + moves[i + chunk:]
+            if still_fails(candidate):
+                moves = candidate
+            else:
+                i += chunk
+        chunk //= 2
+    for i in range(len(moves)):
+        j = 0
+        while j < len(moves[i]):
+            candidate = moves[:i] + [moves[i][:j] + moves[i][j + 1:]] + moves[i + 1:]
+            if still_fails(candidate):
+                moves = candidate
+            else:
+                j += 1
+    return moves
+
+def run_fuzz(seed, cases: int, n_values=range(0, 6), k_values=range(1, 5), max_moves: int = 30,
+             chunk_size: int = 500, validators=None, state_engines=None, solvers=None,
+             max_disagreements: int = 10) -> tuple[list[Disagreement], dict]:
+    """
+    Runs `cases` generated move lists (half random, half adversarial) through every validator,
+    plus one random bank split per move list through every state engine and every (N, K) cell
+    through every solver. Returns (minimized disagreements, counts per kind of check).
+    Same seed (any value random.Random accepts), same cases.
+    """
+    validators = VALIDATORS if validators is None else validators
+    state_engines = STATE_ENGINES if state_engines is None else state_engines
+    solvers = SOLVERS if solvers is None else solvers
+    rng = random.Random(seed)
+    cells = [(N, K) for N in n_values for K in k_values]
+    disagreements = []
+    counts = {"validator": 0, "state_engine": 0, "solver": 0}
+
+    for N, K in cells if solvers else []:
+        answers = {name: solver(N, K) for name, solver in solvers.items()}
+        counts["solver"] += 1
+        if len(set(answers.values())) > 1:
+            disagreements.append(Disagreement("solver", N, K, None, answers))
+
+    done = 0
+    while done < cases and len(disagreements) < max_disagreements:
+        N, K = rng.choice(cells)
+        size = min(chunk_size, cases - done)
+        batch = [(adversarial_moves if rng.random() < 0.5 else random_moves)(rng, N, K, max_moves) for _ in range(size)]
+        answers = _validator_answers(N, K, batch, validators)
+        for i, moves in enumerate(batch):
+            expected = answers["reference"][i]
+            if not all(_agree(answers[name][i], expected, validators[name][1]) for name in validators):
+                small = minimize_moves(N, K, moves, validators)
+                disagreements.append(Disagreement("validator", N, K, small,
+                                                  _validators_disagree(N, K, small, validators)))
+                if len(disagreements) >= max_disagreements:
+                    break
+        for _ in range(size):
+            code = rng.getrandbits(2 * N + 1)
+            answers = {name: engine(N, K, code) for name, engine in state_engines.items()}
+            if any(answer != answers["reference"] for answer in answers.values()):
+                disagreements.append(Disagreement("state_engine", N, K, code, answers))
+        counts["validator"] += size
+        counts["state_engine"] += size
+        done += size
+    return disagreements, counts
+
+def _run_fuzz_worker(arguments):
+    seed, worker, cases, n_values, k_values, max_moves = arguments
+    return run_fuzz(f"{seed}:{worker}", cases, n_values, k_values, max_moves, solvers=None if worker == 0 else {})
+
+def run_fuzz_parallel(seed: int, cases: int, workers: int, n_values=range(0, 6), k_values=range(1, 5),
+                      max_moves: int = 30) -> tuple[list[Disagreement], dict]:
+    """run_fuzz split over worker processes, each with its own seed derived from `seed` (solvers run once)."""
+    from multiprocessing import Pool
+    shares = [cases // workers + (i < cases % workers) for i in range(workers)]
+    with Pool(workers) as pool:
+        results = pool.map(_run_fuzz_worker, [(seed, i, share, list(n_values), list(k_values), max_moves)
+                                              for i, share in enumerate(shares)])
+    disagreements = [d for found, _ in results for d in found]
+    counts = {kind: sum(counts[kind] for _, counts in results) for kind in results[0][1]}
+    return disagreements, counts
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m solvers.differential", description="Differential fuzzing of engines, validators and solvers against their references.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--n-max", type=int, default=5)
+    parser.add_argument("--k-max", type=int, default=4)
+    parser.add_argument("--max-moves", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (each gets a seed derived from --seed)")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    cells = (range(0, args.n_max + 1), range(1, args.k_max + 1), args.max_moves)
+    if args.workers > 1:
+        found, counts = run_fuzz_parallel(args.seed, args.cases, args.workers, *cells)
+    else:
+        found, counts = run_fuzz(args.seed, args.cases, *cells)
+    elapsed = time.time() - start_time
+    print(f"{counts} checks in {elapsed:.1f}s ({counts['validator'] / elapsed:,.0f} move lists/s)")
+    for disagreement in found:
+        print(disagreement)
+    if not found:
+        print("No disagreements.")
@@ -0,0 +1,186 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT, RULES
+
+# A state graph on disk is a directory of .npy arrays plus meta.json:
+#   codes.npy    uint64  compact code of each state, ascending (so the state index is the position)
+#   offsets.npy  int64   the moves of state v are entries offsets[v]..offsets[v+1] of the next two
+#   targets.npy  int32   state index reached by each move
+#   groups.npy   uint64  boat mask of each move (its label, see game.compact)
+#   meta.json    N, K, rules, format version, initial and goal state indexes (-1 if not in the graph)
+# meta.json is written last, so a directory without it is an unfinished export.
+# load_state_graph memory-maps the arrays: opening a graph costs the same at any size.
+
+FORMAT_VERSION = 1
+ARRAYS = ("codes", "offsets", "targets", "groups")
+
+# Codes are stored as uint64, so 2N+1 bits only fit up to N=31, and well before that the
+# component (about 6 * 2^N states for Actor-Agent, far more for M&C) no longer fits in memory.
+MAX_GRAPH_N = 16
+
+class StateGraph:
+    """
+    The states reachable from the start of one (N, K) (or from a given start code) and the
+    moves between them, in CSR form. Built by build_state_graph, written by save_state_graph,
+    opened without copying by load_state_graph.
+    """
+
+    def __init__(self, N: int, K: int, codes, offsets, targets, groups, initial_id: int, goal_id: int, rules=ACTOR_AGENT):
+        self.N = N
+        self.K = K
+        self.rules = rules
+        self.codes = codes
+        self.offsets = offsets
+        self.targets = targets
+        self.groups = groups
+        self.initial_id = initial_id
+        self.goal_id = goal_id # -1: the goal is not reachable
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def id_of(self, code: int) -> int:
+        """State index of a compact code, or -1 if it is not in the graph."""
+        position = int(np.searchsorted(self.codes, np.uint64(code)))
+        return position if position < len(self.codes) and int(self.codes[position]) == code else -1
+
+    def neighbours(self, v: int):
+        """(target state indexes, boat masks) of the moves out of state v."""
+        start, end = self.offsets[v], self.offsets[v + 1]
+        return self.targets[start:end], self.groups[start:end]
+
+    def bfs(self, source: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Distances (in moves, -1: unreachable) and BFS parents (-1 for the source and
+        unreachable states) of every state from state `source`. Each layer is expanded
+        with a few array operations over the CSR arrays.
+        """
+        distances = np.full(len(self.codes), -1, dtype=np.int32)
+        parents = np.full(len(self.codes), -1, dtype=np.int32)
+        distances[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        layer = 0
+        while len(frontier):
+            layer += 1
+            starts = self.offsets[frontier]
+            counts = self.offsets[frontier + 1] - starts
+            # Every edge index out of the frontier, frontier state by frontier state
+            edge_ids = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            children = self.targets[edge_ids]
+            new = distances[children] < 0
+            children, first = np.unique(children[new], return_index=True)
+            distances[children] = layer
+            parents[children] = np.repeat(frontier, counts)[new][first]
+            frontier = children.astype(np.int64)
+        return distances, parents
+
+    def shortest_path(self, source: int | None = None, target: int | None = None) -> list[int] | None:
+        """Boat masks of a shortest path (default: from the start to the goal), or None if there is none."""
+        source = self.initial_id if source is None else source
+        target = self.goal_id if target is None else target
+        if target < 0 or source < 0:
+            return None
+        distances, parents = self.bfs(source)
+        if distances[target] < 0:
+            return None
+        path = [target]
+        while path[-1] != source:
+            path.append(int(parents[path[-1]]))
+        path.reverse()
+        return [int(self.codes[a] ^ self.codes[b]) >> 1 for a, b in zip(path, path[1:])]
+
+def build_state_graph(N: int, K: int, rules=ACTOR_AGENT, start_code: int | None = None) -> StateGraph:
+    """The graph of every state reachable from `start_code` (default: everyone on the left)."""
+    if N > MAX_GRAPH_N:
+        raise ValueError(f"N={N} is too large for a state graph (at most N={MAX_GRAPH_N}).")
+    engine = get_engine(N, K, rules)
+    start = engine.initial_code if start_code is None else start_code
+    seen = {start}
+    frontier = [start]
+    while frontier: # BFS to collect the component
+        next_frontier = []
+        for code in frontier:
+            for _, child in engine.successors(code):
+                if child not in seen:
+                    seen.add(child)
+                    next_frontier.append(child)
+        frontier = next_frontier
+
+    codes = np.array(sorted(seen), dtype=np.uint64)
+    offsets = np.zeros(len(codes) + 1, dtype=np.int64)
+    target_codes, groups = [], []
+    for v, code in enumerate(codes.tolist()):
+        for group, child in engine.successors(code):
+            target_codes.append(child)
+            groups.append(group)
+        offsets[v + 1] = len(groups)
+    targets = np.searchsorted(codes, np.array(target_codes, dtype=np.uint64)).astype(np.int32)
+    graph = StateGraph(N, K, codes, offsets, targets, np.array(groups, dtype=np.uint64), -1, -1, rules)
+    graph.initial_id = graph.id_of(start)
+    graph.goal_id = graph.id_of(engine.goal_code)
+    return graph
+
+def save_state_graph(graph: StateGraph, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, "meta.json")
+    if os.path.exists(meta_path):
+        os.remove(meta_path) # Mark the directory unfinished while the arrays are replaced
+    for name in ARRAYS:
+        np.save(os.path.join(directory, f"{name}.npy"), np.asarray(getattr(graph, name)))
+    meta = {"format_version": FORMAT_VERSION, "N": graph.N, "K": graph.K, "rules": graph.rules.name,
+            "initial_id": graph.initial_id, "goal_id": graph.goal_id}
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+
+def load_state_graph(directory: str, mmap: bool = True) -> StateGraph:
+    """Opens a saved graph; with `mmap` the arrays are read-only memory maps of the files (no copy)."""
+    try:
+        with open(os.path.join(directory, "meta.json")) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"{directory} has no finished state graph (meta.json is missing).") from None
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported state graph format {meta.get('format_version')} in {directory}.")
+    arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None) for name in ARRAYS}
+    if len(arrays["offsets"]) != len(arrays["codes"]) + 1 or not (
+            len(arrays["targets"]) == len(arrays["groups"]) == arrays["offsets"][-1]):
+        raise ValueError(f"Inconsistent state graph arrays in {directory}.")
+    return StateGraph(meta["N"], meta["K"], **arrays, initial_id=meta["initial_id"], goal_id=meta["goal_id"],
+                      rules=RULES[meta["rules"]])
+
+def export_state_graph(N: int, K: int, directory: str, rules=ACTOR_AGENT) -> StateGraph:
+    """Builds the graph for (N, K) and saves it to `directory`."""
+    graph = build_state_graph(N, K, rules)
+    save_state_graph(graph, directory)
+    return graph
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m solvers.graph_export", description="Export the reachable state graph of an (N, K) as memory-mappable CSR arrays.")
+    parser.add_argument("--n", type=int, default=10)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--rules", choices=sorted(RULES), default=ACTOR_AGENT.name)
+    parser.add_argument("--out", default=None, help="Output directory (default: cache/graphs/n<N>_k<K>)")
+    args = parser.parse_args()
+    out = args.out or os.path.join("cache", "graphs", f"n{args.n}_k{args.k}")
+
+    start_time = time.time()
+    graph = export_state_graph(args.n, args.k, out, RULES[args.rules])
+    print(f"Exported {len(graph)} states and {graph.edge_count} moves to {out} in {time.time() - start_time:.2f}s")
+    start_time = time.time()
+    loaded = load_state_graph(out)
+    print(f"Opened in {(time.time() - start_time) * 1000:.1f} ms")
+    start_time = time.time()
+    distances, _ = loaded.bfs(loaded.initial_id)
+    path = loaded.shortest_path()
+    print(f"BFS over the loaded graph in {time.time() - start_time:.3f}s: eccentricity of the start {distances.max()}, "
+          f"optimal length {len(path) if path is not None else 'NO_SOLUTION'}")
@@ -1,6 +1,7 @@
-import sys
-import os
 import time
+from collections.abc import Sequence
+
+from game.rules import ACTOR_AGENT
 
 # solve_k4_n_greater_equal_6_heuristic is now solve_k4_heuristic_2N_minus_3
 
@@ -47,69 +48,166 @@ def solve_k4_heuristic_2N_minus_3(N: int) -> list[list[str]]:
     # print(f"[{time.time():.2f} - {func_name}] END for N={N}. Total moves: {len(moves)}.")
     return moves
 
-def validate_solution(N: int, K: int, moves: list[list[str]]) -> bool:
-    # GameState import is local to this function
+OFF_SCHEDULE = "off_schedule" # Legal move, but not the one K4HeuristicSolution's closed form predicts
+
+class K4HeuristicSolution(Sequence):
+    """
+    solve_k4_heuristic_2N_minus_3(N) without materializing it: move i is computed from i and N
+    on demand, so len(), indexing and slicing cost O(1) per move even for N=10**9. Slices are
+    lazy views too (K4HeuristicSolution(N)[10:20] holds a range, not moves).
+
+    Move 2j (j < N-2) takes pair P_{j+3} across with the ferry pair P_1, move 2j+1 brings P_1
+    back, and the last move takes P_1 and P_2. So the state before any move is known in closed
+    form (state_before), and check_window proves a window of moves valid without replaying
+    the moves before it.
+    """
+
+    def __init__(self, N: int, indices: range | None = None):
+        self.N = N
+        self.ferry_moves = 2 * (N - 2) if N >= 2 else 0 # Moves of part 1
+        self.indices = range(2 * N - 3 if N >= 2 else 0) if indices is None else indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return K4HeuristicSolution(self.N, self.indices[index])
+        return self.move(self.indices[index])
+
+    def __iter__(self):
+        return map(self.move, self.indices)
+
+    def __repr__(self):
+        return f"K4HeuristicSolution(N={self.N}, indices={self.indices!r})"
+
+    def move(self, i: int) -> list[str]:
+        """Move i of the full solution (ignores slicing), sorted as in solve_k4_heuristic_2N_minus_3."""
+        if not 0 <= i < 2 * self.N - 3:
+            raise IndexError(f"Move {i} out of range for N={self.N}.")
+        if i >= self.ferry_moves: # Last move: P_1 and P_2
+            return sorted(["a_1", "A_1", "a_2", "A_2"])
+        if i % 2:
+            return sorted(["a_1", "A_1"])
+        pair = i // 2 + 3
+        return sorted([f"a_{pair}", f"A_{pair}", "a_1", "A_1"])
+
+    def state_before(self, i: int) -> tuple[bool, frozenset, range]:
+        """
+        State before move i (0 <= i <= 2N-3) of the full solution: (boat_on_left, small, tail),
+        where the pairs on the left bank are `small` (a subset of {1, 2}) plus the range `tail`.
+        Every pair is always together, so every such state is safe.
+        """
+        N = self.N
+        if not 0 <= i <= max(2 * N - 3, 0):
+            raise IndexError(f"State {i} out of range for N={N}.")
+        if i > self.ferry_moves or N < 2: # Solved (N < 2: the empty solution leaves everyone on the left)
+            return (False, frozenset(), range(N + 1, N + 1)) if N >= 2 else (True, frozenset(range(1, N + 1)), range(0))
+        j = i // 2
+        if i % 2: # P_1 and P_3..P_{j+3} on the right
+            return False, frozenset({2}), range(j + 4, N + 1)
+        return True, frozenset({1, 2}), range(j + 3, N + 1)
+
+    def _parse(self, name: str):
+        # (is_agent, pair) of a well-formed name, or None for someone who is not in the puzzle
+        prefix, number = name[:2], name[2:]
+        if prefix in ("a_", "A_") and number.isdigit() and number == str(int(number)) and 1 <= int(number) <= self.N:
+            return prefix == "A_", int(number)
+        return None
+
+    def check_window(self, start: int, stop: int, moves=None) -> tuple[str | None, int]:
+        """
+        Checks moves start..stop-1 of the full solution (or the given `moves` in their place) with
+        validate_solution's rules, starting from the closed-form state_before(start), and checks
+        that each move reaches the closed-form next state. Costs O(1) per move, whatever N is,
+        so spot checks of short windows are O(1). check_window(0, len) proves the whole solution:
+        state_before(0) is the start and state_before(2N-3) the goal.
+        Returns (None, stop), or (failure reason, index of the failing move).
+        """
+        from game.compact import INVALID_BOAT_SIZE, NOT_ON_SOURCE_BANK, UNSAFE_BANK, UNSAFE_BOAT # Lazy: see check_solution
+        moves = map(self.move, range(start, stop)) if moves is None else moves
+        K = 4
+        for i, move in zip(range(start, stop), moves):
+            group = set(move)
+            if not 1 <= len(group) <= K:
+                return INVALID_BOAT_SIZE, i
+            boat_on_left, small, tail = self.state_before(i)
+            members = [self._parse(name) for name in group]
+            if None in members or any(((pair in small) or (pair in tail)) != boat_on_left for _, pair in members):
+                return NOT_ON_SOURCE_BANK, i
+            agents = {pair for is_agent, pair in members if is_agent}
+            actors = {pair for is_agent, pair in members if not is_agent}
+            if agents and not actors <= agents: # An actor in the boat with other agents but not their own
+                return UNSAFE_BOAT, i
+            # Both banks held whole pairs, so only split pairs can break them: the source keeps the actor
+            # of an agent that left, the destination gets an actor whose agent stayed behind.
+            source_pairs = len(small) + len(tail) if boat_on_left else self.N - len(small) - len(tail)
+            source_has_agents = source_pairs > len(agents)
+            destination_has_agents = self.N - source_pairs + len(agents) > 0
+            if (source_has_agents and agents - actors) or (destination_has_agents and actors - agents):
+                return UNSAFE_BANK, i
+            next_on_left, next_small, next_tail = self.state_before(i + 1)
+            # Pairs that change banks; small and tail never overlap, and consecutive tails share their end
+            moved = set(small ^ next_small) ^ set(range(min(tail.start, next_tail.start), max(tail.start, next_tail.start)))
+            if next_on_left == boat_on_left or actors != moved or agents != moved:
+                return OFF_SCHEDULE, i
+        return None, stop
+
+    def window_is_valid(self, start: int, stop: int) -> bool:
+        return self.check_window(start, stop)[0] is None
+
+def check_solution(N: int, K: int, moves: list[list[str]], rules=ACTOR_AGENT, report=None) -> tuple[str | None, int]:
+    """
+    The replay behind validate_solution, reporting where and why it fails: (failure_reason, index)
+    with game.compact's reasons, index being the failing move (len(moves) if every move was legal).
+    `report(message)`, if given, receives validate_solution's messages. N=0 starts won, so
+    any move fails there (as in CompactEngine.check_moves).
+    """
+    # Imported here, not at module level: `import solvers` goes through this module, and neither
+    # GameState nor the engine is needed for the heuristic's move lists.
+    from game.compact import INVALID_BOAT_SIZE, NOT_ON_SOURCE_BANK, NOT_WIN, UNSAFE_BANK, UNSAFE_BOAT
     from game.environment import GameState
     func_name = "validate_solution"
-    # print(f"[{time.time():.2f} - {func_name}] START for N={N}, K={K}, {len(moves)} moves.")
-
-    if N == 0: return not moves # Empty moves list is a win for N=0
+    report = report or (lambda message: None)
 
-    initial_check_state = GameState(N=N, boat_capacity=K)
-    if not moves: # No moves provided
-        return initial_check_state.is_win()
-
-    current_state = GameState(N=N, boat_capacity=K)
+    current_state = GameState(N=N, boat_capacity=K, boat_on_left=N > 0, rules=rules)
     if not current_state.is_valid_state():
         # This print is important if initial state itself is bad.
-        print(f"[{time.time():.2f} - {func_name}] Initial state for N={N}, K={K} is INVALID.")
-        return False
+        report(f"[{time.time():.2f} - {func_name}] Initial state for N={N}, K={K} is INVALID.")
+        return UNSAFE_BANK, 0
 
     for i, move_individuals_list in enumerate(moves):
         move_individuals_set = set(move_individuals_list)
 
         if not (1 <= len(move_individuals_set) <= K):
-            print(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Invalid boat size {len(move_individuals_set)} for K={K}.")
-            return False
+            report(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Invalid boat size {len(move_individuals_set)} for K={K}.")
+            return INVALID_BOAT_SIZE, i
         source_bank = current_state.left_bank if current_state.boat_on_left else current_state.right_bank
         if not move_individuals_set.issubset(source_bank):
-            print(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Individuals {sorted(list(move_individuals_set - source_bank))} not on source bank {sorted(list(source_bank))}.")
-            return False
-        if not GameState.is_group_safe(move_individuals_set, current_state.actors, current_state.agents):
-            print(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Boat group {sorted(list(move_individuals_set))} unsafe.")
-            return False
-
-        new_left_bank_set = set(current_state.left_bank)
-        new_right_bank_set = set(current_state.right_bank)
-        new_boat_on_left_val = not current_state.boat_on_left
-        if current_state.boat_on_left: # L->R
-            new_left_bank_set -= move_individuals_set
-            new_right_bank_set.update(move_individuals_set)
-        else: # R->L
-            new_right_bank_set -= move_individuals_set
-            new_left_bank_set.update(move_individuals_set)
-
-        next_state = GameState(N=N, boat_capacity=K, left_bank_individuals=new_left_bank_set, right_bank_individuals=new_right_bank_set, boat_on_left=new_boat_on_left_val)
-        if not next_state.is_valid_state():
-            print(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} ({sorted(list(move_individuals_set))}) FAIL: Resulting state invalid.")
-            # To give more detail on why next_state is invalid:
-            if not GameState.is_group_safe(next_state.left_bank, next_state.actors, next_state.agents):
-                 print(f"  Reason: New left bank {sorted(list(next_state.left_bank))} is unsafe.")
-            if not GameState.is_group_safe(next_state.right_bank, next_state.actors, next_state.agents):
-                 print(f"  Reason: New right bank {sorted(list(next_state.right_bank))} is unsafe.")
-            on_left_and_right = next_state.left_bank.intersection(next_state.right_bank)
-            if len(on_left_and_right) > 0:
-                 print(f"  Reason: Individuals on both banks: {sorted(list(on_left_and_right))}")
-            on_left_or_right = next_state.left_bank.union(next_state.right_bank)
-            if on_left_or_right != next_state.all_individuals:
-                 print(f"  Reason: Individuals missing or extra. Expected: {sorted(list(next_state.all_individuals))}, Got: {sorted(list(on_left_or_right))}")
-            return False
-        current_state = next_state
+            report(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Individuals {sorted(list(move_individuals_set - source_bank))} not on source bank {sorted(list(source_bank))}.")
+            return NOT_ON_SOURCE_BANK, i
+        if rules.check_boat and not current_state.group_is_safe(move_individuals_set):
+            report(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} FAIL: Boat group {sorted(list(move_individuals_set))} unsafe.")
+            return UNSAFE_BOAT, i
+
+        # Move in place: only one GameState is used for the whole replay.
+        current_state.apply_move(move_individuals_set)
+        if not current_state.banks_are_safe():
+            report(f"[{time.time():.2f} - {func_name}] N={N} Move {i+1} ({sorted(list(move_individuals_set))}) FAIL: Resulting state invalid.")
+            # To give more detail on why the resulting state is invalid:
+            if not current_state.group_is_safe(current_state.left_bank):
+                 report(f"  Reason: New left bank {sorted(list(current_state.left_bank))} is unsafe.")
+            if not current_state.group_is_safe(current_state.right_bank):
+                 report(f"  Reason: New right bank {sorted(list(current_state.right_bank))} is unsafe.")
+            return UNSAFE_BANK, i
 
     if not current_state.is_win():
-        print(f"[{time.time():.2f} - {func_name}] N={N} END: Final state is NOT a win.")
-        return False
-    return True
+        report(f"[{time.time():.2f} - {func_name}] N={N} END: Final state is NOT a win.")
+        return NOT_WIN, len(moves)
+    return None, len(moves)
+
+def validate_solution(N: int, K: int, moves: list[list[str]], rules=ACTOR_AGENT) -> bool:
+    return check_solution(N, K, moves, rules, report=print)[0] is None
 
 if __name__ == '__main__':
     pass # Keep __main__ minimal
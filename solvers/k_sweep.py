@@ -0,0 +1,120 @@
+from array import array
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT
+
+class KSweepGraph:
+    """
+    The goal's component of the state graph for one N and every boat capacity up to `k_max`,
+    built once. Safe states do not depend on K, and the moves for K are exactly the moves for
+    k_max with a boat load of at most K people, so one graph serves every K <= k_max.
+
+    Compact codes are numbered 0..V-1 (`codes`, `index`; the goal is 0). Edges are stored in CSR
+    form: the neighbours of vertex v are targets[offsets[v]:offsets[v + 1]], sorted by boat load
+    size, and size_ends[K][v] marks where the loads larger than K begin. A search for K just
+    stops reading each neighbour list early, so no successor is generated or checked twice.
+    """
+
+    def __init__(self, N: int, k_max: int, rules=ACTOR_AGENT):
+        self.N = N
+        self.k_max = k_max
+        self.rules = rules
+        engine = get_engine(N, k_max, rules)
+        self.initial_code = engine.initial_code
+        self.codes = [engine.goal_code]
+        self.index = {engine.goal_code: 0}
+        self.offsets = array("q", [0])
+        self.targets = array("i")
+        self.size_ends = {K: array("q") for K in range(1, k_max + 1)}
+        # BFS over k_max's moves; children get numbers as they are found
+        v = 0
+        while v < len(self.codes):
+            neighbours = sorted((group.bit_count(), child) for group, child in engine.successors(self.codes[v]))
+            for _, child in neighbours:
+                if child not in self.index:
+                    self.index[child] = len(self.codes)
+                    self.codes.append(child)
+                self.targets.append(self.index[child])
+            start = self.offsets[v]
+            sizes = [size for size, _ in neighbours]
+            position = 0
+            for K in range(1, k_max + 1):
+                while position < len(sizes) and sizes[position] <= K:
+                    position += 1
+                self.size_ends[K].append(start + position)
+            self.offsets.append(start + len(neighbours))
+            v += 1
+
+    def __len__(self):
+        return len(self.codes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    def goal_distances(self, K: int, stop_at: int | None = None) -> array:
+        """
+        Moves to the goal from every vertex with boat capacity K (-1: cannot reach it with K).
+        Moves are reversible, so this is a BFS from the goal over the edges of load <= K.
+        With `stop_at` (a vertex), the BFS stops once that vertex has its distance.
+        """
+        if not 1 <= K <= self.k_max:
+            raise ValueError(f"K={K} is outside 1..{self.k_max}.")
+        offsets, targets, ends = self.offsets, self.targets, self.size_ends[K]
+        distances = array("i", [-1]) * len(self.codes)
+        distances[0] = 0
+        frontier = [0]
+        layer = 0
+        while frontier and (stop_at is None or distances[stop_at] < 0):
+            layer += 1
+            next_frontier = []
+            for v in frontier:
+                for w in targets[offsets[v]:ends[v]]:
+                    if distances[w] < 0:
+                        distances[w] = layer
+                        next_frontier.append(w)
+            frontier = next_frontier
+        return distances
+
+    def optimal_length(self, K: int) -> int | None:
+        """Optimal number of moves from the initial state with boat capacity K, or None if unsolvable."""
+        if self.N == 0:
+            return 0
+        start = self.index.get(self.initial_code)
+        if start is None: # Not even k_max solves it
+            if not 1 <= K <= self.k_max:
+                raise ValueError(f"K={K} is outside 1..{self.k_max}.")
+            return None
+        distance = self.goal_distances(K, stop_at=start)[start]
+        return distance if distance >= 0 else None
+
+    def sweep(self) -> dict[int, int | None]:
+        """Optimal length (None: unsolvable) for every K in 1..k_max."""
+        return {K: self.optimal_length(K) for K in range(1, self.k_max + 1)}
+
+def k_sweep(N: int, k_max: int, rules=ACTOR_AGENT) -> dict[int, int | None]:
+    """Optimal length (None: unsolvable) for every boat capacity 1..k_max, from one state graph."""
+    return KSweepGraph(N, k_max, rules).sweep()
+
+if __name__ == '__main__':
+    import argparse
+    import time
+
+    from .scoring import optimal_length
+
+    parser = argparse.ArgumentParser(prog="python -m solvers.k_sweep", description="Optimal lengths for every K <= k_max from one state graph.")
+    parser.add_argument("--n", type=int, default=10)
+    parser.add_argument("--k-max", type=int, default=6)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    graph = KSweepGraph(args.n, args.k_max)
+    built = time.time() - start_time
+    lengths = graph.sweep()
+    swept = time.time() - start_time - built
+    print(f"N={args.n}: {len(graph)} states, {graph.edge_count} edges; built in {built:.2f}s, swept in {swept:.2f}s")
+    print(lengths)
+
+    start_time = time.time()
+    separate = {K: optimal_length(args.n, K) for K in range(1, args.k_max + 1)}
+    print(f"Separate distance table per K: {time.time() - start_time:.2f}s (same answers: {separate == lengths})")
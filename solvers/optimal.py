@@ -0,0 +1,108 @@
+from game.environment import GameState
+from game.compact import get_engine
+
+class ShortestPathDAG:
+    """
+    All shortest paths from a start state to the win state, stored as a BFS DAG over
+    compact states: every state on a shortest path keeps *all* of its predecessors
+    (with the boat group used), not just the first one BFS happened to find.
+    Built by build_shortest_path_dag().
+    """
+
+    def __init__(self, engine, start_code: int, length: int | None,
+                 predecessors: dict[int, list[tuple[int, int]]], path_counts: dict[int, int]):
+        self.engine = engine
+        self.start_code = start_code
+        self.length = length # Optimal number of moves, or None if the goal is unreachable
+        self.predecessors = predecessors # code -> [(parent_code, boat_group), ...]
+        self.path_counts = path_counts # code -> number of shortest paths from the start to code
+
+    def count_solutions(self) -> int:
+        """Number of distinct optimal solutions, computed by DP over the DAG (no enumeration)."""
+        if self.length is None:
+            return 0
+        return self.path_counts[self.engine.goal_code]
+
+    def iter_solution_masks(self):
+        """Lazily yields every optimal solution as a list of boat-group masks."""
+        if self.length is None:
+            return
+        if self.length == 0:
+            yield []
+            return
+        # Walk back from the goal; every predecessor chain ends at the start after exactly `length` moves.
+        groups = []
+        stack = [iter(self.predecessors[self.engine.goal_code])]
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                if groups:
+                    groups.pop()
+                continue
+            parent, group = step
+            groups.append(group)
+            if parent == self.start_code:
+                yield groups[::-1]
+                groups.pop()
+            else:
+                stack.append(iter(self.predecessors[parent]))
+
+    def iter_solutions(self):
+        """Lazily yields every optimal solution in paper format, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+        for masks in self.iter_solution_masks():
+            yield [self.engine.mask_to_group(mask) for mask in masks]
+
+    def is_optimal_solution(self, moves: list[list[str]]) -> bool:
+        """
+        O(length) check that `moves` is one of the optimal solutions: any legal move
+        sequence that reaches the goal in exactly `length` moves is a shortest path.
+        """
+        if self.length is None or len(moves) != self.length:
+            return False
+        try:
+            masks = [self.engine.group_to_mask(move) for move in moves]
+        except ValueError: # Unknown individual
+            return False
+        reason, _, _ = self.engine.check_moves(masks, start_code=self.start_code)
+        return reason is None
+
+def build_shortest_path_dag(initial_state: GameState) -> ShortestPathDAG | None:
+    """
+    Breadth-first search that records every shortest-path predecessor instead of the
+    first one found. Stops once the layer containing the goal is complete.
+    Returns None for an invalid initial state, like bfs_solve.
+    """
+    if not initial_state.is_valid_state():
+        return None
+
+    engine = get_engine(initial_state.N, initial_state.boat_capacity)
+    start_code = engine.encode(initial_state)
+    depth = {start_code: 0}
+    predecessors = {start_code: []}
+    path_counts = {start_code: 1}
+    if start_code == engine.goal_code:
+        return ShortestPathDAG(engine, start_code, 0, predecessors, path_counts)
+
+    frontier = [start_code]
+    layer = 0
+    while frontier:
+        next_frontier = []
+        for code in frontier:
+            count = path_counts[code]
+            for group, child in engine.successors(code):
+                child_depth = depth.get(child)
+                if child_depth is None:
+                    depth[child] = layer + 1
+                    predecessors[child] = [(code, group)]
+                    path_counts[child] = count
+                    next_frontier.append(child)
+                elif child_depth == layer + 1:
+                    predecessors[child].append((code, group))
+                    path_counts[child] += count
+        layer += 1
+        if engine.goal_code in depth:
+            return ShortestPathDAG(engine, start_code, layer, predecessors, path_counts)
+        frontier = next_frontier
+
+    return ShortestPathDAG(engine, start_code, None, predecessors, path_counts)
@@ -0,0 +1,103 @@
+import cProfile
+import csv
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Per-cell profiling for the generator scripts (--profile). Each profiled cell writes:
+#   <label>.prof         raw cProfile data (open with pstats or snakeviz)
+#   <label>.txt          hot functions by own time and by cumulative time
+#   <label>_memory.txt   peak traced memory and the allocation sites still live at the end of the cell
+# and finish() writes summary.csv (one row per cell) and summary.txt (hot functions over all cells).
+# tracemalloc slows Python code down several times, so compare cells with each other, not with
+# unprofiled runs.
+
+class CellProfiler:
+    """Wraps each solve in cProfile and tracemalloc and writes the reports to `report_dir`."""
+
+    def __init__(self, report_dir: str, top: int = 25, frames: int = 1):
+        self.report_dir = report_dir
+        self.top = top # Rows per table
+        self.frames = frames # Traceback depth kept by tracemalloc (1: just the allocating line)
+        self.rows = []
+        self.stats = None # Combined pstats.Stats of all cells
+        os.makedirs(report_dir, exist_ok=True)
+
+    @contextmanager
+    def cell(self, label: str):
+        """Profiles the body of the `with` block as one cell named `label` (used in file names)."""
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        base_memory, _ = tracemalloc.get_traced_memory()
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            ])
+            if started_tracing:
+                tracemalloc.stop()
+            self._write_cell(label, profiler, elapsed, peak - base_memory, snapshot)
+
+    def _write_cell(self, label, profiler, elapsed, peak_bytes, snapshot):
+        path = os.path.join(self.report_dir, label)
+        profiler.dump_stats(path + ".prof")
+        stats = pstats.Stats(profiler)
+        with open(path + ".txt", "w") as f:
+            f.write(f"{label}: {elapsed:.3f}s wall, {stats.total_calls} calls\n")
+            f.write(self._hot_functions(stats))
+        with open(path + "_memory.txt", "w") as f:
+            f.write(f"{label}: peak {peak_bytes / 2**20:.2f} MiB traced above the start of the cell\n\n")
+            f.write(f"Top {self.top} allocation sites live at the end of the cell:\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                f.write(f"{stat.size / 2**10:>12.1f} KiB {stat.count:>10} blocks  {stat.traceback}\n")
+
+        top_function = max(stats.stats.items(), key=lambda item: item[1][2], default=None) # By own time
+        self.rows.append({
+            "cell": label,
+            "seconds": round(elapsed, 4),
+            "calls": stats.total_calls,
+            "peak_mib": round(peak_bytes / 2**20, 3),
+            "top_function": pstats.func_std_string(top_function[0]) if top_function else "",
+            "top_function_seconds": round(top_function[1][2], 4) if top_function else 0,
+        })
+        if self.stats is None:
+            self.stats = stats
+        else:
+            self.stats.add(stats)
+
+    def _hot_functions(self, stats) -> str:
+        out = io.StringIO()
+        stats.stream = out
+        for order in ("tottime", "cumulative"):
+            out.write(f"\nTop {self.top} by {order}:\n")
+            stats.sort_stats(order).print_stats(self.top)
+        return out.getvalue()
+
+    def finish(self) -> str | None:
+        """Writes summary.csv and summary.txt; returns the summary.csv path (None if nothing was profiled)."""
+        if not self.rows:
+            return None
+        summary_path = os.path.join(self.report_dir, "summary.csv")
+        with open(summary_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.rows[0]))
+            writer.writeheader()
+            writer.writerows(self.rows)
+        with open(os.path.join(self.report_dir, "summary.txt"), "w") as f:
+            for row in self.rows:
+                f.write(f"{row['cell']:<28} {row['seconds']:>10.3f}s {row['peak_mib']:>10.2f} MiB  {row['top_function']}\n")
+            f.write("\nAll cells together:\n")
+            f.write(self._hot_functions(self.stats))
+        return summary_path
@@ -0,0 +1,114 @@
+import os
+import struct
+from functools import lru_cache
+
+from game.environment import GameState
+from game.compact import get_engine
+
+# Bitmaps are cached on disk here, one file per (N, K); they only depend on N and K.
+REACHABILITY_CACHE_DIR = os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')),
+                                      "cache", "reachability")
+
+# One bit per compact code, i.e. 2^(2N+1) bits: 8 MB at N=12, 128 MB at N=14.
+MAX_BITMAP_N = 14
+
+# File layout: magic, version byte, N byte, K byte, then the raw bitmap.
+MAGIC = b"RCREACH"
+VERSION = 1
+
+class GoalReachability:
+    """
+    "Can this state still reach the goal?" for every compact state of one (N, K),
+    as a bitmap indexed by code (bit set = the goal is reachable). Lookups are O(1),
+    so solvers can drop dead states as soon as they are generated.
+    Built by build_goal_reachability(); get_goal_reachability() caches it in memory and on disk.
+    """
+
+    def __init__(self, N: int, K: int, bitmap: bytearray):
+        self.N = N
+        self.K = K
+        self.bitmap = bitmap
+        self.engine = get_engine(N, K)
+
+    def can_reach_goal(self, code: int) -> bool:
+        return bool(self.bitmap[code >> 3] & (1 << (code & 7)))
+
+    def state_can_reach_goal(self, state: GameState) -> bool:
+        """Same question for a GameState of this (N, K); invalid states never reach the goal."""
+        if (state.N, state.boat_capacity, state.rules) != (self.N, self.K, self.engine.rules):
+            raise ValueError(f"State has N={state.N}, K={state.boat_capacity} ({state.rules!r}); "
+                             f"the bitmap is for N={self.N}, K={self.K} ({self.engine.rules!r}).")
+        if not state.is_valid_state():
+            return False
+        return self.can_reach_goal(self.engine.encode(state))
+
+    def count(self) -> int:
+        """Number of states from which the goal is reachable."""
+        return sum(byte.bit_count() for byte in self.bitmap)
+
+def build_goal_reachability(N: int, K: int) -> GoalReachability:
+    """
+    BFS backwards from the goal over compact states. Moves are reversible, so the
+    states it reaches are exactly those that can reach the goal.
+    """
+    if N > MAX_BITMAP_N:
+        raise ValueError(f"N={N} is too large for a reachability bitmap (at most N={MAX_BITMAP_N}).")
+    engine = get_engine(N, K)
+    bitmap = bytearray(max(1, (1 << (2 * N + 1)) // 8))
+    goal_code = engine.goal_code
+    bitmap[goal_code >> 3] |= 1 << (goal_code & 7)
+    frontier = [goal_code]
+    while frontier:
+        next_frontier = []
+        for code in frontier:
+            for _, child in engine.successors(code):
+                byte, bit = child >> 3, 1 << (child & 7)
+                if not bitmap[byte] & bit:
+                    bitmap[byte] |= bit
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return GoalReachability(N, K, bitmap)
+
+def _cache_path(cache_dir: str, N: int, K: int) -> str:
+    return os.path.join(cache_dir, f"n{N}_k{K}.reach")
+
+def save_goal_reachability(reachability: GoalReachability, file_path: str) -> None:
+    with open(file_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<BBB", VERSION, reachability.N, reachability.K))
+        f.write(reachability.bitmap)
+
+def load_goal_reachability(file_path: str) -> GoalReachability:
+    with open(file_path, "rb") as f:
+        header = f.read(len(MAGIC) + 3)
+        if len(header) != len(MAGIC) + 3 or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{file_path} is not a reachability bitmap.")
+        version, N, K = struct.unpack("<BBB", header[len(MAGIC):])
+        if version != VERSION:
+            raise ValueError(f"Unsupported reachability bitmap version {version} in {file_path}.")
+        bitmap = bytearray(f.read())
+    if len(bitmap) != max(1, (1 << (2 * N + 1)) // 8):
+        raise ValueError(f"Truncated reachability bitmap in {file_path}.")
+    return GoalReachability(N, K, bitmap)
+
+@lru_cache(maxsize=16)
+def get_goal_reachability(N: int, K: int, cache_dir: str | None = REACHABILITY_CACHE_DIR) -> GoalReachability:
+    """
+    Cached GoalReachability for (N, K): memory first, then `cache_dir` on disk, and only
+    then a fresh backward search (whose result is written to `cache_dir`).
+    Pass cache_dir=None to skip the disk cache.
+    """
+    if cache_dir is not None:
+        file_path = _cache_path(cache_dir, N, K)
+        try:
+            reachability = load_goal_reachability(file_path)
+            if (reachability.N, reachability.K) == (N, K):
+                return reachability
+        except (OSError, ValueError): # Missing or unreadable: rebuild it
+            pass
+    reachability = build_goal_reachability(N, K)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        temporary_path = f"{file_path}.{os.getpid()}.tmp" # Readers never see a half-written file
+        save_goal_reachability(reachability, temporary_path)
+        os.replace(temporary_path, file_path)
+    return reachability
@@ -0,0 +1,93 @@
+from functools import lru_cache
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT
+from .scoring import goal_distance_table, moves_to_masks
+
+@lru_cache(maxsize=100_000)
+def shortest_completion(N: int, K: int, code: int, rules=ACTOR_AGENT) -> tuple[int, ...] | None:
+    """
+    Boat-group masks of a shortest move sequence from compact state `code` to the goal,
+    or None if the goal cannot be reached from it. Walks down the cached distance-to-goal
+    table (always to the first successor one step closer), so no search runs per call,
+    and the result is cached by reached state: candidates that fail in the same place share it.
+    """
+    engine = get_engine(N, K, rules)
+    distances = goal_distance_table(N, K, rules)
+    distance = distances.get(code)
+    if distance is None:
+        return None
+    completion = []
+    while distance:
+        for group, child in engine.successors(code):
+            if distances.get(child) == distance - 1:
+                completion.append(group)
+                code, distance = child, distance - 1
+                break
+    return tuple(completion)
+
+def edit_distance(first: list[int], second: list[int]) -> int:
+    """Levenshtein distance between two move sequences (insert, delete or replace one move)."""
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, move in enumerate(first, 1):
+        current = [i]
+        for j, other in enumerate(second, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (move != other)))
+        previous = current
+    return previous[-1]
+
+class SolutionRepair:
+    """
+    Result of repairing a candidate: its longest valid prefix followed by a shortest
+    completion from the state that prefix reaches. Move indexes are 0-based.
+    """
+
+    def __init__(self, N: int, K: int, candidate: list[int], kept_moves: int,
+                 failure_reason: str | None, completion: tuple[int, ...] | None, rules=ACTOR_AGENT):
+        self.N = N
+        self.K = K
+        self.rules = rules
+        self.candidate_length = len(candidate)
+        self.failure_reason = failure_reason # Why the candidate itself fails (None if it was already valid)
+        self.kept_moves = kept_moves # Length of the longest valid prefix
+        if completion is None: # The goal is unreachable (unsolvable instance)
+            self.repaired_masks = None
+            self.edit_distance = None
+        else:
+            self.repaired_masks = candidate[:kept_moves] + list(completion)
+            self.edit_distance = edit_distance(candidate[kept_moves:], list(completion))
+
+    @property
+    def repaired(self) -> bool:
+        return self.repaired_masks is not None
+
+    def moves(self) -> list[list[str]] | None:
+        """The repaired solution in paper format, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+        if self.repaired_masks is None:
+            return None
+        engine = get_engine(self.N, self.K, self.rules)
+        return [engine.mask_to_group(mask) for mask in self.repaired_masks]
+
+    def as_dict(self) -> dict:
+        return {
+            'n': self.N, 'k': self.K, 'candidate_length': self.candidate_length,
+            'failure_reason': self.failure_reason, 'kept_moves': self.kept_moves,
+            'repaired_length': len(self.repaired_masks) if self.repaired_masks is not None else None,
+            'edit_distance': self.edit_distance, 'moves': self.moves(),
+        }
+
+    def __repr__(self):
+        return (f"SolutionRepair(N={self.N}, K={self.K}, kept_moves={self.kept_moves}, "
+                f"failure_reason={self.failure_reason!r}, edit_distance={self.edit_distance})")
+
+def repair_move_masks(N: int, K: int, masks: list[int], rules=ACTOR_AGENT) -> SolutionRepair:
+    """Repairs boat-group masks (e.g. from game.move_parser); a valid candidate comes back unchanged."""
+    reason, applied, code = get_engine(N, K, rules).check_moves(masks)
+    completion = () if reason is None else shortest_completion(N, K, code, rules)
+    return SolutionRepair(N, K, list(masks), applied, reason, completion, rules)
+
+def repair_solution(N: int, K: int, moves: list[list[str]], rules=ACTOR_AGENT) -> SolutionRepair:
+    """Repairs a paper-format move list, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+    return repair_move_masks(N, K, moves_to_masks(N, K, moves, rules), rules)
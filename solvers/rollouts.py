@@ -0,0 +1,204 @@
+import argparse
+import time
+
+import numpy as np
+
+from game.actions import get_action_space
+from .scoring import goal_distance_table
+
+# Rollout outcomes
+WIN = "win"
+ILLEGAL = "illegal" # The policy attempted an illegal move (only the "uniform" policy does)
+STUCK = "stuck" # No legal move from the current state
+MAX_MOVES = "max_moves" # Still playing after the move limit
+
+OUTCOMES = (WIN, ILLEGAL, STUCK, MAX_MOVES)
+
+# Policies: "uniform" picks any action (legal or not), "legal" a uniformly random legal one,
+# "epsilon_greedy" an optimal one (one step closer to the goal) except with probability epsilon.
+POLICIES = ("uniform", "legal", "epsilon_greedy")
+
+# The state table is indexed by compact code: 2^(2N+1) int32 entries, 32 MB at N=12.
+MAX_TABLE_N = 12
+
+class RolloutTable:
+    """
+    Safe-move table for the states reachable from the start of one (N, K), in CSR form:
+    the legal moves of state s are entries offsets[s]..offsets[s+1] of `actions`
+    (action indexes, see game.actions) and `next_states` (state ids). `greedy_*` holds the
+    same for the moves that get one step closer to the goal (empty if the cell is unsolvable).
+    """
+
+    def __init__(self, N: int, K: int):
+        if N > MAX_TABLE_N:
+            raise ValueError(f"N={N} is too large for a rollout table (at most N={MAX_TABLE_N}).")
+        space = get_action_space(N, K)
+        engine = space.engine
+        distances = goal_distance_table(N, K)
+        self.N = N
+        self.K = K
+        self.action_space = space
+
+        codes = [engine.initial_code]
+        ids = {engine.initial_code: 0}
+        offsets, actions, next_states = [0], [], []
+        greedy_offsets, greedy_actions, greedy_next_states = [0], [], []
+        position = 0
+        while position < len(codes): # BFS over the start's component, numbering states as they are found
+            code = codes[position]
+            position += 1
+            distance = distances.get(code)
+            for group, child in engine.successors(code):
+                if child not in ids:
+                    ids[child] = len(codes)
+                    codes.append(child)
+                actions.append(space.group_index(group))
+                next_states.append(ids[child])
+                if distance is not None and distances.get(child) == distance - 1:
+                    greedy_actions.append(space.group_index(group))
+                    greedy_next_states.append(ids[child])
+            offsets.append(len(actions))
+            greedy_offsets.append(len(greedy_actions))
+
+        self.codes = np.array(codes, dtype=np.uint64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.actions = np.array(actions, dtype=np.int32)
+        self.next_states = np.array(next_states, dtype=np.int32)
+        self.greedy_offsets = np.array(greedy_offsets, dtype=np.int64)
+        self.greedy_actions = np.array(greedy_actions, dtype=np.int32)
+        self.greedy_next_states = np.array(greedy_next_states, dtype=np.int32)
+        self.goal_id = ids.get(engine.goal_code, -1)
+        # Dense code -> state id lookup (-1 outside the component), for moves chosen without the table
+        self.code_to_id = np.full(1 << (2 * N + 1), -1, dtype=np.int32)
+        self.code_to_id[self.codes.astype(np.int64)] = np.arange(len(codes), dtype=np.int32)
+        self.groups = np.array(space.groups, dtype=np.uint64)
+
+class Rollout:
+    """One simulated game: the action indexes played (including a final illegal attempt) and how it ended."""
+
+    __slots__ = ('actions', 'outcome', 'illegal_step', 'action_space')
+
+    def __init__(self, actions: list[int], outcome: str, illegal_step: int | None, action_space):
+        self.actions = actions
+        self.outcome = outcome
+        self.illegal_step = illegal_step # 0-based index of the first illegal attempt, if any
+        self.action_space = action_space
+
+    def moves(self) -> list[list[str]]:
+        """The game in paper format, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+        return [self.action_space.move(action) for action in self.actions]
+
+    def __repr__(self):
+        return f"Rollout(moves={len(self.actions)}, outcome={self.outcome!r}, illegal_step={self.illegal_step})"
+
+def _pick(rng, offsets: np.ndarray, values: np.ndarray, next_states: np.ndarray, states: np.ndarray):
+    """For each state, one of its CSR entries uniformly at random. Returns (actions, next_states, has_entry)."""
+    starts = offsets[states]
+    counts = offsets[states + 1] - starts
+    has_entry = counts > 0
+    picks = starts + (rng.random(len(states)) * counts).astype(np.int64)
+    picks = np.where(has_entry, picks, 0)
+    if len(values) == 0:
+        return np.zeros(len(states), dtype=np.int32), np.zeros(len(states), dtype=np.int32), has_entry
+    return values[picks], next_states[picks], has_entry
+
+def simulate_rollouts(N: int, K: int, games: int, max_moves: int, policy: str = "legal", seed: int | None = None,
+                      epsilon: float = 0.1, batch_size: int = 4096, table: RolloutTable | None = None):
+    """
+    Plays `games` games of up to `max_moves` moves from the start of (N, K) and yields one Rollout
+    per game, in order. Games are played `batch_size` at a time with NumPy over a RolloutTable,
+    so each move costs a few array operations shared by the whole batch.
+    Same seed, same games.
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}; expected one of {POLICIES}.")
+    table = table or RolloutTable(N, K)
+    rng = np.random.default_rng(seed)
+    space = table.action_space
+    num_actions = len(space)
+    actor_mask = np.uint64(space.engine.actor_mask)
+    full_mask = np.uint64(space.engine.full_mask)
+    shift = np.uint64(N)
+
+    def is_safe(masks):
+        agents = masks >> shift
+        return (agents == 0) | ((masks & actor_mask & ~agents) == 0)
+
+    for batch_start in range(0, games, batch_size):
+        size = min(batch_size, games - batch_start)
+        states = np.zeros(size, dtype=np.int32)
+        outcomes = np.full(size, OUTCOMES.index(MAX_MOVES), dtype=np.int8)
+        lengths = np.full(size, max_moves, dtype=np.int32)
+        played = np.full((size, max_moves), -1, dtype=np.int32)
+        active = np.arange(size)
+        if table.goal_id == 0: # Already won (N=0)
+            outcomes[:] = OUTCOMES.index(WIN)
+            lengths[:] = 0
+            active = active[:0]
+        for step in range(max_moves):
+            if len(active) == 0:
+                break
+            current = states[active]
+            if policy == "uniform":
+                actions = rng.integers(num_actions, size=len(active)).astype(np.int32)
+                codes = table.codes[current]
+                left = codes >> np.uint64(1)
+                source = np.where((codes & np.uint64(1)) == 1, left, full_mask ^ left)
+                groups = table.groups[actions]
+                new_left = left ^ groups
+                legal = ((groups & source) == groups) & is_safe(new_left) & is_safe(full_mask ^ new_left)
+                new_codes = (new_left << np.uint64(1)) | ((codes & np.uint64(1)) ^ np.uint64(1))
+                next_states = np.where(legal, table.code_to_id[np.where(legal, new_codes, 0).astype(np.int64)], 0)
+                moved = legal
+            else: # Legal moves only; `moved` is False where there is none
+                actions, next_states, moved = _pick(rng, table.offsets, table.actions, table.next_states, current)
+                if policy == "epsilon_greedy":
+                    greedy = (rng.random(len(active)) >= epsilon) & \
+                             (table.greedy_offsets[current + 1] > table.greedy_offsets[current])
+                    if greedy.any():
+                        greedy_actions, greedy_next, _ = _pick(rng, table.greedy_offsets, table.greedy_actions,
+                                                               table.greedy_next_states, current[greedy])
+                        actions[greedy] = greedy_actions
+                        next_states[greedy] = greedy_next
+
+            attempted = moved | (policy == "uniform") # An illegal attempt is recorded too
+            played[active[attempted], step] = actions[attempted]
+            states[active[moved]] = next_states[moved]
+            won = moved & (next_states == table.goal_id)
+            finished = won | ~moved
+            if finished.any():
+                done = active[finished]
+                if policy == "uniform":
+                    outcomes[done] = np.where(won[finished], OUTCOMES.index(WIN), OUTCOMES.index(ILLEGAL))
+                else:
+                    outcomes[done] = np.where(won[finished], OUTCOMES.index(WIN), OUTCOMES.index(STUCK))
+                lengths[done] = np.where(won[finished] | (policy == "uniform"), step + 1, step)
+                active = active[~finished]
+
+        for i in range(size):
+            outcome = OUTCOMES[outcomes[i]]
+            yield Rollout(played[i, :lengths[i]].tolist(), outcome,
+                          lengths[i] - 1 if outcome == ILLEGAL else None, space)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m solvers.rollouts", description="Benchmark random/guided rollouts over the compact safe-move table.")
+    parser.add_argument("--n", type=int, default=6)
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--games", type=int, default=100_000)
+    parser.add_argument("--max-moves", type=int, default=50)
+    parser.add_argument("--policy", choices=POLICIES, default="legal")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = RolloutTable(args.n, args.k)
+    start_time = time.time()
+    counts = dict.fromkeys(OUTCOMES, 0)
+    total_moves = 0
+    for rollout in simulate_rollouts(args.n, args.k, args.games, args.max_moves, policy=args.policy,
+                                     seed=args.seed, table=table):
+        counts[rollout.outcome] += 1
+        total_moves += len(rollout.actions)
+    elapsed = time.time() - start_time
+    print(f"N={args.n}, K={args.k}, policy={args.policy}: {args.games} games, {total_moves} moves "
+          f"in {elapsed:.2f}s ({total_moves / elapsed:,.0f} moves/s)")
+    print(counts)
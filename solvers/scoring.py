@@ -0,0 +1,121 @@
+from functools import lru_cache
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT
+
+@lru_cache(maxsize=32)
+def goal_distance_table(N: int, K: int, rules=ACTOR_AGENT) -> dict[int, int]:
+    """
+    Distance (in moves) to the win state for every compact state that can reach it.
+    Built once per (N, K) by a BFS backwards from the goal; moves are reversible,
+    so walking successors from the goal visits exactly the states that can reach it.
+    This runs its own search instead of falling back to bfs_solve: one reverse BFS
+    gives the distance of *every* state, which scoring needs to locate deviations.
+    `rules` picks the puzzle variant (game.rules), as everywhere in this module.
+    """
+    engine = get_engine(N, K, rules)
+    distances = {engine.goal_code: 0}
+    frontier = [engine.goal_code]
+    layer = 0
+    while frontier:
+        layer += 1
+        next_frontier = []
+        for code in frontier:
+            for _, child in engine.successors(code):
+                if child not in distances:
+                    distances[child] = layer
+                    next_frontier.append(child)
+        frontier = next_frontier
+    return distances
+
+def optimal_length(N: int, K: int, rules=ACTOR_AGENT) -> int | None:
+    """Optimal number of moves from the initial state, or None if the instance has no solution."""
+    if N == 0:
+        return 0
+    return goal_distance_table(N, K, rules).get(get_engine(N, K, rules).initial_code)
+
+class SolutionScore:
+    """
+    Result of scoring a candidate solution against the optimum for its (N, K).
+    Move indexes are 0-based positions in the candidate move list.
+    """
+
+    def __init__(self, N: int, K: int, candidate_length: int, optimal_length: int | None,
+                 failure_reason: str | None, failed_move_index: int | None, deviation_move_index: int | None):
+        self.N = N
+        self.K = K
+        self.candidate_length = candidate_length
+        self.optimal_length = optimal_length # None if (N, K) has no solution
+        self.failure_reason = failure_reason # None for a valid solution (see game.compact reasons)
+        self.failed_move_index = failed_move_index # First illegal move, or len(moves) if the final state is not a win
+        self.deviation_move_index = deviation_move_index # First move that leaves every optimal path, None if it never does
+
+    @property
+    def valid(self) -> bool:
+        return self.failure_reason is None
+
+    @property
+    def optimality_gap(self) -> int | None:
+        """Extra moves compared to the optimum, for valid solutions only."""
+        if not self.valid or self.optimal_length is None:
+            return None
+        return self.candidate_length - self.optimal_length
+
+    def as_dict(self) -> dict:
+        return {
+            'n': self.N, 'k': self.K, 'valid': self.valid,
+            'candidate_length': self.candidate_length, 'optimal_length': self.optimal_length,
+            'optimality_gap': self.optimality_gap, 'failure_reason': self.failure_reason,
+            'failed_move_index': self.failed_move_index, 'deviation_move_index': self.deviation_move_index,
+        }
+
+    def __repr__(self):
+        return (f"SolutionScore(N={self.N}, K={self.K}, valid={self.valid}, "
+                f"candidate_length={self.candidate_length}, optimal_length={self.optimal_length}, "
+                f"deviation_move_index={self.deviation_move_index})")
+
+def score_move_masks(N: int, K: int, masks: list[int], rules=ACTOR_AGENT) -> SolutionScore:
+    """
+    Scores boat-group masks (e.g. from game.move_parser) with table lookups only:
+    one replay of the moves plus one distance lookup per reached state.
+    """
+    engine = get_engine(N, K, rules)
+    distances = goal_distance_table(N, K, rules)
+    best = optimal_length(N, K, rules)
+    reason, applied, _ = engine.check_moves(masks)
+
+    deviation = None
+    if best is None:
+        deviation = 0 if masks else None # Nothing stays on an optimal path when there is none
+    else:
+        code = engine.goal_code if N == 0 else engine.initial_code
+        for i in range(applied):
+            code = engine.apply(code, masks[i])
+            if distances.get(code) != best - (i + 1):
+                deviation = i
+                break
+        else:
+            if applied < len(masks): # The illegal move itself is where the candidate leaves
+                deviation = applied
+
+    return SolutionScore(N, K, len(masks), best, reason,
+                         applied if reason is not None else None, deviation)
+
+def moves_to_masks(N: int, K: int, moves: list[list[str]], rules=ACTOR_AGENT) -> list[int]:
+    """Boat-group masks of a paper-format move list, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+    engine = get_engine(N, K, rules)
+    unknown_bits = {} # Unknown individuals get bits above the 2N real ones, so they are never on a bank
+    masks = []
+    for move in moves:
+        mask = 0
+        for name in move:
+            try:
+                mask |= 1 << engine.individual_bit(name)
+            except ValueError:
+                mask |= 1 << unknown_bits.setdefault(name, 2 * N + len(unknown_bits))
+        masks.append(mask)
+    return masks
+
+def score_solution(N: int, K: int, moves: list[list[str]], rules=ACTOR_AGENT) -> SolutionScore:
+    """Scores a paper-format move list, e.g. [['A_2', 'a_2'], ['A_2'], ...]."""
+    return score_move_masks(N, K, moves_to_masks(N, K, moves, rules), rules)
@@ -1,18 +1,31 @@
-from collections import deque
-import sys
+from array import array
+from collections import OrderedDict, deque
+import heapq
+from math import comb, inf
 import os
 
-# Adjust path to import from parent directory's 'game' module
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-
 from game.environment import GameState # Only GameState is needed now
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT, RULES
+from .certificates import find_unsolvability_certificate
+
+# Every solver takes the puzzle rules (game.rules) as `rules`. States carry their rules, so the
+# argument defaults to those of the start state and only has to agree with them when given.
 
-def bfs_solve(initial_state: GameState) -> list[GameState] | None:
+def _solver_rules(initial_state: GameState, rules):
+    if rules is None:
+        return initial_state.rules
+    if rules is not initial_state.rules:
+        raise ValueError(f"The start state follows {initial_state.rules!r}, not {rules!r}.")
+    return rules
+
+def bfs_solve(initial_state: GameState, rules=None) -> list[GameState] | None:
     """
     Solves a river crossing puzzle using Breadth-First Search.
     Works for any GameState that implements get_valid_next_states(), is_win(), is_valid().
     BFS is guaranteed to find the shortest path in terms of the number of moves.
     """
+    _solver_rules(initial_state, rules)
     if not initial_state.is_valid_state(): # Use the new method name
         return None
     if initial_state.is_win():
@@ -37,34 +50,528 @@ def bfs_solve(initial_state: GameState) -> list[GameState] | None:
 
     return None
 
-def dfs_solve(initial_state: GameState) -> list[GameState] | None:
+def dfs_solve(initial_state: GameState, rules=None) -> list[GameState] | None:
     """
     Solves a river crossing puzzle using Depth-First Search (iterative).
     Works for any GameState that implements get_valid_next_states(), is_win(), is_valid().
+    Explores compact codes (game.compact) with engine.apply: the visited set holds ints
+    and the only GameState objects built are the states on the returned path.
+    Successors are claimed (marked visited, checked for a win) when their parent is
+    expanded and then entered last-generated first, so the largest boat loads are
+    tried first, exactly as when every successor was pushed on a stack of states.
     """
+    rules = _solver_rules(initial_state, rules)
     if not initial_state.is_valid_state(): # Use the new method name
         return None
     if initial_state.is_win():
         return [initial_state]
 
-    stack = [(initial_state, [initial_state])]
-    visited_states = {initial_state}
+    engine = get_engine(initial_state.N, initial_state.boat_capacity, rules)
+    apply = engine.apply
+    boat_groups = engine.boat_groups
+    goal_code = engine.goal_code
+    start_code = engine.encode(initial_state)
+    visited_codes = {start_code}
+
+    def claim_successors(code):
+        """Returns (newly claimed successor codes in visiting order, True if the goal is one of them)."""
+        claimed = []
+        for group in boat_groups:
+            child = apply(code, group)
+            if child is not None and child not in visited_codes:
+                visited_codes.add(child)
+                if child == goal_code:
+                    return iter(()), True
+                claimed.append(child)
+        return reversed(claimed), False
+
+    path_codes = [start_code] # The current branch; candidate_iterators[i] holds the unexplored children of path_codes[i]
+    successors, found = claim_successors(start_code)
+    candidate_iterators = [successors]
+    while not found and candidate_iterators:
+        child = next(candidate_iterators[-1], None)
+        if child is None: # All moves from this state explored; backtrack
+            candidate_iterators.pop()
+            path_codes.pop()
+            continue
+        path_codes.append(child)
+        successors, found = claim_successors(child)
+        candidate_iterators.append(successors)
+
+    if not found:
+        return None
+    return [initial_state] + [engine.decode(code) for code in path_codes[1:]] + [engine.decode(goal_code)]
 
-    while stack:
-        current_state, current_path = stack.pop()
-        possible_next_states = current_state.get_valid_next_states()
+# multiprocessing is imported inside the functions below: importing it takes longer than the
+# rest of the package, and most users of this module never run the parallel solver.
 
-        for next_state in possible_next_states:
-            if next_state not in visited_states:
-                new_path = current_path + [next_state]
-                if next_state.is_win():
-                    return new_path
+# Layers smaller than this are expanded in-process; the IPC round trip costs more than it saves.
+PARALLEL_MIN_LAYER_SIZE = 2048
 
-                visited_states.add(next_state)
-                stack.append((next_state, new_path))
+def _write_pairs(pairs) -> tuple[str | None, int]:
+    """
+    Copies (code, parent_code) pairs, flattened as [code, parent, code, parent, ...],
+    into a new shared memory block of uint64 slots. Returns (block_name, pair_count);
+    nothing is allocated for an empty list (block_name None). The block stays alive
+    after this process closes it and is unlinked by whoever consumes it.
+    """
+    from multiprocessing import shared_memory
+    if not pairs:
+        return None, 0
+    shm = shared_memory.SharedMemory(create=True, size=8 * len(pairs))
+    try:
+        shm.buf[:] = array('Q', pairs).tobytes()
+    finally:
+        shm.close()
+    return shm.name, len(pairs) // 2
+
+def _read_pairs(block: tuple[str | None, int], codes_only: bool = False) -> list[int]:
+    """Reads a block written by _write_pairs (flattened pairs, or only the codes)."""
+    from multiprocessing import shared_memory
+    shm_name, count = block
+    if shm_name is None:
+        return []
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        view = shm.buf.cast('Q')
+        values = view[0:2 * count:2 if codes_only else 1].tolist()
+        view.release()
+    finally:
+        shm.close()
+    return values
+
+def _unlink_blocks(shm_names) -> None:
+    from multiprocessing import shared_memory
+    for shm_name in shm_names:
+        if shm_name is None:
+            continue
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name)
+        except FileNotFoundError: # Already consumed
+            continue
+        shm.close()
+        shm.unlink()
+
+def _expand_partition(task) -> list[tuple[str | None, int]]:
+    """
+    Worker: generates the successors of one partition of the frontier and routes them
+    by owner (child_code % partitions). Each owner's {child: parent} candidates (first
+    parent wins) go into their own shared memory block; only block names are returned.
+    """
+    layer_block, N, K, rules_name, partitions = task
+    engine = get_engine(N, K, RULES[rules_name])
+    buckets = [{} for _ in range(partitions)]
+    for code in _read_pairs(layer_block, codes_only=True):
+        for _, child in engine.successors(code):
+            bucket = buckets[child % partitions]
+            if child not in bucket:
+                bucket[child] = code
+    outboxes = []
+    for bucket in buckets:
+        pairs = []
+        for child, parent in bucket.items():
+            pairs.append(child)
+            pairs.append(parent)
+        outboxes.append(_write_pairs(pairs))
+    return outboxes
+
+def _dedupe_partition(task) -> tuple[str | None, int]:
+    """
+    Worker: owner of one hash partition. Merges the candidate blocks addressed to it,
+    drops already-visited codes and writes its slice of the next layer.
+    Moves are reversible, so a successor of layer d can only lie in layers d-1, d or d+1;
+    checking this partition's slices of the previous and current layers finds every revisit.
+    """
+    inboxes, own_layer_blocks = task
+    seen = set()
+    for block in own_layer_blocks:
+        seen.update(_read_pairs(block, codes_only=True))
+    new_codes = {}
+    for block in inboxes:
+        pairs = _read_pairs(block)
+        for i in range(0, len(pairs), 2):
+            child = pairs[i]
+            if child not in seen and child not in new_codes:
+                new_codes[child] = pairs[i + 1]
+    _unlink_blocks(shm_name for shm_name, _ in inboxes) # Consumed: this owner is the only reader
+    pairs = []
+    for child, parent in new_codes.items():
+        pairs.append(child)
+        pairs.append(parent)
+    return _write_pairs(pairs)
+
+def parallel_bfs_solve(initial_state: GameState, workers: int | None = None, rules=None) -> list[GameState] | None:
+    """
+    Layer-synchronous BFS over compact (integer) states, parallelised within a single (N, K) instance.
+    States are hash-partitioned (code % partitions) and each layer is stored as one shared memory
+    block per partition. A process pool expands every partition, sends each owner its candidates
+    in a block of their own, and each owner deduplicates against its own slices of the last two layers,
+    so per-layer work and memory traffic stay O(layer size) in total.
+    Returns a shortest path like bfs_solve (same length, possibly a different optimal path).
+    Workers look the rules up by name in game.rules.RULES.
+    """
+    rules = _solver_rules(initial_state, rules)
+    if not initial_state.is_valid_state():
+        return None
+    if initial_state.is_win():
+        return [initial_state]
+
+    from multiprocessing import Pool, resource_tracker
+    N, K = initial_state.N, initial_state.boat_capacity
+    if 2 * N + 1 > 64:
+        raise ValueError(f"N={N} is too large: encoded states must fit in 64-bit shared memory slots.")
+    engine = get_engine(N, K, rules)
+    workers = workers or os.cpu_count() or 1
+    partitions = workers
+
+    start_code = engine.encode(initial_state)
+    parents = {start_code: None}
+    goal_found = False
+    previous_layer = [(None, 0)] * partitions
+    current_layer = [(None, 0)] * partitions
+    outboxes = []
+    pool = None
+    try:
+        current_layer[start_code % partitions] = _write_pairs([start_code, start_code])
+        if workers > 1:
+            # Share one resource tracker with the workers, which create blocks the parent unlinks.
+            resource_tracker.ensure_running()
+            pool = Pool(workers)
+        layer_size = 1
+        while layer_size and not goal_found:
+            use_pool = pool is not None and layer_size >= PARALLEL_MIN_LAYER_SIZE
+            run = pool.map if use_pool else (lambda function, tasks: list(map(function, tasks)))
+            outboxes = run(_expand_partition, [(block, N, K, rules.name, partitions) for block in current_layer])
+            next_layer = run(_dedupe_partition,
+                             [([sent[owner] for sent in outboxes], (previous_layer[owner], current_layer[owner]))
+                              for owner in range(partitions)])
+            outboxes = []
+
+            _unlink_blocks(shm_name for shm_name, _ in previous_layer)
+            previous_layer, current_layer = current_layer, next_layer
+            layer_size = 0
+            for block in current_layer:
+                pairs = _read_pairs(block)
+                for i in range(0, len(pairs), 2):
+                    parents[pairs[i]] = pairs[i + 1]
+                layer_size += block[1]
+            goal_found = engine.goal_code in parents
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        _unlink_blocks(shm_name for sent in outboxes for shm_name, _ in sent)
+        _unlink_blocks(shm_name for shm_name, _ in previous_layer + current_layer)
+
+    if not goal_found:
+        return None
+    path_codes = [engine.goal_code]
+    while parents[path_codes[-1]] is not None:
+        path_codes.append(parents[path_codes[-1]])
+    path = [engine.decode(code) for code in reversed(path_codes)]
+    path[0] = initial_state
+    return path
+
+def crossing_lower_bound(engine, code: int) -> float:
+    """
+    Admissible lower bound on the moves left from `code`, from boat capacity alone:
+    every round trip can bring at most K-1 more people across. inf for dead ends.
+    """
+    on_left = (code >> 1).bit_count()
+    K = engine.boat_capacity
+    if not code & 1: # Boat on the right: someone has to row back first
+        if on_left == 0:
+            return 0
+        on_left += 1
+        extra = 1
+    else:
+        if on_left == 0:
+            return inf # Boat stranded on an empty bank
+        extra = 0
+    if on_left <= K:
+        return extra + 1
+    if K == 1:
+        return inf # A single rower makes no net progress
+    round_trips = -(-(on_left - K) // (K - 1))
+    return extra + 2 * round_trips + 1
+
+def iddfs_solve(initial_state: GameState, transposition_table_size: int = 1_000_000, rules=None) -> list[GameState] | None:
+    """
+    Iterative-deepening depth-first search over compact states. Finds an optimal
+    (shortest) solution like bfs_solve, but memory is linear in the depth plus a
+    transposition table capped at `transposition_table_size` entries (LRU eviction).
+
+    Each iteration is a depth-limited DFS; crossing_lower_bound prunes branches that
+    cannot finish within the limit, and the table remembers improved lower bounds
+    learned from exhausted subtrees. Forward crossings try big groups first and return
+    trips small groups first. Useful where BFS's visited set does not fit in memory.
+
+    Iterative deepening alone cannot prove that no solution exists (a shrinking
+    transposition table keeps forgetting what it learned), so unsolvable Actor-Agent instances
+    are first recognised by solvers.certificates (exact on pair types) and return None straight
+    away. Under other rules an unsolvable instance returns None once the depth limit passes
+    the number of states up to relabelling, which takes much longer.
+    """
+    rules = _solver_rules(initial_state, rules)
+    if not initial_state.is_valid_state():
+        return None
+    if initial_state.is_win():
+        return [initial_state]
 
+    N, K = initial_state.N, initial_state.boat_capacity
+    engine = get_engine(N, K, rules)
+    forward_order = engine.boat_groups[::-1] # Biggest groups first
+    return_order = engine.boat_groups # Smallest groups first
+    full_mask = engine.full_mask
+    is_safe = engine.is_safe
+    goal_code = engine.goal_code
+    table = OrderedDict() # code -> learned lower bound on the moves left
+
+    def lower_bound(code: int) -> float:
+        bound = crossing_lower_bound(engine, code)
+        learned = table.get(code)
+        if learned is not None:
+            table.move_to_end(code)
+            if learned > bound:
+                return learned
+        return bound
+
+    def learn(code: int, bound: float) -> None:
+        table[code] = bound
+        table.move_to_end(code)
+        if len(table) > transposition_table_size:
+            table.popitem(last=False)
+
+    # A shortest path never repeats a state up to relabellings the rules cannot tell apart, so its
+    # length is below the number of such states: C(N+3, 3) pair-type multisets times two boat sides
+    # when pairs can be swapped ((N+1)^2 count pairs, fewer, when any two of a kind can).
+    max_depth = 2 * comb(N + 3, 3)
+    start_code = engine.encode(initial_state)
+    if rules is ACTOR_AGENT and find_unsolvability_certificate(N, K, start_code=start_code, max_states=None) is not None:
+        return None
+    depth_limit = lower_bound(start_code)
+    while depth_limit <= max_depth:
+        # Frame: [code, depth, parent_code, move_order, next_index, smallest f above the limit]
+        stack = [[start_code, 0, None, forward_order if start_code & 1 else return_order, 0, inf]]
+        while stack:
+            frame = stack[-1]
+            code, depth, parent, order, index, minimum = frame
+            left = code >> 1
+            boat_on_left = code & 1
+            source = left if boat_on_left else full_mask ^ left
+            pushed = False
+            while index < len(order):
+                group = order[index]
+                index += 1
+                if group & source != group:
+                    continue
+                new_left = left ^ group
+                if not (is_safe(new_left) and is_safe(full_mask ^ new_left)):
+                    continue
+                child = (new_left << 1) | (boat_on_left ^ 1)
+                f = depth + 1 + lower_bound(child)
+                if child == parent: # Undoing the last move is never optimal, but keep its bound sound
+                    minimum = min(minimum, f)
+                    continue
+                if f > depth_limit:
+                    minimum = min(minimum, f)
+                    continue
+                if child == goal_code:
+                    path_codes = [entry[0] for entry in stack] + [child]
+                    path = [engine.decode(path_code) for path_code in path_codes]
+                    path[0] = initial_state
+                    return path
+                frame[4], frame[5] = index, minimum
+                stack.append([child, depth + 1, code, return_order if boat_on_left else forward_order, 0, inf])
+                pushed = True
+                break
+            if pushed:
+                continue
+            # Subtree exhausted: every way to the goal from here costs at least `minimum` in total.
+            stack.pop()
+            learn(code, minimum - depth)
+            if stack:
+                stack[-1][5] = min(stack[-1][5], minimum)
+            else:
+                depth_limit = minimum
     return None
 
+def multibank_bfs_solve(engine, use_symmetry: bool = True) -> list[tuple[int, int]] | None:
+    """
+    Shortest solution for a game.multibank.MultiBankEngine, as (boat_group, destination) moves,
+    or None if there is none. With `use_symmetry`, states are deduplicated by their canonical
+    code, so only one state per class of equivalent states is expanded; equivalent states
+    are the same distance from the goal, so the path found is still shortest.
+    """
+    start, goal = engine.initial_code, engine.goal_code
+    if engine.N == 0: # Nobody to move: won by doing nothing, as in the two-bank solvers
+        return []
+    key = engine.canonical_code if use_symmetry else (lambda code: code)
+    parents = {key(start): None} # Seen key -> (parent code, move) of the state that reached it first
+    frontier = [start]
+    found = start == goal
+    while frontier and not found:
+        next_frontier = []
+        for code in frontier:
+            for move, child in engine.successors(code):
+                child_key = key(child)
+                if child_key in parents:
+                    continue
+                parents[child_key] = (code, move)
+                if child == goal:
+                    found = True
+                    break
+                next_frontier.append(child)
+            if found:
+                break
+        frontier = next_frontier
+    if not found:
+        return None
+
+    moves = []
+    code = goal
+    while code != start:
+        code, move = parents[key(code)]
+        moves.append(move)
+    moves.reverse()
+    return moves
+
+# Edge costs for dijkstra_solve: cost(group, boat_on_left) of taking boat mask `group` across from
+# the bank the boat is on. They look only at the group's size and the direction, so states equal up
+# to relabelling pairs cost the same to finish and the symmetry reduction stays exact.
+# Every solution alternates forward and return trips, so "return_trips" is always (moves - 1) / 2;
+# "return_crossings" (people rowing back) is what separates a ferry pair from a single rower.
+COST_MODELS = {
+    "moves": lambda group, boat_on_left: 1,
+    "crossings": lambda group, boat_on_left: group.bit_count(), # Person-crossings
+    "return_trips": lambda group, boat_on_left: 0 if boat_on_left else 1,
+    "return_crossings": lambda group, boat_on_left: 0 if boat_on_left else group.bit_count(),
+}
+
+def dijkstra_solve(initial_state: GameState, cost="moves", use_symmetry: bool = True, rules=None) -> list[GameState] | None:
+    """
+    Uniform-cost search (Dijkstra) over compact states: a solution with the least total
+    edge cost, where `cost` is a name from COST_MODELS or a function cost(group_mask, boat_on_left)
+    returning a non-negative number. The frontier is a binary heap of (distance, code).
+    With `use_symmetry`, states are deduplicated by engine.canonical_code as in
+    multibank_bfs_solve; only use it with costs that do not depend on which pair is which.
+    Returns the path of states like bfs_solve (solution_cost gives its cost), or None.
+    """
+    rules = _solver_rules(initial_state, rules)
+    if not initial_state.is_valid_state():
+        return None
+    if initial_state.is_win():
+        return [initial_state]
+    cost = COST_MODELS[cost] if isinstance(cost, str) else cost
+    engine = get_engine(initial_state.N, initial_state.boat_capacity, rules)
+    key = engine.canonical_code if use_symmetry else (lambda code: code)
+    start, goal = engine.encode(initial_state), engine.goal_code
+    distances = {key(start): 0} # Key -> best known distance
+    best = {key(start): (start, None, None)} # Key -> (code reached, parent code, group) of that distance
+    heap = [(0, start)]
+    while heap:
+        distance, code = heapq.heappop(heap)
+        code_key = key(code)
+        if distance > distances[code_key] or best[code_key][0] != code:
+            continue # Stale entry
+        if code == goal:
+            break
+        boat_on_left = code & 1
+        for group, child in engine.successors(code):
+            child_distance = distance + cost(group, boat_on_left)
+            child_key = key(child)
+            if child_distance < distances.get(child_key, inf):
+                distances[child_key] = child_distance
+                best[child_key] = (child, code, group)
+                heapq.heappush(heap, (child_distance, child))
+    else:
+        return None
+
+    codes = [goal]
+    while codes[-1] != start:
+        codes.append(best[key(codes[-1])][1])
+    path = [engine.decode(code) for code in reversed(codes)]
+    path[0] = initial_state
+    return path
+
+def solution_cost(path: list[GameState], cost="moves") -> float:
+    """Total cost of a path of states under a COST_MODELS name or cost function."""
+    cost = COST_MODELS[cost] if isinstance(cost, str) else cost
+    if not path:
+        return inf
+    engine = get_engine(path[0].N, path[0].boat_capacity, path[0].rules)
+    total = 0
+    for state, next_state in zip(path, path[1:]):
+        code, next_code = engine.encode(state), engine.encode(next_state)
+        total += cost((code ^ next_code) >> 1, state.boat_on_left)
+    return total
+
+def weighted_cost_sweep(cells, cost_models=None) -> list[dict]:
+    """
+    Optimal cost of every (N, K) in `cells` under every cost model (name -> cost function,
+    default COST_MODELS), one dict per cell: {"n", "k", <model>: optimum or None if unsolvable}.
+    Unsolvable cells are recognised by solvers.certificates without searching.
+    """
+    cost_models = COST_MODELS if cost_models is None else cost_models
+    rows = []
+    for N, K in cells:
+        row = {"n": N, "k": K}
+        solvable = find_unsolvability_certificate(N, K) is None
+        for name, cost in cost_models.items():
+            path = dijkstra_solve(GameState(N=N, boat_capacity=K), cost) if solvable else None
+            row[name] = solution_cost(path, cost) if path else None
+        rows.append(row)
+    return rows
+
+def multi_source_solve(initial_states: list[GameState], reachability=None, rules=None) -> list[list[GameState] | None]:
+    """
+    Optimal solutions for many start states of the same (N, K) from one search: a BFS
+    backwards from the goal (moves are reversible, so it is an ordinary BFS from the goal)
+    that stops as soon as every start has been reached. Each state seen records its
+    neighbour one move closer to the goal, so a start's path is read off by following those.
+    Returns one path of states per start, as bfs_solve would (None for invalid or unsolvable
+    starts). Unsolvable starts make the search drain the goal's whole component; with a
+    `reachability` bitmap (solvers.reachability, Actor-Agent only) they are set aside up front instead.
+    """
+    if not initial_states:
+        return []
+    N, K = initial_states[0].N, initial_states[0].boat_capacity
+    rules = _solver_rules(initial_states[0], rules)
+    if any((state.N, state.boat_capacity, state.rules) != (N, K, rules) for state in initial_states):
+        raise ValueError("All start states must have the same N, boat capacity and rules.")
+    engine = get_engine(N, K, rules)
+    start_codes = []
+    for state in initial_states:
+        solvable = state.is_valid_state() and (reachability is None or reachability.state_can_reach_goal(state))
+        start_codes.append(engine.encode(state) if solvable else None)
+
+    goal = engine.goal_code
+    pending = set(start_codes) - {None, goal}
+    next_hop = {goal: None} # Code -> neighbour one move closer to the goal
+    frontier = [goal]
+    while frontier and pending:
+        next_frontier = []
+        for code in frontier:
+            for _, child in engine.successors(code):
+                if child not in next_hop:
+                    next_hop[child] = code
+                    next_frontier.append(child)
+                    pending.discard(child)
+        frontier = next_frontier
+
+    paths = []
+    for state, code in zip(initial_states, start_codes):
+        if code is None or code not in next_hop:
+            paths.append(None)
+            continue
+        path = [state]
+        code = next_hop[code]
+        while code is not None:
+            path.append(engine.decode(code))
+            code = next_hop[code]
+        paths.append(path)
+    return paths
+
 def format_actor_agent_path(path: list[GameState]) -> list[list[str]]:
     """
     Formats a solution path (list of GameState objects) for the Actor-Agent puzzle
@@ -92,6 +599,7 @@ def format_actor_agent_path(path: list[GameState]) -> list[list[str]]:
 
     return formatted_moves
 
+# Usage: python -m solvers.search, from the repository root (the relative imports need the package).
 if __name__ == '__main__':
     print("Actor-Agent Puzzle Solver Tests")
     print("="*40)
@@ -0,0 +1,219 @@
+import os
+import struct
+import zlib
+
+from game.compact import get_engine
+
+# Binary solution container ("*.rcs")
+#
+#   magic      5 bytes  b"RCSOL"
+#   version    1 byte
+#   N          varint
+#   K          varint
+#   solver     varint length + UTF-8 bytes
+#   length     varint   number of moves
+#   checksum   4 bytes  CRC-32 of the move payload, little-endian
+#   payload    per move: varint boat size, then one varint per occupant
+#
+# Occupants are stored as compact-engine bit indexes (a_i -> i-1, A_i -> N+i-1), in
+# ascending order, so a K=4 move for N < 64 costs 5 bytes instead of ~30 characters.
+
+MAGIC = b"RCSOL"
+VERSION = 1
+SOLUTION_FILE_SUFFIX = ".rcs"
+
+def _encode_varint(value: int, out: bytearray) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+class _ChunkedReader:
+    """
+    Reads varints from a binary file in fixed-size chunks instead of byte by byte.
+    Bytes from `mark` onwards survive refills, so buffer[mark:pos] is always the raw
+    input read since the mark was set.
+    """
+
+    def __init__(self, f, chunk_size: int = 1 << 16):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = b""
+        self.pos = 0
+        self.mark = None
+
+    def _refill(self) -> None:
+        keep_from = self.pos if self.mark is None else self.mark
+        data = self.f.read(self.chunk_size)
+        if not data and self.pos >= len(self.buffer):
+            raise ValueError("Unexpected end of solution file.")
+        self.buffer = self.buffer[keep_from:] + data
+        self.pos -= keep_from
+        if self.mark is not None:
+            self.mark = 0
+
+    def read_byte(self) -> int:
+        if self.pos >= len(self.buffer):
+            self._refill()
+        byte = self.buffer[self.pos]
+        self.pos += 1
+        return byte
+
+    def read_bytes(self, count: int) -> bytes:
+        while len(self.buffer) - self.pos < count:
+            before = len(self.buffer) - self.pos
+            self._refill()
+            if len(self.buffer) - self.pos == before:
+                raise ValueError("Unexpected end of solution file.")
+        data = self.buffer[self.pos:self.pos + count]
+        self.pos += count
+        return data
+
+    def read_varint(self) -> int:
+        result = 0
+        shift = 0
+        while True:
+            byte = self.read_byte()
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+def encode_move_masks(masks) -> bytes:
+    """Encodes boat-group bitmasks (compact engine layout) into the move payload."""
+    out = bytearray()
+    for mask in masks:
+        bits = []
+        bit = 0
+        while mask:
+            if mask & 1:
+                bits.append(bit)
+            mask >>= 1
+            bit += 1
+        _encode_varint(len(bits), out)
+        for bit in bits:
+            _encode_varint(bit, out)
+    return bytes(out)
+
+def encode_moves(N: int, moves: list[list[str]]) -> bytes:
+    """Converts paper-format moves, e.g. [['A_2', 'a_2'], ['A_2']], into the move payload."""
+    engine = get_engine(N, 0) # Conversions do not depend on K
+    return encode_move_masks((engine.group_to_mask(move) for move in moves))
+
+def decode_moves(N: int, payload: bytes) -> list[list[str]]:
+    """Inverse of encode_moves."""
+    engine = get_engine(N, 0)
+    moves = []
+    pos = 0
+    while pos < len(payload):
+        mask, pos = _decode_one_mask(payload, pos)
+        moves.append(engine.mask_to_group(mask))
+    return moves
+
+def _decode_one_mask(payload: bytes, pos: int) -> tuple[int, int]:
+    values = []
+    count = None
+    while count is None or len(values) < count:
+        value = 0
+        shift = 0
+        while True:
+            if pos >= len(payload):
+                raise ValueError("Truncated move payload.")
+            byte = payload[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        if count is None:
+            count = value
+        else:
+            values.append(value)
+    mask = 0
+    for bit in values:
+        mask |= 1 << bit
+    return mask, pos
+
+def write_solution(file_path: str, N: int, K: int, moves: list[list[str]], solver: str = "") -> None:
+    """Writes a paper-format move list to a binary solution file."""
+    payload = encode_moves(N, moves)
+    header = bytearray(MAGIC)
+    header.append(VERSION)
+    _encode_varint(N, header)
+    _encode_varint(K, header)
+    solver_bytes = solver.encode("utf-8")
+    _encode_varint(len(solver_bytes), header)
+    header += solver_bytes
+    _encode_varint(len(moves), header)
+    header += struct.pack("<I", zlib.crc32(payload))
+    with open(file_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+
+class SolutionReader:
+    """
+    Lazy reader for binary solution files. The header (N, K, solver, length, checksum)
+    is parsed on construction; moves are decoded one at a time while iterating, and the
+    checksum is verified once the last move has been read.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "rb") as f:
+            reader = _ChunkedReader(f, chunk_size=256)
+            if reader.read_bytes(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{file_path} is not a binary solution file.")
+            version = reader.read_byte()
+            if version != VERSION:
+                raise ValueError(f"Unsupported solution file version {version} in {file_path}.")
+            self.N = reader.read_varint()
+            self.K = reader.read_varint()
+            self.solver = reader.read_bytes(reader.read_varint()).decode("utf-8")
+            self.length = reader.read_varint()
+            self.checksum = struct.unpack("<I", reader.read_bytes(4))[0]
+            self._payload_offset = f.tell() - (len(reader.buffer) - reader.pos)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def iter_masks(self):
+        """Yields each move as a boat-group bitmask in the compact engine layout."""
+        with open(self.file_path, "rb") as f:
+            f.seek(self._payload_offset)
+            reader = _ChunkedReader(f)
+            crc = 0
+            for _ in range(self.length):
+                reader.mark = reader.pos # Keeps the move's raw bytes even if it spans a refill
+                size = reader.read_varint()
+                mask = 0
+                for _ in range(size):
+                    mask |= 1 << reader.read_varint()
+                crc = zlib.crc32(reader.buffer[reader.mark:reader.pos], crc)
+                yield mask
+            if crc != self.checksum:
+                raise ValueError(f"Checksum mismatch in {self.file_path}: file is corrupted.")
+
+    def __iter__(self):
+        """Yields each move in paper format, e.g. ['A_2', 'a_2']."""
+        engine = get_engine(self.N, self.K)
+        for mask in self.iter_masks():
+            yield engine.mask_to_group(mask)
+
+def read_solution(file_path: str) -> list[list[str]]:
+    """Reads a whole binary solution file back into paper format."""
+    return list(SolutionReader(file_path))
+
+def save_solution_blob(directory: str, N: int, K: int, moves: list[list[str]], solver: str = "",
+                       relative_to: str | None = None) -> str:
+    """
+    Writes `moves` to <directory>/n{N}_k{K}[_{solver}].rcs and returns that path
+    (relative to `relative_to` if given), which the generator scripts store in their
+    CSV's solution_blob column.
+    """
+    os.makedirs(directory, exist_ok=True)
+    name = f"n{N}_k{K}" + (f"_{solver}" if solver else "") + SOLUTION_FILE_SUFFIX
+    file_path = os.path.join(directory, name)
+    write_solution(file_path, N, K, moves, solver=solver)
+    if relative_to is not None:
+        return os.path.relpath(file_path, relative_to)
+    return file_path
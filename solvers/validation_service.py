@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from math import comb
+
+from game.move_parser import parse_moves
+from game.rules import ACTOR_AGENT, RULES
+from .batch_validation import check_moves_batch
+from .scoring import moves_to_masks, score_move_masks
+
+# Local validation server: JSON lines in, JSON lines out, over a Unix socket or localhost TCP.
+#
+# Requests (one JSON object per line; "id" is echoed back so clients can pipeline):
+#   {"id": 1, "op": "validate", "n": 3, "k": 2, "moves": [["A_1", "a_1"], ["A_1"], ...]}
+#   {"id": 2, "op": "score", "n": 3, "k": 2, "moves_text": "[[A_1, a_1], [A_1], ...]"}
+#   {"id": 3, "op": "metrics"}
+# "moves" is the paper format; "moves_text" is raw text in any format game.move_parser accepts
+# (Actor-Agent only). An optional "rules" field names the puzzle variant (see game.rules.RULES,
+# default "actor_agent"), e.g. "missionaries_cannibals" with moves like [["M_1", "C_1"], ...].
+# Responses: {"id", "valid", "failure_reason", "failed_move_index"} for validate,
+# SolutionScore.as_dict() plus "id" for score, and {"id", "error"} for bad requests.
+#
+# Requests from all connections go through one queue and are micro-batched: the first waiting
+# request opens a batch that closes after `max_delay` seconds or `max_batch` requests, and each
+# (N, K) group in it is validated in one check_moves_batch call. The batch is worked off on an
+# executor thread, so the event loop keeps reading and queueing requests meanwhile. Engines and
+# distance tables are cached per (N, K), so they stay warm for the lifetime of the server.
+
+# Larger requests are refused with an error: every (N, K) asked for keeps an engine in the cache,
+# check_moves_batch packs masks into uint64, and a score needs the goal distance table of its
+# (N, K), which is built with every boat load of up to K people.
+MAX_N = 31
+MAX_K = 2 * MAX_N
+MAX_SCORE_LOADS = sum(comb(20, k) for k in range(1, 5)) # As many boat loads as N=10, K=4 (about 0.7 s to build)
+
+class ValidationService:
+    """Micro-batching validator with latency metrics; see the module comment for the protocol."""
+
+    def __init__(self, max_batch: int = 512, max_delay: float = 0.002, latency_window: int = 100_000):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.latencies = deque(maxlen=latency_window) # Seconds from arrival to answer, most recent requests
+        self.requests = 0
+        self.batches = 0
+        self._queue = None
+        self._batcher_task = None
+
+    def start(self) -> None:
+        if self._batcher_task is None:
+            self._queue = asyncio.Queue()
+            self._batcher_task = asyncio.get_running_loop().create_task(self._batcher())
+
+    async def stop(self) -> None:
+        if self._batcher_task is not None:
+            self._batcher_task.cancel()
+            try:
+                await self._batcher_task
+            except asyncio.CancelledError:
+                pass
+            self._batcher_task = None
+
+    async def submit(self, request: dict) -> dict:
+        """Answers one request (through the batch queue unless it is a metrics request)."""
+        arrival = time.perf_counter()
+        if request.get("op") == "metrics":
+            return {"id": request.get("id"), **self.metrics()}
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((request, future, arrival))
+        return await future
+
+    def metrics(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction: float) -> float | None:
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+        return {"requests": self.requests, "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else None,
+                "p50_ms": percentile(0.50), "p99_ms": percentile(0.99)}
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            # One batch at a time, so the caches are only ever touched from one thread.
+            responses = await loop.run_in_executor(None, self._process, [request for request, _, _ in batch])
+            for (_, future, arrival), response in zip(batch, responses):
+                self._answer(future, arrival, response)
+
+    def _process(self, requests: list[dict]) -> list[dict]:
+        """The response to each request of a batch, in order (runs on the executor)."""
+        responses = [None] * len(requests)
+        groups = {} # (N, K, rules) -> [(position, request, masks)] for validate requests
+        for position, request in enumerate(requests):
+            try:
+                N, K, rules, masks = self._parse(request)
+                if request.get("op", "validate") == "validate":
+                    groups.setdefault((N, K, rules), []).append((position, request, masks))
+                    continue
+                if request["op"] != "score":
+                    raise ValueError(f"Unknown op {request['op']!r}.")
+                loads = sum(comb(2 * N, k) for k in range(1, K + 1))
+                if loads > MAX_SCORE_LOADS:
+                    raise ValueError(f"n={N}, k={K} is too large to score ({loads} boat loads, at most {MAX_SCORE_LOADS}).")
+                responses[position] = {"id": request.get("id"), **score_move_masks(N, K, masks, rules).as_dict()}
+            except (KeyError, TypeError, ValueError) as error: # MoveParseError is a ValueError
+                responses[position] = {"id": request.get("id"), "error": str(error) or type(error).__name__}
+
+        for (N, K, rules), items in groups.items():
+            results = check_moves_batch(N, K, [masks for _, _, masks in items], rules)
+            for (position, request, _), (reason, applied, _) in zip(items, results):
+                responses[position] = {"id": request.get("id"), "valid": reason is None,
+                                       "failure_reason": reason,
+                                       "failed_move_index": applied if reason is not None else None}
+        return responses
+
+    def _answer(self, future, arrival: float, response: dict) -> None:
+        self.requests += 1
+        self.latencies.append(time.perf_counter() - arrival)
+        if not future.done():
+            future.set_result(response)
+
+    @staticmethod
+    def _parse(request: dict) -> tuple[int, int, object, list[int]]:
+        N, K = int(request["n"]), int(request["k"])
+        if N < 0 or K < 0:
+            raise ValueError("n and k must be non-negative.")
+        if N > MAX_N or K > MAX_K:
+            raise ValueError(f"n={N}, k={K} is too large (at most n={MAX_N}, k={MAX_K}).")
+        rules = RULES.get(request.get("rules", ACTOR_AGENT.name))
+        if rules is None:
+            raise ValueError(f"Unknown rules {request['rules']!r}; expected one of {sorted(RULES)}.")
+        if "moves_text" in request:
+            if rules is not ACTOR_AGENT:
+                raise ValueError("moves_text is only supported for the actor_agent rules.")
+            return N, K, rules, parse_moves(request["moves_text"], N)
+        return N, K, rules, moves_to_masks(N, K, request["moves"], rules)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Reads JSON lines and answers each one as soon as its batch is done (possibly out of order)."""
+        pending = set()
+        write_lock = asyncio.Lock()
+
+        async def answer(line: bytes) -> None:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Each request must be a JSON object.")
+                response = await self.submit(request)
+            except ValueError as error:
+                response = {"id": None, "error": str(error)}
+            async with write_lock:
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        finally:
+            writer.close()
+
+async def serve(service: ValidationService, unix_path: str | None = None,
+                host: str = "127.0.0.1", port: int = 8765) -> asyncio.AbstractServer:
+    """Starts listening (Unix socket if `unix_path` is given, else localhost TCP) and returns the server."""
+    service.start()
+    if unix_path is not None:
+        return await asyncio.start_unix_server(service.handle_connection, path=unix_path)
+    return await asyncio.start_server(service.handle_connection, host=host, port=port)
+
+async def _main(args) -> None:
+    service = ValidationService(max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+    server = await serve(service, unix_path=args.unix, host=args.host, port=args.port)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Validation service listening on {where}")
+    async with server:
+        await server.serve_forever()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(prog="python -m solvers.validation_service", description="Local JSON-lines validation/scoring server with request batching.")
+    parser.add_argument("--unix", help="Unix socket path (default: localhost TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--max-delay-ms", type=float, default=2.0)
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.actions import ActionSpace, get_action_space, legal_action_mask
+
+class TestActionSpace(unittest.TestCase):
+
+    def test_indexing_is_stable(self):
+        space = ActionSpace(2, 2)
+        # Singles in bit order (a_1, a_2, A_1, A_2), then the safe pairs
+        self.assertEqual([space.move(i) for i in range(len(space))],
+                         [['a_1'], ['a_2'], ['A_1'], ['A_2'],
+                          ['a_1', 'a_2'], ['A_1', 'a_1'], ['A_2', 'a_2'], ['A_1', 'A_2']])
+        self.assertEqual(space.index(['a_2', 'A_2']), 6)
+        with self.assertRaises(ValueError):
+            space.index(['a_1', 'A_2'])
+        self.assertIs(get_action_space(2, 2), get_action_space(2, 2))
+
+    def test_mask_matches_successors(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (3, 3), (4, 3), (4, 4)]:
+            space = ActionSpace(N, K)
+            engine = space.engine
+            for code in range(1 << (2 * N + 1)):
+                if not engine.is_valid_code(code):
+                    continue
+                expected = 0
+                for group, _ in engine.successors(code):
+                    expected |= 1 << space.group_index(group)
+                self.assertEqual(space.legal_action_mask(code), expected, f"N={N}, K={K}, code={code}")
+
+    def test_game_state_queries(self):
+        state = GameState(N=2, boat_capacity=2)
+        space = get_action_space(2, 2)
+        self.assertEqual(legal_action_mask(state), space.legal_action_mask(space.engine.encode(state)))
+        moves = sorted(sorted(state.left_bank - successor.left_bank) for successor in state.get_valid_next_states())
+        self.assertEqual(sorted(space.move(i) for i in space.legal_actions(state)), moves)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine
+from solvers.certificates import (CLOSED_PAIR_TYPE_SET, NO_SAFE_FIRST_MOVE, NO_SOLUTION, SINGLE_SEAT_BOAT,
+                                  find_unsolvability_certificate, pair_type_state, pair_type_successors)
+from solvers.reachability import build_goal_reachability
+
+class TestUnsolvabilityCertificates(unittest.TestCase):
+
+    def test_pair_type_successors_match_compact_engine(self):
+        for N, K in [(2, 2), (3, 2), (3, 3), (4, 3)]:
+            engine = get_engine(N, K)
+            for code in range(1 << (2 * N + 1)):
+                if not engine.is_valid_code(code):
+                    continue
+                expected = {pair_type_state(N, child) for _, child in engine.successors(code)}
+                self.assertEqual(set(pair_type_successors(N, K, pair_type_state(N, code))), expected)
+
+    def test_certificates_agree_with_full_reachability(self):
+        for N in range(1, 5):
+            for K in range(0, 5):
+                engine = get_engine(N, K)
+                reachability = build_goal_reachability(N, K)
+                for code in range(1 << (2 * N + 1)):
+                    if not engine.is_valid_code(code):
+                        continue
+                    certificate = find_unsolvability_certificate(N, K, start_code=code, max_states=None)
+                    self.assertEqual(certificate is None, reachability.can_reach_goal(code), f"N={N}, K={K}, code={code}")
+                    if certificate is not None:
+                        self.assertTrue(certificate.verify())
+
+    def test_known_cells(self):
+        self.assertEqual(find_unsolvability_certificate(1, 0).kind, NO_SAFE_FIRST_MOVE)
+        self.assertEqual(find_unsolvability_certificate(5, 1).kind, SINGLE_SEAT_BOAT)
+        certificate = find_unsolvability_certificate(4, 2)
+        self.assertEqual((certificate.kind, certificate.verdict), (CLOSED_PAIR_TYPE_SET, NO_SOLUTION))
+        self.assertTrue(certificate.verify())
+        self.assertEqual(find_unsolvability_certificate(60, 3).kind, CLOSED_PAIR_TYPE_SET)
+        self.assertIsNone(find_unsolvability_certificate(3, 2))
+        self.assertIsNone(find_unsolvability_certificate(60, 4))
+
+    def test_tampered_certificate_fails_verification(self):
+        certificate = find_unsolvability_certificate(4, 2)
+        certificate.closed_set = frozenset(sorted(certificate.closed_set)[1:])
+        self.assertFalse(certificate.verify())
+
+    def test_budget_makes_large_cells_inconclusive(self):
+        self.assertIsNone(find_unsolvability_certificate(60, 3, max_states=100))
+        self.assertEqual(find_unsolvability_certificate(60, 1, max_states=100).kind, SINGLE_SEAT_BOAT)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory's 'game' module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.compact import CompactEngine, get_engine
+
+class TestCompactEngine(unittest.TestCase):
+
+    def test_encode_decode_round_trip(self):
+        engine = CompactEngine(N=2, boat_capacity=2)
+        state = GameState(N=2, boat_capacity=2,
+                          left_bank_individuals={"a_1", "A_1"},
+                          right_bank_individuals={"a_2", "A_2"},
+                          boat_on_left=False)
+        code = engine.encode(state)
+        self.assertEqual(engine.decode(code), state)
+        self.assertEqual(engine.encode(GameState(N=2, boat_capacity=2)), engine.initial_code)
+        self.assertEqual(engine.encode(GameState(N=2, boat_capacity=2, boat_on_left=False)), engine.goal_code)
+
+    def test_is_safe_matches_is_group_safe(self):
+        engine = CompactEngine(N=3, boat_capacity=3)
+        state = GameState(N=3, boat_capacity=3)
+        for mask in range(1 << 6):
+            group = set(engine.mask_to_group(mask))
+            self.assertEqual(engine.is_safe(mask),
+                             GameState.is_group_safe(group, state.actors, state.agents),
+                             f"Mismatch for group {sorted(group)}")
+
+    def test_successors_match_get_valid_next_states(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (3, 3)]:
+            engine = CompactEngine(N, K)
+            state = GameState(N=N, boat_capacity=K)
+            expected = set(state.get_valid_next_states())
+            got = {engine.decode(child) for _, child in engine.successors(engine.encode(state))}
+            self.assertEqual(got, expected, f"Successor mismatch for N={N}, K={K}")
+
+    def test_apply_rejects_illegal_moves(self):
+        engine = CompactEngine(N=2, boat_capacity=2)
+        start = engine.initial_code
+        self.assertIsNone(engine.apply(start, engine.group_to_mask(["a_1", "A_2"]))) # Unsafe boat
+        self.assertIsNone(engine.apply(start, engine.group_to_mask(["A_1"]))) # Leaves a_1 with A_2
+        after = engine.apply(start, engine.group_to_mask(["A_2", "a_2"]))
+        self.assertIsNotNone(after)
+        self.assertIsNone(engine.apply(after, engine.group_to_mask(["a_1"]))) # a_1 is not on the boat's bank
+
+    def test_canonical_code_is_invariant_under_pair_relabelling(self):
+        engine = CompactEngine(3, 2)
+        # a_1 alone on the left vs a_3 alone on the left: same class, and it is its own canonical form
+        self.assertEqual(engine.canonical_code(0b000001 << 1), engine.canonical_code(0b000100 << 1))
+        self.assertEqual(engine.canonical_code(0b000001 << 1), 0b000001 << 1)
+        # A_2 alone vs a_2 alone on the left differ
+        self.assertNotEqual(engine.canonical_code(0b010000 << 1), engine.canonical_code(0b000010 << 1))
+        classes = {engine.canonical_code(code) for code in range(1 << 7)}
+        self.assertEqual(len(classes), 2 * 20) # C(3+3, 3) pair-type multisets, two boat sides
+
+    def test_individual_bit_needs_exact_names(self):
+        engine = CompactEngine(2, 2)
+        self.assertEqual([engine.individual_bit(name) for name in ("a_1", "a_2", "A_1", "A_2")], [0, 1, 2, 3])
+        for name in ("a_02", "a_ 1", "a_+1", "a_1_0", "a_0", "a_3", "A_", "a1", "b_1", "a_\u0661"):
+            with self.assertRaises(ValueError, msg=name):
+                engine.individual_bit(name)
+        with self.assertRaises(ValueError):
+            engine.group_to_mask(["A_2", "a_02"])
+
+    def test_get_engine_is_cached(self):
+        self.assertIs(get_engine(3, 2), get_engine(3, 2))
+
+if __name__ == '__main__':
+    unittest.main()
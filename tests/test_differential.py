@@ -0,0 +1,51 @@
+import random
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import NOT_ON_SOURCE_BANK
+from solvers.differential import VALIDATORS, adversarial_moves, random_moves, reference_check, run_fuzz
+from solvers.heuristic import solve_k4_heuristic_2N_minus_3
+
+class TestDifferentialFuzz(unittest.TestCase):
+
+    def test_seeded_run_finds_no_disagreements(self):
+        found, counts = run_fuzz(seed=1, cases=3000)
+        self.assertEqual(found, [])
+        self.assertEqual(counts["validator"], 3000)
+
+    def test_same_seed_same_cases(self):
+        first = [random_moves(random.Random(5), 3, 2, 10), adversarial_moves(random.Random(5), 3, 2, 10)]
+        second = [random_moves(random.Random(5), 3, 2, 10), adversarial_moves(random.Random(5), 3, 2, 10)]
+        self.assertEqual(first, second)
+
+    def test_reference_check(self):
+        moves = solve_k4_heuristic_2N_minus_3(5)
+        self.assertEqual(reference_check(5, 4, moves), (None, len(moves)))
+        self.assertEqual(reference_check(5, 4, moves[:1] + [['a_6']]), (NOT_ON_SOURCE_BANK, 1))
+        self.assertEqual(reference_check(0, 2, []), (None, 0))
+
+    def test_malformed_names_are_generated(self):
+        rng = random.Random(0)
+        seen = {name for _ in range(2000) for move in random_moves(rng, 2, 2, 10) for name in move}
+        self.assertLessEqual({"a_01", "a_+1", "a_ 1", "a_1_0", "A_", "a1"}, seen)
+
+    def test_buggy_validator_is_minimized(self):
+        # Forgets that a boat load may not exceed the capacity
+        def buggy(N, K, moves, masks):
+            return [reference_check(N, K + 1, m) for m in moves]
+        validators = {"reference": VALIDATORS["reference"], "buggy": (buggy, True)}
+        found, _ = run_fuzz(seed=0, cases=2000, n_values=[3, 4], k_values=[2, 3],
+                            validators=validators, state_engines={}, solvers={}, max_disagreements=3)
+        self.assertTrue(found)
+        for disagreement in found:
+            self.assertEqual(disagreement.kind, "validator")
+            # One overfull move is all it takes
+            self.assertEqual(len(disagreement.case), 1)
+            self.assertEqual(len(disagreement.case[0]), disagreement.K + 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -228,5 +228,35 @@ class TestActorAgentGameState(unittest.TestCase):
         state_set = {s1, s2, s3, s4, s5, s6}
         self.assertEqual(len(state_set), 5) # s1 and s2 are the same
 
+    def test_apply_and_undo_move_in_place(self):
+        state = GameState(N=2, boat_capacity=2)
+        left_bank_before, right_bank_before = state.left_bank, state.right_bank
+        original = GameState(N=2, boat_capacity=2)
+
+        moved = state.apply_move(["A_2", "a_2"])
+        self.assertEqual(state.left_bank, {"a_1", "A_1"})
+        self.assertEqual(state.right_bank, {"a_2", "A_2"})
+        self.assertFalse(state.boat_on_left)
+        self.assertIs(state.left_bank, left_bank_before) # Banks are mutated, not replaced
+        self.assertIs(state.right_bank, right_bank_before)
+        self.assertTrue(state.banks_are_safe())
+
+        state.undo_move(moved)
+        self.assertEqual(state, original)
+        self.assertEqual(state.state_key(), original.state_key())
+
+        # apply_move does not check safety; banks_are_safe() reports the violation
+        state.apply_move(["A_1"])
+        self.assertFalse(state.banks_are_safe())
+        state.undo_move(["A_1"])
+        self.assertEqual(state, original)
+
+    def test_iter_safe_boat_groups(self):
+        state = GameState(N=2, boat_capacity=2)
+        groups = {frozenset(group) for group in state.iter_safe_boat_groups()}
+        self.assertIn(frozenset({"a_1", "A_1"}), groups)
+        self.assertNotIn(frozenset({"a_1", "A_2"}), groups) # Unsafe boat
+        self.assertEqual(len(groups), 4 + 4) # 4 single riders, 4 safe pairs
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine
+from game.rules import MISSIONARIES_CANNIBALS
+from solvers.graph_export import MAX_GRAPH_N, build_state_graph, export_state_graph, load_state_graph
+from solvers.scoring import goal_distance_table, optimal_length
+
+class TestStateGraphExport(unittest.TestCase):
+
+    def test_graph_matches_engine(self):
+        N, K = 4, 3
+        engine = get_engine(N, K)
+        graph = build_state_graph(N, K)
+        self.assertEqual(int(graph.codes[graph.initial_id]), engine.initial_code)
+        self.assertEqual(int(graph.codes[graph.goal_id]), engine.goal_code)
+        self.assertEqual(len(graph), len(goal_distance_table(N, K))) # Solvable: the start's component is the goal's
+        for v in range(len(graph)):
+            targets, groups = graph.neighbours(v)
+            expected = sorted(engine.successors(int(graph.codes[v])))
+            self.assertEqual(sorted((int(g), int(graph.codes[t])) for t, g in zip(targets, groups)), expected)
+
+    def test_save_and_memory_mapped_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            graph = export_state_graph(5, 3, directory)
+            loaded = load_state_graph(directory)
+            self.assertIsInstance(loaded.targets, np.memmap)
+            for name in ("codes", "offsets", "targets", "groups"):
+                np.testing.assert_array_equal(getattr(loaded, name), getattr(graph, name))
+            self.assertEqual((loaded.N, loaded.K, loaded.initial_id, loaded.goal_id),
+                             (5, 3, graph.initial_id, graph.goal_id))
+            path = loaded.shortest_path()
+            self.assertEqual(len(path), optimal_length(5, 3))
+            self.assertEqual(get_engine(5, 3).check_moves(path), (None, len(path), get_engine(5, 3).goal_code))
+
+            os.remove(os.path.join(directory, "meta.json"))
+            with self.assertRaises(ValueError):
+                load_state_graph(directory)
+
+    def test_bfs_distances(self):
+        graph = build_state_graph(4, 4)
+        distances, parents = graph.bfs(graph.goal_id)
+        table = goal_distance_table(4, 4)
+        self.assertEqual({int(graph.codes[v]): int(d) for v, d in enumerate(distances)}, table)
+        self.assertEqual(parents[graph.goal_id], -1)
+
+    def test_unsolvable_and_other_rules(self):
+        graph = build_state_graph(6, 3)
+        self.assertEqual(graph.goal_id, -1)
+        self.assertIsNone(graph.shortest_path())
+        self.assertEqual(graph.id_of(get_engine(6, 3).goal_code), -1)
+        graph = build_state_graph(3, 2, MISSIONARIES_CANNIBALS)
+        self.assertEqual(len(graph.shortest_path()), optimal_length(3, 2, MISSIONARIES_CANNIBALS))
+        with tempfile.TemporaryDirectory() as directory:
+            export_state_graph(3, 2, directory, MISSIONARIES_CANNIBALS)
+            self.assertIs(load_state_graph(directory, mmap=False).rules, MISSIONARIES_CANNIBALS)
+
+    def test_large_n_is_refused(self):
+        with self.assertRaises(ValueError): # Codes would not fit in uint64 from N=32
+            build_state_graph(32, 2)
+        with self.assertRaises(ValueError):
+            build_state_graph(MAX_GRAPH_N + 1, 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import NOT_ON_SOURCE_BANK, UNSAFE_BANK, UNSAFE_BOAT
+from solvers.heuristic import OFF_SCHEDULE, K4HeuristicSolution, solve_k4_heuristic_2N_minus_3, validate_solution
+
+class TestK4HeuristicSolution(unittest.TestCase):
+
+    def test_matches_materialized_solution(self):
+        for N in range(0, 25):
+            lazy = K4HeuristicSolution(N)
+            moves = solve_k4_heuristic_2N_minus_3(N)
+            self.assertEqual(len(lazy), len(moves))
+            self.assertEqual(list(lazy), moves)
+            self.assertEqual([lazy[i] for i in range(-len(moves), 0)], moves)
+            self.assertEqual(list(lazy[3:17:2]), moves[3:17:2])
+            self.assertEqual(list(lazy[::-1][1:5]), moves[::-1][1:5])
+        self.assertTrue(validate_solution(7, 4, list(K4HeuristicSolution(7))))
+        with self.assertRaises(IndexError):
+            K4HeuristicSolution(5)[7]
+
+    def test_huge_n(self):
+        N = 10**9
+        lazy = K4HeuristicSolution(N)
+        self.assertEqual(len(lazy), 2 * N - 3)
+        self.assertEqual(lazy[2 * (N - 3)], ['A_1', f'A_{N}', 'a_1', f'a_{N}'])
+        self.assertEqual(lazy[-1], ['A_1', 'A_2', 'a_1', 'a_2'])
+        window = lazy[10**9:10**9 + 3]
+        self.assertEqual(len(window), 3)
+        self.assertEqual(window[0], ['A_1', f'A_{10**9 // 2 + 3}', 'a_1', f'a_{10**9 // 2 + 3}'])
+        self.assertTrue(lazy.window_is_valid(10**9, 10**9 + 1000))
+        self.assertTrue(lazy.window_is_valid(2 * N - 100, 2 * N - 3))
+
+    def test_check_window_proves_whole_solution(self):
+        for N in range(2, 20):
+            self.assertEqual(K4HeuristicSolution(N).check_window(0, 2 * N - 3), (None, 2 * N - 3))
+        self.assertEqual(K4HeuristicSolution(2).state_before(0), (True, frozenset({1, 2}), range(3, 3)))
+        self.assertEqual(K4HeuristicSolution(2).state_before(1), (False, frozenset(), range(3, 3)))
+
+    def test_check_window_catches_bad_moves(self):
+        lazy = K4HeuristicSolution(10**6)
+        start = 2 * 5000 # P_5003 and the ferry cross next
+        self.assertEqual(lazy.check_window(start, start + 1, [['a_1', 'A_1', 'a_7']]), (NOT_ON_SOURCE_BANK, start))
+        self.assertEqual(lazy.check_window(start, start + 1, [['a_5003', 'A_1']]), (UNSAFE_BOAT, start))
+        self.assertEqual(lazy.check_window(start, start + 1, [['a_1', 'A_1', 'A_5003']]), (UNSAFE_BANK, start))
+        self.assertEqual(lazy.check_window(start, start + 1, [['a_9000', 'A_9000']]), (OFF_SCHEDULE, start))
+        self.assertEqual(lazy.check_window(start + 1, start + 2, [['a_1', 'A_1', 'a_01']]), (NOT_ON_SOURCE_BANK, start + 1))
+
+if __name__ == '__main__':
+    unittest.main()
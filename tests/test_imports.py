@@ -0,0 +1,52 @@
+import subprocess
+import unittest
+import sys
+import os
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Modules that only the features needing them may import (multiprocessing alone costs more
+# than the whole package), so short-lived validation processes start quickly.
+HEAVY_MODULES = ("multiprocessing", "numpy", "asyncio", "argparse", "csv")
+
+# Budget for `import solvers` on top of the interpreter (cumulative time from -X importtime, in
+# microseconds). About 10 ms when nothing is byte-compiled yet; well under that from __pycache__.
+IMPORT_BUDGET_US = 30_000
+
+class TestImports(unittest.TestCase):
+
+    def loaded_heavy_modules(self, statement, modules=HEAVY_MODULES):
+        code = f"{statement}\nimport sys\nprint(','.join(m for m in {modules!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+
+    def test_core_imports_stay_light(self):
+        for statement in ("import solvers", "import game.compact",
+                          "import solvers.search", "import solvers.scoring", "import solvers.certificates",
+                          "from solvers.heuristic import validate_solution"):
+            self.assertEqual(self.loaded_heavy_modules(statement), "", statement)
+
+    def test_import_time_budget(self):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import solvers"],
+                                cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        line = next(line for line in result.stderr.splitlines() if line.split("|")[-1].strip() == "solvers")
+        self.assertLess(int(line.split("|")[1]), IMPORT_BUDGET_US, line)
+
+    def test_heuristic_imports_game_modules_on_first_use(self):
+        self.assertEqual(self.loaded_heavy_modules("import solvers", ("game.compact", "game.environment")), "")
+        self.assertEqual(self.loaded_heavy_modules("from solvers.heuristic import K4HeuristicSolution\n"
+                                                   "K4HeuristicSolution(6).check_window(0, 9)", ("game.compact",)),
+                         "game.compact")
+        self.assertEqual(self.loaded_heavy_modules("from solvers.heuristic import validate_solution\n"
+                                                   "validate_solution(1, 2, [['A_1', 'a_1']])", ("game.environment",)),
+                         "game.environment")
+
+    def test_imports_do_not_touch_sys_path(self):
+        code = ("import sys\nbefore = list(sys.path)\n"
+                "import solvers, solvers.search, solvers.scoring, solvers.solution_io, solvers.optimal, solvers.reachability\n"
+                "print(sys.path == before)")
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "True")
+
+if __name__ == '__main__':
+    unittest.main()
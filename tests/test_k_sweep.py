@@ -0,0 +1,42 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine
+from game.rules import MISSIONARIES_CANNIBALS
+from solvers.k_sweep import KSweepGraph, k_sweep
+from solvers.scoring import goal_distance_table, optimal_length
+
+class TestKSweep(unittest.TestCase):
+
+    def test_matches_separate_searches(self):
+        for N in range(0, 7):
+            self.assertEqual(k_sweep(N, 5), {K: optimal_length(N, K) for K in range(1, 6)}, N)
+        self.assertEqual(k_sweep(3, 3, MISSIONARIES_CANNIBALS),
+                         {K: optimal_length(3, K, MISSIONARIES_CANNIBALS) for K in range(1, 4)})
+
+    def test_distances_for_every_state(self):
+        graph = KSweepGraph(4, 4)
+        for K in (2, 3, 4):
+            expected = goal_distance_table(4, K)
+            distances = graph.goal_distances(K)
+            reached = {graph.codes[v]: d for v, d in enumerate(distances) if d >= 0}
+            self.assertEqual(reached, expected)
+
+    def test_edges_sorted_by_boat_size(self):
+        graph = KSweepGraph(3, 3)
+        engine = get_engine(3, 3)
+        self.assertEqual(graph.codes[0], engine.goal_code)
+        for v in range(len(graph)):
+            sizes = [((graph.codes[v] ^ graph.codes[w]) >> 1).bit_count() for w in graph.targets[graph.offsets[v]:graph.offsets[v + 1]]]
+            self.assertEqual(sizes, sorted(sizes))
+            for K in (1, 2, 3):
+                self.assertEqual(graph.size_ends[K][v] - graph.offsets[v], sum(size <= K for size in sizes))
+        with self.assertRaises(ValueError):
+            graph.optimal_length(4)
+
+if __name__ == '__main__':
+    unittest.main()
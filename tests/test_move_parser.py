@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import io
+
+# Adjust path to import from parent directory's 'game' module
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine, NOT_ON_SOURCE_BANK, UNSAFE_BANK
+from game.move_parser import MoveParseError, iter_parse_moves, parse_moves
+from solvers.heuristic import solve_k4_heuristic_2N_minus_3
+
+PAPER_N2_MOVES = [['A_2', 'a_2'], ['A_2'], ['A_1', 'A_2'], ['A_1'], ['A_1', 'a_1']]
+
+class TestMoveParser(unittest.TestCase):
+
+    def test_paper_format(self):
+        engine = get_engine(2, 2)
+        masks = parse_moves('moves = [["A_2","a_2"],["A_2"],["A_1","A_2"],["A_1"],["A_1","a_1"]]', N=2)
+        self.assertEqual([engine.mask_to_group(mask) for mask in masks], PAPER_N2_MOVES)
+        self.assertEqual(engine.check_moves(masks), (None, 5, engine.goal_code))
+
+    def test_variants(self):
+        expected = parse_moves(str(PAPER_N2_MOVES), N=2)
+        variants = [
+            "[[A2, a2], [A2], [A1, A2], [A1], [A1, a1]]",
+            "[['A_2', \"a_2\"],\n  ['A_2'],\n  [A_1,A_2],[A_1],\t[A_1,a_1],]",
+            "solution=[[ 'A2' , 'a2' ],[ 'A2' ],[ 'A1' , 'A2' ],[ 'A1' ],[ 'A1' , 'a1' ]]\n",
+        ]
+        for text in variants:
+            self.assertEqual(parse_moves(text, N=2), expected, f"Variant not parsed: {text!r}")
+
+    def test_semantic_errors_are_left_to_the_validator(self):
+        engine = get_engine(2, 2)
+        masks = parse_moves("[[a_1], []]", N=2)
+        self.assertEqual(masks[1], 0)
+        self.assertEqual(engine.check_moves([engine.group_to_mask(["A_1"]), engine.group_to_mask(["a_2"])])[:2],
+                         (UNSAFE_BANK, 0))
+        self.assertEqual(engine.check_moves(parse_moves("[[A_2, a_2], [a_1]]", N=2))[:2], (NOT_ON_SOURCE_BANK, 1))
+
+    def test_error_positions(self):
+        cases = [
+            ('[["A_2\', a_2]]', 1, 3), # Mismatched quotes
+            ("[[A_1, A_3]]", 1, 8), # Pair index out of range for N=2
+            ("[[A_1]]\nextra", 2, 1), # Trailing content
+            ("[[A_1],\n [A_1]\n [A_2]]", 3, 2), # Missing comma
+            ("[[A_1], [A_2]", 1, 14), # Unterminated list
+        ]
+        for text, line, column in cases:
+            with self.assertRaises(MoveParseError, msg=text) as context:
+                parse_moves(text, N=2)
+            self.assertEqual((context.exception.line, context.exception.column), (line, column), text)
+
+    def test_streaming_large_input(self):
+        N = 300
+        moves = solve_k4_heuristic_2N_minus_3(N)
+        text = "moves = " + str(moves).replace("], ", "],\n" + " " * 300) # Whitespace runs longer than the lookahead
+        engine = get_engine(N, 4)
+        masks = list(iter_parse_moves(io.StringIO(text), N, chunk_size=97))
+        self.assertEqual([engine.mask_to_group(mask) for mask in masks], moves)
+        self.assertIsNone(engine.check_moves(masks)[0])
+
+        with self.assertRaises(MoveParseError) as context:
+            list(iter_parse_moves(io.StringIO(text.replace("a_150", "x_150", 1)), N, chunk_size=97))
+        self.assertEqual(context.exception.position, text.index("a_150") - 1) # The opening quote
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.multibank import MultiBankEngine
+from game.rules import ACTOR_AGENT, MISSIONARIES_CANNIBALS
+from solvers.scoring import optimal_length
+from solvers.search import multibank_bfs_solve
+
+class TestMultiBankEngine(unittest.TestCase):
+
+    def replay(self, engine, moves):
+        code = engine.initial_code
+        for group, destination in moves:
+            code = engine.apply(code, group, destination)
+            self.assertIsNotNone(code)
+        return code
+
+    def test_pack_roundtrip(self):
+        engine = MultiBankEngine(3, 2, locations=4)
+        masks = [0b000011, 0b100100, 0b010000, 0b001000]
+        self.assertEqual(engine.unpack(engine.pack(masks, 2)), (masks, 2))
+        self.assertEqual(engine.unpack(engine.initial_code), ([0b111111, 0, 0, 0], 0))
+        self.assertEqual(engine.unpack(engine.goal_code), ([0, 0, 0, 0b111111], 3))
+
+    def test_two_locations_match_the_two_bank_puzzle(self):
+        for N, K in [(1, 2), (2, 2), (3, 2), (4, 2), (4, 3), (5, 3)]:
+            for rules in (ACTOR_AGENT, MISSIONARIES_CANNIBALS):
+                moves = multibank_bfs_solve(MultiBankEngine(N, K, locations=2, rules=rules))
+                self.assertEqual(len(moves) if moves is not None else None, optimal_length(N, K, rules))
+
+    def test_island_makes_two_seat_boat_solvable(self):
+        self.assertIsNone(optimal_length(4, 2)) # Unsolvable with two banks
+        for edges in (None, [(0, 1), (1, 2), (0, 2)]):
+            engine = MultiBankEngine(4, 2, locations=3, edges=edges)
+            moves = multibank_bfs_solve(engine)
+            self.assertIsNotNone(moves)
+            self.assertEqual(self.replay(engine, moves), engine.goal_code)
+        self.assertEqual(len(multibank_bfs_solve(MultiBankEngine(4, 2, 3, [(0, 1), (1, 2), (0, 2)]))), 16)
+
+    def test_symmetry_reduction_keeps_lengths(self):
+        for rules in (ACTOR_AGENT, MISSIONARIES_CANNIBALS):
+            engine = MultiBankEngine(3, 2, locations=3, edges=[(0, 1), (1, 2), (0, 2)], rules=rules)
+            reduced = multibank_bfs_solve(engine)
+            full = multibank_bfs_solve(engine, use_symmetry=False)
+            self.assertEqual(len(reduced), len(full))
+            self.assertEqual(self.replay(engine, reduced), engine.goal_code)
+
+    def test_canonical_code_is_invariant(self):
+        engine = MultiBankEngine(2, 2, locations=3)
+        # a_1 and A_1 on the island, pair 2 at the start, versus the other way round
+        first = engine.pack([0b1010, 0b0101, 0], 1)
+        second = engine.pack([0b0101, 0b1010, 0], 1)
+        self.assertEqual(engine.canonical_code(first), engine.canonical_code(second))
+        self.assertNotEqual(engine.canonical_code(first), engine.canonical_code(engine.pack([0b0110, 0b1001, 0], 1)))
+
+    def test_moves_need_an_edge(self):
+        engine = MultiBankEngine(1, 2, locations=3) # Chain 0 - 1 - 2
+        self.assertIsNone(engine.apply(engine.initial_code, 0b11, 2))
+        self.assertIsNotNone(engine.apply(engine.initial_code, 0b11, 1))
+        with self.assertRaises(ValueError):
+            MultiBankEngine(1, 2, locations=3, edges=[(0, 3)])
+
+if __name__ == '__main__':
+    unittest.main()
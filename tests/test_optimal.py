@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.compact import get_engine
+from solvers.optimal import build_shortest_path_dag
+from solvers.search import bfs_solve, format_actor_agent_path
+
+def brute_force_optimal_solutions(N: int, K: int, length: int) -> set[tuple[int, ...]]:
+    """All legal move sequences of exactly `length` moves that end in the win state."""
+    engine = get_engine(N, K)
+    found = set()
+    def extend(code, masks):
+        if len(masks) == length:
+            if code == engine.goal_code:
+                found.add(tuple(masks))
+            return
+        for group, child in engine.successors(code):
+            extend(child, masks + [group])
+    extend(engine.initial_code, [])
+    return found
+
+class TestShortestPathDAG(unittest.TestCase):
+
+    def test_length_matches_bfs(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (4, 3)]:
+            initial_state = GameState(N=N, boat_capacity=K)
+            dag = build_shortest_path_dag(initial_state)
+            bfs_path = bfs_solve(initial_state)
+            if bfs_path is None:
+                self.assertIsNone(dag.length)
+                self.assertEqual(dag.count_solutions(), 0)
+                self.assertEqual(list(dag.iter_solutions()), [])
+            else:
+                self.assertEqual(dag.length, len(bfs_path) - 1)
+                self.assertTrue(dag.is_optimal_solution(format_actor_agent_path(bfs_path)))
+
+    def test_count_and_enumeration_match_brute_force(self):
+        for N, K in [(2, 2), (2, 3), (3, 3)]:
+            dag = build_shortest_path_dag(GameState(N=N, boat_capacity=K))
+            expected = brute_force_optimal_solutions(N, K, dag.length)
+            enumerated = [tuple(masks) for masks in dag.iter_solution_masks()]
+            self.assertEqual(len(enumerated), len(set(enumerated)), "Enumeration yielded duplicates")
+            self.assertEqual(set(enumerated), expected)
+            self.assertEqual(dag.count_solutions(), len(expected))
+
+    def test_iter_solutions_is_lazy_and_valid(self):
+        dag = build_shortest_path_dag(GameState(N=4, boat_capacity=3))
+        self.assertGreater(dag.count_solutions(), 1)
+        first = next(dag.iter_solutions())
+        self.assertEqual(len(first), dag.length)
+        self.assertTrue(dag.is_optimal_solution(first))
+
+    def test_is_optimal_solution_rejects(self):
+        dag = build_shortest_path_dag(GameState(N=2, boat_capacity=2))
+        optimal = next(dag.iter_solutions())
+        self.assertFalse(dag.is_optimal_solution(optimal[:-1])) # Too short
+        self.assertFalse(dag.is_optimal_solution(optimal + [['A_1']])) # Too long
+        self.assertFalse(dag.is_optimal_solution([['A_9']] + optimal[1:])) # Unknown individual
+        self.assertFalse(dag.is_optimal_solution([['a_1', 'A_2']] + optimal[1:])) # Illegal move
+        name = optimal[0][0]
+        for malformed in (name[:2] + "+" + name[2:], name[:2] + "0" + name[2:], name[:2] + " " + name[2:], name + "_0"):
+            renamed = [[malformed if n == name else n for n in optimal[0]]] + optimal[1:]
+            self.assertFalse(dag.is_optimal_solution(renamed), malformed) # Not a real individual
+
+    def test_already_solved_and_invalid(self):
+        solved = GameState(N=2, boat_capacity=2, boat_on_left=False)
+        dag = build_shortest_path_dag(solved)
+        self.assertEqual(dag.length, 0)
+        self.assertEqual(dag.count_solutions(), 1)
+        self.assertEqual(list(dag.iter_solutions()), [[]])
+
+        invalid = GameState(N=1, boat_capacity=1)
+        invalid.left_bank.remove("a_1")
+        self.assertIsNone(build_shortest_path_dag(invalid))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from solvers.profiling import CellProfiler
+from solvers.search import bfs_solve
+
+class TestCellProfiler(unittest.TestCase):
+
+    def test_reports_per_cell_and_summary(self):
+        with tempfile.TemporaryDirectory() as report_dir:
+            profiler = CellProfiler(report_dir, top=10)
+            for n in (2, 3):
+                with profiler.cell(f"n{n}_k2_bfs"):
+                    path = bfs_solve(GameState(N=n, boat_capacity=2))
+                self.assertTrue(path)
+            summary_path = profiler.finish()
+
+            for label in ("n2_k2_bfs", "n3_k2_bfs"):
+                for suffix in (".prof", ".txt", "_memory.txt"):
+                    self.assertTrue(os.path.exists(os.path.join(report_dir, label + suffix)))
+            with open(os.path.join(report_dir, "n3_k2_bfs.txt")) as f:
+                self.assertIn("bfs_solve", f.read())
+            with open(summary_path, newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([row["cell"] for row in rows], ["n2_k2_bfs", "n3_k2_bfs"])
+            self.assertTrue(all(float(row["peak_mib"]) > 0 for row in rows))
+            with open(os.path.join(report_dir, "summary.txt")) as f:
+                self.assertIn("All cells together", f.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from solvers.reachability import (build_goal_reachability, get_goal_reachability,
+                                  load_goal_reachability, save_goal_reachability)
+from solvers.scoring import goal_distance_table
+from solvers.search import bfs_solve
+
+class TestGoalReachability(unittest.TestCase):
+
+    def test_bitmap_matches_goal_distance_table(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (4, 2), (4, 3)]:
+            reachability = build_goal_reachability(N, K)
+            distances = goal_distance_table(N, K)
+            self.assertEqual(reachability.count(), len(distances), f"N={N}, K={K}")
+            for code in range(1 << (2 * N + 1)):
+                self.assertEqual(reachability.can_reach_goal(code), code in distances)
+
+    def test_state_queries(self):
+        reachability = build_goal_reachability(1, 1)
+        self.assertFalse(reachability.state_can_reach_goal(GameState(N=1, boat_capacity=1)))
+        self.assertTrue(reachability.state_can_reach_goal(GameState(N=1, boat_capacity=1, boat_on_left=False)))
+        invalid = GameState(N=1, boat_capacity=1, left_bank_individuals={'a_1'}, right_bank_individuals=set())
+        self.assertFalse(reachability.state_can_reach_goal(invalid))
+
+    def test_disk_cache_round_trip(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            built = get_goal_reachability(3, 2, cache_dir=cache_dir)
+            file_path = os.path.join(cache_dir, "n3_k2.reach")
+            self.assertTrue(os.path.exists(file_path))
+            loaded = load_goal_reachability(file_path)
+            self.assertEqual((loaded.N, loaded.K, loaded.bitmap), (3, 2, built.bitmap))
+
+            with open(file_path, "r+b") as f:
+                f.truncate(10)
+            with self.assertRaises(ValueError):
+                load_goal_reachability(file_path)
+            save_goal_reachability(built, file_path)
+            self.assertEqual(load_goal_reachability(file_path).bitmap, built.bitmap)
+
+    def test_state_can_reach_goal(self):
+        for N, K in [(1, 1), (4, 2), (3, 2)]:
+            reachability = build_goal_reachability(N, K)
+            initial_state = GameState(N=N, boat_capacity=K)
+            self.assertEqual(reachability.state_can_reach_goal(initial_state), bfs_solve(initial_state) is not None)
+        with self.assertRaises(ValueError): # Codes of another (N, K) index the wrong bits
+            build_goal_reachability(3, 2).state_can_reach_goal(GameState(N=2, boat_capacity=2))
+        with self.assertRaises(ValueError):
+            build_goal_reachability(3, 2).state_can_reach_goal(GameState(N=3, boat_capacity=3))
+
+if __name__ == '__main__':
+    unittest.main()
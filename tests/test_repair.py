@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.compact import NOT_ON_SOURCE_BANK, NOT_WIN, get_engine
+from solvers.heuristic import validate_solution
+from solvers.repair import edit_distance, repair_solution, shortest_completion
+from solvers.scoring import goal_distance_table, moves_to_masks, optimal_length
+from solvers.search import bfs_solve, format_actor_agent_path
+
+class TestSolutionRepair(unittest.TestCase):
+
+    def test_valid_candidate_is_unchanged(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        repair = repair_solution(3, 2, moves)
+        self.assertIsNone(repair.failure_reason)
+        self.assertEqual((repair.kept_moves, repair.edit_distance), (len(moves), 0))
+        self.assertEqual(repair.moves(), moves)
+
+    def test_unfinished_candidate_is_completed_optimally(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        repair = repair_solution(3, 2, moves[:4])
+        self.assertEqual(repair.failure_reason, NOT_WIN)
+        self.assertEqual(repair.kept_moves, 4)
+        self.assertEqual(len(repair.moves()), optimal_length(3, 2)) # The prefix was optimal, so is the fix
+        self.assertEqual(repair.edit_distance, len(moves) - 4)
+        self.assertTrue(validate_solution(3, 2, repair.moves()))
+
+    def test_invalid_move_is_replaced(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        broken = moves[:2] + [['A_9']] + moves[2:] # Nobody called A_9
+        repair = repair_solution(3, 2, broken)
+        self.assertEqual((repair.failure_reason, repair.kept_moves), (NOT_ON_SOURCE_BANK, 2))
+        self.assertTrue(validate_solution(3, 2, repair.moves()))
+        self.assertEqual(repair.moves()[:2], moves[:2])
+        self.assertEqual(len(repair.moves()), len(moves)) # The prefix was optimal, so is the fix
+        self.assertEqual(repair.edit_distance, edit_distance(moves_to_masks(3, 2, broken[2:]), repair.repaired_masks[2:]))
+
+    def test_repairs_are_shortest_from_the_reached_state(self):
+        distances = goal_distance_table(4, 3)
+        engine = get_engine(4, 3)
+        for moves in ([], [['a_1']], [['A_1', 'a_1'], ['Z_9']], [['A_1', 'A_2', 'a_1'], ['A_1'], ['a_9']]):
+            repair = repair_solution(4, 3, moves)
+            _, _, code = engine.check_moves(repair.repaired_masks[:repair.kept_moves])
+            self.assertEqual(len(repair.repaired_masks) - repair.kept_moves, distances[code])
+            self.assertTrue(validate_solution(4, 3, repair.moves()))
+
+    def test_completions_are_cached_by_reached_state(self):
+        shortest_completion.cache_clear()
+        for _ in range(3):
+            repair_solution(3, 2, [['A_1', 'a_1'], ['Z_9']])
+        info = shortest_completion.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_unsolvable_instance(self):
+        repair = repair_solution(4, 2, [['A_1', 'a_1']])
+        self.assertFalse(repair.repaired)
+        self.assertIsNone(repair.moves())
+        self.assertIsNone(repair.edit_distance)
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance([], [1, 2]), 2)
+        self.assertEqual(edit_distance([1, 2, 3], [1, 3]), 1)
+        self.assertEqual(edit_distance([1, 2, 3], [4, 2, 3]), 1)
+        self.assertEqual(edit_distance([5, 6], [5, 6]), 0)
+
+if __name__ == '__main__':
+    unittest.main()
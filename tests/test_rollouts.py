@@ -0,0 +1,57 @@
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine
+from solvers.rollouts import ILLEGAL, MAX_MOVES, WIN, RolloutTable, simulate_rollouts
+from solvers.scoring import optimal_length
+
+class TestRollouts(unittest.TestCase):
+
+    def replay(self, N, K, rollout):
+        engine = get_engine(N, K)
+        masks = [engine.boat_groups[action] for action in rollout.actions]
+        return engine.check_moves(masks)
+
+    def test_seeded_runs_are_reproducible(self):
+        first = [r.actions for r in simulate_rollouts(3, 2, 50, 20, policy="legal", seed=7, batch_size=16)]
+        second = [r.actions for r in simulate_rollouts(3, 2, 50, 20, policy="legal", seed=7, batch_size=16)]
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 50)
+
+    def test_legal_rollouts_replay_cleanly(self):
+        for rollout in simulate_rollouts(3, 2, 200, 30, policy="legal", seed=1):
+            reason, applied, _ = self.replay(3, 2, rollout)
+            self.assertEqual(applied, len(rollout.actions))
+            self.assertEqual(reason is None, rollout.outcome == WIN)
+            if rollout.outcome != WIN:
+                self.assertEqual((rollout.outcome, len(rollout.actions)), (MAX_MOVES, 30))
+
+    def test_greedy_rollouts_are_optimal(self):
+        best = optimal_length(6, 4)
+        for rollout in simulate_rollouts(6, 4, 100, 40, policy="epsilon_greedy", epsilon=0.0, seed=2):
+            self.assertEqual((rollout.outcome, len(rollout.actions)), (WIN, best))
+            self.assertIsNone(self.replay(6, 4, rollout)[0])
+
+    def test_uniform_rollouts_report_first_illegal_attempt(self):
+        for rollout in simulate_rollouts(2, 2, 200, 10, policy="uniform", seed=3):
+            reason, applied, _ = self.replay(2, 2, rollout)
+            if rollout.outcome == ILLEGAL:
+                self.assertEqual(rollout.illegal_step, len(rollout.actions) - 1)
+                self.assertEqual(applied, rollout.illegal_step)
+                self.assertIsNotNone(reason)
+            else:
+                self.assertIsNone(rollout.illegal_step)
+                self.assertEqual(applied, len(rollout.actions))
+
+    def test_unsolvable_cell_never_wins(self):
+        table = RolloutTable(4, 2)
+        self.assertEqual(table.goal_id, -1)
+        outcomes = {r.outcome for r in simulate_rollouts(4, 2, 100, 25, policy="epsilon_greedy", seed=4, table=table)}
+        self.assertEqual(outcomes, {MAX_MOVES})
+
+if __name__ == '__main__':
+    unittest.main()
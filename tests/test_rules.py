@@ -0,0 +1,107 @@
+import random
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import UNSAFE_BANK, get_engine
+from game.environment import GameState
+from game.rules import ACTOR_AGENT, MISSIONARIES_CANNIBALS, RULES, PuzzleRules, _swar_bit_count, array_bit_count
+from solvers.batch_validation import check_moves_batch
+from solvers.repair import repair_solution
+from solvers.scoring import goal_distance_table, optimal_length, score_solution
+
+class TestPuzzleRules(unittest.TestCase):
+
+    def test_actor_agent_matches_game_state(self):
+        N = 3
+        engine = get_engine(N, 2)
+        self.assertIs(engine.rules, ACTOR_AGENT)
+        state = GameState(N=N, boat_capacity=2)
+        for mask in range(1 << (2 * N)):
+            names = set(engine.mask_to_group(mask))
+            self.assertEqual(engine.is_safe(mask), GameState.is_group_safe(names, state.actors, state.agents), names)
+
+    def test_game_state_follows_its_rules(self):
+        N = 3
+        engine = get_engine(N, 2, MISSIONARIES_CANNIBALS)
+        state = GameState(N=N, boat_capacity=2, rules=MISSIONARIES_CANNIBALS)
+        for mask in range(1 << (2 * N)):
+            self.assertEqual(engine.is_safe(mask), state.group_is_safe(engine.mask_to_group(mask)))
+        for code in range(1 << (2 * N + 1)):
+            decoded = engine.decode(code)
+            self.assertEqual(decoded.is_valid_state(), engine.is_valid_code(code))
+            if engine.is_valid_code(code):
+                self.assertEqual({engine.encode(child) for child in decoded.get_valid_next_states()},
+                                 {child for _, child in engine.successors(code)})
+
+    def test_rules_must_implement_every_method(self):
+        with self.assertRaises(TypeError):
+            PuzzleRules()
+
+        class SafetyOnly(PuzzleRules):
+            def compile_is_safe(self, N):
+                return lambda mask: True
+        with self.assertRaises(TypeError):
+            SafetyOnly()
+
+    def test_array_bit_count_fallback(self):
+        import numpy as np
+        rng = random.Random(0)
+        values = [0, 1, 2**63, 2**64 - 1] + [rng.getrandbits(64) for _ in range(200)]
+        masks = np.array(values, dtype=np.uint64)
+        self.assertEqual(_swar_bit_count(masks).tolist(), [value.bit_count() for value in values])
+        self.assertEqual(array_bit_count(masks).tolist(), [value.bit_count() for value in values])
+
+    def test_missionaries_cannibals_counts(self):
+        is_safe = MISSIONARIES_CANNIBALS.compile_is_safe(3)
+        self.assertTrue(is_safe(0b111_000)) # Only cannibals
+        self.assertTrue(is_safe(0b011_011)) # Two of each
+        self.assertFalse(is_safe(0b011_001)) # One missionary, two cannibals
+        self.assertTrue(is_safe(0b001_011))
+
+    def test_missionaries_cannibals_known_results(self):
+        # Classic results (docs/no_solutions.md): k=2 solves n<=3 (n=3 in 11 moves), k=3 solves n<=5
+        self.assertEqual([optimal_length(n, 2, MISSIONARIES_CANNIBALS) for n in range(1, 5)], [1, 5, 11, None])
+        self.assertEqual(optimal_length(5, 3, MISSIONARIES_CANNIBALS), 11)
+        self.assertIsNone(optimal_length(6, 3, MISSIONARIES_CANNIBALS))
+        self.assertIsNone(optimal_length(1, 1, MISSIONARIES_CANNIBALS))
+
+    def test_boat_is_not_checked_for_missionaries_cannibals(self):
+        engine = get_engine(3, 3, MISSIONARIES_CANNIBALS)
+        self.assertIn(0b110_001, engine.boat_groups) # M_1 with C_2 and C_3 may row together
+        self.assertNotIn(0b110_001, get_engine(3, 3).boat_groups)
+
+    def test_names(self):
+        engine = get_engine(2, 2, MISSIONARIES_CANNIBALS)
+        self.assertEqual(engine.mask_to_group(0b0110), ['C_1', 'M_2'])
+        self.assertEqual(engine.group_to_mask(['M_1', 'C_2']), 0b1001)
+        with self.assertRaises(ValueError):
+            engine.individual_bit('a_1')
+        self.assertEqual(RULES['missionaries_cannibals'], MISSIONARIES_CANNIBALS)
+
+    def test_canonical_code_keeps_distances(self):
+        for rules in RULES.values():
+            engine = get_engine(3, 2, rules)
+            distances = goal_distance_table(3, 2, rules)
+            for code, distance in distances.items():
+                self.assertEqual(distances.get(engine.canonical_code(code)), distance)
+
+    def test_shared_paths_work_for_missionaries_cannibals(self):
+        rules = MISSIONARIES_CANNIBALS
+        repair = repair_solution(3, 2, [['C_1', 'C_2']], rules)
+        self.assertEqual(len(repair.moves()), 11)
+        self.assertTrue(score_solution(3, 2, repair.moves(), rules).valid)
+        self.assertEqual(score_solution(3, 2, [['M_1']], rules).failure_reason, UNSAFE_BANK)
+
+        engine = get_engine(3, 2, rules)
+        rng = random.Random(0)
+        candidates = [[rng.choice(engine.boat_groups) for _ in range(rng.randrange(12))] for _ in range(300)]
+        candidates.append(repair.repaired_masks)
+        self.assertEqual(check_moves_batch(3, 2, candidates, rules),
+                         [engine.check_moves(candidate) for candidate in candidates])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import io
+import unittest
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.compact import NOT_ON_SOURCE_BANK, NOT_WIN, UNSAFE_BOAT
+from solvers.heuristic import solve_k4_heuristic_2N_minus_3, validate_solution
+from solvers.scoring import goal_distance_table, optimal_length, score_solution
+from solvers.search import bfs_solve, dfs_solve, format_actor_agent_path
+
+class TestSolutionScoring(unittest.TestCase):
+
+    def test_optimal_length_matches_bfs(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (4, 3), (6, 4)]:
+            bfs_path = bfs_solve(GameState(N=N, boat_capacity=K))
+            expected = len(bfs_path) - 1 if bfs_path else None
+            self.assertEqual(optimal_length(N, K), expected, f"N={N}, K={K}")
+
+    def test_distance_table_is_cached(self):
+        self.assertIs(goal_distance_table(3, 2), goal_distance_table(3, 2))
+
+    def test_optimal_solution(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        score = score_solution(3, 2, moves)
+        self.assertTrue(score.valid)
+        self.assertEqual(score.optimality_gap, 0)
+        self.assertIsNone(score.deviation_move_index)
+        self.assertIsNone(score.failed_move_index)
+
+    def test_heuristic_solution(self):
+        moves = solve_k4_heuristic_2N_minus_3(6)
+        score = score_solution(6, 4, moves)
+        self.assertTrue(score.valid)
+        self.assertEqual(score.candidate_length, 9)
+        self.assertEqual(score.optimality_gap, 9 - optimal_length(6, 4))
+
+    def test_detour_is_reported(self):
+        optimal = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        detour = [optimal[0], optimal[0]] + optimal # Cross and immediately come back
+        score = score_solution(3, 2, detour)
+        self.assertTrue(score.valid)
+        self.assertEqual(score.optimality_gap, 2)
+        self.assertEqual(score.deviation_move_index, 1)
+
+    def test_long_dfs_solution_deviates(self):
+        # DFS needs 23+ moves for N=5, K=3 whatever the set iteration order; the optimum is 11
+        moves = format_actor_agent_path(dfs_solve(GameState(N=5, boat_capacity=3)))
+        score = score_solution(5, 3, moves)
+        self.assertTrue(score.valid)
+        self.assertTrue(validate_solution(5, 3, moves))
+        self.assertGreater(score.optimality_gap, 0)
+        self.assertIsNotNone(score.deviation_move_index)
+        self.assertLess(score.deviation_move_index, len(moves))
+
+    def test_invalid_candidates(self):
+        optimal = format_actor_agent_path(bfs_solve(GameState(N=2, boat_capacity=2)))
+
+        unsafe = score_solution(2, 2, [['a_1', 'A_2']] + optimal[1:])
+        self.assertEqual((unsafe.failure_reason, unsafe.failed_move_index), (UNSAFE_BOAT, 0))
+        self.assertEqual(unsafe.deviation_move_index, 0)
+        self.assertIsNone(unsafe.optimality_gap)
+
+        unknown = score_solution(2, 2, [['A_7']] + optimal[1:])
+        self.assertEqual((unknown.failure_reason, unknown.failed_move_index), (NOT_ON_SOURCE_BANK, 0))
+
+        incomplete = score_solution(2, 2, optimal[:3])
+        self.assertEqual((incomplete.failure_reason, incomplete.failed_move_index), (NOT_WIN, 3))
+        self.assertIsNone(incomplete.deviation_move_index) # Still on an optimal path, just unfinished
+
+    def test_malformed_names_agree_with_validate_solution(self):
+        optimal = format_actor_agent_path(bfs_solve(GameState(N=2, boat_capacity=2)))
+        name = optimal[0][0] # e.g. 'A_2'
+        for spelling in ("0", "+", " "):
+            malformed = name[:2] + spelling + name[2:]
+            candidate = [[malformed if n == name else n for n in optimal[0]]] + optimal[1:]
+            score = score_solution(2, 2, candidate)
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(validate_solution(2, 2, candidate))
+            self.assertFalse(score.valid, candidate)
+            self.assertEqual((score.failure_reason, score.failed_move_index), (NOT_ON_SOURCE_BANK, 0))
+        candidate = [optimal[0] + [name + "_0"]] + optimal[1:]
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(validate_solution(2, 2, candidate))
+        self.assertFalse(score_solution(2, 2, candidate).valid)
+
+    def test_unsolvable_instance(self):
+        score = score_solution(1, 1, [['a_1']])
+        self.assertIsNone(score.optimal_length)
+        self.assertFalse(score.valid)
+        self.assertEqual(score.as_dict()['optimality_gap'], None)
+
+if __name__ == '__main__':
+    unittest.main()
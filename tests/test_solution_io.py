@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import struct
+import tempfile
+import zlib
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from solvers.heuristic import solve_k4_heuristic_2N_minus_3
+from solvers.solution_io import (MAGIC, VERSION, SolutionReader, decode_moves, encode_moves,
+                                 read_solution, save_solution_blob, write_solution)
+
+class TestBinarySolutionFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_payload_round_trip(self):
+        moves = [['A_2', 'a_2'], ['A_2'], ['A_1', 'A_2'], ['A_1'], ['A_1', 'a_1']]
+        self.assertEqual(decode_moves(2, encode_moves(2, moves)), moves)
+        self.assertEqual(encode_moves(2, []), b"")
+
+    def test_file_round_trip_and_header(self):
+        moves = solve_k4_heuristic_2N_minus_3(60)
+        file_path = os.path.join(self.tmp_dir.name, "n60_k4.rcs")
+        write_solution(file_path, 60, 4, moves, solver="heuristic_2N-3")
+
+        reader = SolutionReader(file_path)
+        self.assertEqual((reader.N, reader.K, reader.solver), (60, 4, "heuristic_2N-3"))
+        self.assertEqual(len(reader), 2 * 60 - 3)
+        self.assertEqual(read_solution(file_path), moves)
+        # Much smaller than the str(list-of-lists) CSV cell it replaces
+        self.assertLess(os.path.getsize(file_path), len(str(moves)) // 4)
+
+    def test_lazy_iteration(self):
+        moves = solve_k4_heuristic_2N_minus_3(10)
+        file_path = save_solution_blob(self.tmp_dir.name, 10, 4, moves)
+        iterator = iter(SolutionReader(file_path))
+        self.assertEqual(next(iterator), moves[0])
+        self.assertEqual(next(iterator), moves[1])
+
+    def test_corruption_is_detected(self):
+        moves = solve_k4_heuristic_2N_minus_3(8)
+        file_path = save_solution_blob(self.tmp_dir.name, 8, 4, moves)
+        with open(file_path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([2])) # Change the last occupant's bit index
+        with self.assertRaises(ValueError):
+            read_solution(file_path)
+
+        not_a_solution = os.path.join(self.tmp_dir.name, "bogus.rcs")
+        with open(not_a_solution, "wb") as f:
+            f.write(b"n,k,solvable")
+        with self.assertRaises(ValueError):
+            SolutionReader(not_a_solution)
+
+    def test_checksum_uses_raw_bytes_across_chunk_boundaries(self):
+        # Valid but non-minimal varints (bit 0 as b"\x80\x00"): re-encoding them would change the bytes
+        move = b"\x01\x80\x00"
+        count = 30000 # ~90 KB, so some moves straddle the reader's 64 KB refills
+        payload = move * count
+        header = MAGIC + bytes([VERSION, 2, 2, 0]) + bytes([0xB0, 0xEA, 0x01]) # N=2, K=2, solver "", length 30000
+        file_path = os.path.join(self.tmp_dir.name, "raw.rcs")
+        with open(file_path, "wb") as f:
+            f.write(header + struct.pack("<I", zlib.crc32(payload)) + payload)
+        self.assertEqual(read_solution(file_path), [['a_1']] * count)
+
+    def test_truncated_payload_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            decode_moves(2, b"\x02\x01") # Announces two occupants, stores one
+        with self.assertRaises(ValueError):
+            decode_moves(2, b"\x01\x80") # Unterminated varint
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,22 @@
+import contextlib
+import io
 import unittest
+from unittest import mock
 import sys
 import os
 
 # Adjust path to import from parent directory modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import random
+
+from game.compact import get_engine
 from game.environment import GameState # Actor-Agent GameState
-from solvers.search import bfs_solve, dfs_solve, format_actor_agent_path
+from game.rules import MISSIONARIES_CANNIBALS
+from solvers.heuristic import solve_k4_heuristic_2N_minus_3, validate_solution
+from solvers.reachability import build_goal_reachability
+from solvers.search import (COST_MODELS, bfs_solve, dfs_solve, dijkstra_solve, iddfs_solve, multi_source_solve,
+                            parallel_bfs_solve, format_actor_agent_path, solution_cost, weighted_cost_sweep)
 
 class TestActorAgentSolvers(unittest.TestCase):
 
@@ -81,6 +91,54 @@ class TestActorAgentSolvers(unittest.TestCase):
         dfs_path = dfs_solve(initial_state)
         self.assertIsNone(dfs_path, "DFS should return None for an invalid initial AA state")
 
+    def test_parallel_bfs_matches_bfs_length(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (4, 3)]:
+            initial_state = GameState(N=N, boat_capacity=K)
+            bfs_path = bfs_solve(initial_state)
+            # Force even tiny layers through the process pool
+            with mock.patch('solvers.search.PARALLEL_MIN_LAYER_SIZE', 1):
+                parallel_path = parallel_bfs_solve(initial_state, workers=2)
+            if bfs_path is None:
+                self.assertIsNone(parallel_path, f"Parallel BFS found a path for unsolvable N={N}, K={K}")
+                continue
+            self.assertIsNotNone(parallel_path, f"Parallel BFS found no path for N={N}, K={K}")
+            self.assertEqual(len(parallel_path), len(bfs_path))
+            self.assertEqual(parallel_path[0], initial_state)
+            self.assertTrue(parallel_path[-1].is_win())
+            for current_state, next_state in zip(parallel_path, parallel_path[1:]):
+                self.assertIn(next_state, current_state.get_valid_next_states())
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), "needs POSIX shared memory listed in /dev/shm")
+    def test_parallel_bfs_releases_shared_memory_on_error(self):
+        blocks_before = set(os.listdir('/dev/shm'))
+        with mock.patch('solvers.search._dedupe_partition', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                parallel_bfs_solve(GameState(N=3, boat_capacity=2), workers=1)
+        self.assertEqual(set(os.listdir('/dev/shm')) - blocks_before, set())
+
+    def test_iddfs_matches_bfs_length(self):
+        for N, K in [(1, 1), (2, 2), (3, 2), (4, 2), (4, 3), (6, 4)]:
+            initial_state = GameState(N=N, boat_capacity=K)
+            bfs_path = bfs_solve(initial_state)
+            iddfs_path = iddfs_solve(initial_state)
+            if bfs_path is None:
+                self.assertIsNone(iddfs_path, f"IDDFS found a path for unsolvable N={N}, K={K}")
+                continue
+            self.assertIsNotNone(iddfs_path, f"IDDFS found no path for N={N}, K={K}")
+            self.assertEqual(len(iddfs_path), len(bfs_path))
+            self.assertEqual(iddfs_path[0], initial_state)
+            self.assertTrue(iddfs_path[-1].is_win())
+            for current_state, next_state in zip(iddfs_path, iddfs_path[1:]):
+                self.assertIn(next_state, current_state.get_valid_next_states())
+
+    def test_iddfs_with_tiny_transposition_table(self):
+        # Evicting learned bounds must only cost time, never optimality
+        initial_state = GameState(N=3, boat_capacity=2)
+        self.assertEqual(len(iddfs_solve(initial_state, transposition_table_size=4)), 12)
+        self.assertIsNone(iddfs_solve(GameState(N=4, boat_capacity=2), transposition_table_size=4))
+        self.assertEqual(iddfs_solve(GameState(N=1, boat_capacity=1, boat_on_left=False)),
+                         [GameState(N=1, boat_capacity=1, boat_on_left=False)])
+
     def test_format_actor_agent_path(self):
         # Test with the known N=2, K=2 solution path structure if BFS found it
         initial_state_n2k2 = GameState(N=2, boat_capacity=2)
@@ -116,6 +174,120 @@ class TestActorAgentSolvers(unittest.TestCase):
         # Test with a path of one state (already solved)
         self.assertEqual(format_actor_agent_path([initial_state_n2k2]), [])
 
+class TestWeightedCostSolver(unittest.TestCase):
+
+    def test_moves_cost_matches_bfs(self):
+        for N, K in [(2, 2), (3, 2), (4, 3), (5, 3), (6, 4)]:
+            path = dijkstra_solve(GameState(N=N, boat_capacity=K))
+            self.assertEqual(len(path), len(bfs_solve(GameState(N=N, boat_capacity=K))))
+            self.assertTrue(validate_solution(N, K, format_actor_agent_path(path)))
+        self.assertIsNone(dijkstra_solve(GameState(N=4, boat_capacity=2), "crossings"))
+
+    def test_symmetry_reduction_keeps_optimum(self):
+        for N, K in [(3, 2), (4, 3), (5, 4)]:
+            for name in COST_MODELS:
+                reduced = dijkstra_solve(GameState(N=N, boat_capacity=K), name)
+                full = dijkstra_solve(GameState(N=N, boat_capacity=K), name, use_symmetry=False)
+                self.assertEqual(solution_cost(reduced, name), solution_cost(full, name))
+                self.assertTrue(validate_solution(N, K, format_actor_agent_path(reduced)))
+
+    def test_cost_models(self):
+        start = GameState(N=6, boat_capacity=4)
+        path = dijkstra_solve(start, "crossings")
+        self.assertEqual(solution_cost(path, "crossings"), 22)
+        self.assertEqual(solution_cost(path, "crossings"), sum(len(move) for move in format_actor_agent_path(path)))
+        # The heuristic's ferry pair rows back every other move: 28 person-crossings
+        heuristic_crossings = sum(len(move) for move in solve_k4_heuristic_2N_minus_3(6))
+        self.assertEqual(heuristic_crossings, 28)
+        # A custom cost: a return trip costs twice as much as a forward one
+        path = dijkstra_solve(start, lambda group, boat_on_left: 1 if boat_on_left else 2)
+        self.assertEqual(len(path) - 1, 9)
+
+    def test_sweep(self):
+        rows = weighted_cost_sweep([(3, 2), (4, 2)])
+        self.assertEqual(rows[0], {"n": 3, "k": 2, "moves": 11, "crossings": 18, "return_trips": 5, "return_crossings": 6})
+        self.assertEqual(rows[1]["crossings"], None)
+
+class TestMultiSourceSolver(unittest.TestCase):
+
+    def random_starts(self, N, K, count, seed=0):
+        engine = get_engine(N, K)
+        rng = random.Random(seed)
+        starts = []
+        while len(starts) < count:
+            code = rng.getrandbits(2 * N + 1)
+            if engine.is_valid_code(code):
+                starts.append(engine.decode(code))
+        return starts
+
+    def test_matches_bfs_per_start(self):
+        for N, K in [(3, 2), (4, 2), (5, 3)]:
+            engine = get_engine(N, K)
+            starts = self.random_starts(N, K, 40)
+            starts.append(GameState(N=N, boat_capacity=K))
+            paths = multi_source_solve(starts)
+            for start, path in zip(starts, paths):
+                expected = bfs_solve(start)
+                self.assertEqual(len(path) if path else None, len(expected) if expected else None)
+                if path:
+                    self.assertIs(path[0], start)
+                    self.assertTrue(path[-1].is_win())
+                    for state, next_state in zip(path, path[1:]):
+                        self.assertIn(engine.encode(next_state), [child for _, child in engine.successors(engine.encode(state))])
+
+    def test_special_starts(self):
+        won = GameState(N=3, boat_capacity=2, boat_on_left=False)
+        invalid = GameState(N=3, boat_capacity=2, left_bank_individuals={"a_1", "A_2"},
+                            right_bank_individuals={"A_1", "a_2", "a_3", "A_3"})
+        self.assertEqual(multi_source_solve([won, invalid]), [[won], None])
+        self.assertEqual(multi_source_solve([]), [])
+        with self.assertRaises(ValueError):
+            multi_source_solve([GameState(N=3, boat_capacity=2), GameState(N=3, boat_capacity=3)])
+
+    def test_reachability_sets_unsolvable_starts_aside(self):
+        starts = self.random_starts(4, 2, 30, seed=1)
+        paths = multi_source_solve(starts, reachability=build_goal_reachability(4, 2))
+        self.assertEqual(paths, multi_source_solve(starts))
+        self.assertIsNone(multi_source_solve([GameState(N=4, boat_capacity=2)])[0])
+
+
+class TestMissionariesCannibalsSolvers(unittest.TestCase):
+
+    def test_every_solver_solves_missionaries_cannibals(self):
+        # Classic results (docs/no_solutions.md): k=2 solves n=3 in 11 moves and nothing above
+        rules = MISSIONARIES_CANNIBALS
+        initial_state = GameState(N=3, boat_capacity=2, rules=rules)
+        self.assertEqual(initial_state.actors, {"M_1", "M_2", "M_3"})
+        optimal = [bfs_solve(initial_state, rules=rules), parallel_bfs_solve(initial_state, workers=1, rules=rules),
+                   iddfs_solve(initial_state, rules=rules), dijkstra_solve(initial_state, rules=rules),
+                   multi_source_solve([initial_state], rules=rules)[0]]
+        for path in optimal + [dfs_solve(initial_state, rules=rules)]:
+            self.assertTrue(path[-1].is_win())
+            self.assertIs(path[-1].rules, rules)
+            self.assertTrue(validate_solution(3, 2, format_actor_agent_path(path), rules))
+        self.assertEqual([len(path) - 1 for path in optimal], [11] * len(optimal))
+
+        unsolvable = GameState(N=4, boat_capacity=2, rules=rules)
+        for solve in (bfs_solve, dfs_solve, iddfs_solve, dijkstra_solve):
+            self.assertIsNone(solve(unsolvable))
+
+    def test_boat_is_not_checked(self):
+        # One missionary may row with two cannibals; the Actor-Agent rules forbid that load
+        start = GameState(N=3, boat_capacity=3, rules=MISSIONARIES_CANNIBALS)
+        self.assertIn(frozenset(['C_1', 'C_2', 'M_1']), {frozenset(group) for group in start.iter_safe_boat_groups()})
+        moves = format_actor_agent_path(bfs_solve(start))
+        self.assertTrue(validate_solution(3, 3, moves, MISSIONARIES_CANNIBALS))
+        with contextlib.redirect_stdout(io.StringIO()): # validate_solution prints every failure
+            self.assertFalse(validate_solution(3, 3, moves)) # M_i and C_i are nobody under Actor-Agent
+            self.assertFalse(validate_solution(3, 3, [['A_1', 'A_2', 'a_1']], MISSIONARIES_CANNIBALS))
+
+    def test_rules_must_match_the_state(self):
+        with self.assertRaises(ValueError):
+            bfs_solve(GameState(N=3, boat_capacity=2), rules=MISSIONARIES_CANNIBALS)
+        with self.assertRaises(ValueError):
+            multi_source_solve([GameState(N=3, boat_capacity=2),
+                                GameState(N=3, boat_capacity=2, rules=MISSIONARIES_CANNIBALS)])
+        self.assertNotEqual(GameState(N=3, boat_capacity=2), GameState(N=3, boat_capacity=2, rules=MISSIONARIES_CANNIBALS))
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.environment import GameState
+from game.compact import NOT_ON_SOURCE_BANK, UNSAFE_BOAT
+from game.step_env import ILLEGAL_MOVE_REWARD, WIN_REWARD, RiverCrossingEnv, VectorRiverCrossingEnv
+from solvers.search import bfs_solve, format_actor_agent_path
+
+class TestStepEnvironment(unittest.TestCase):
+
+    def test_optimal_solution_wins(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=3, boat_capacity=2)))
+        env = RiverCrossingEnv()
+        observation, info = env.reset(3, 2)
+        self.assertEqual(observation.tolist(), [1] * 7)
+        for i, move in enumerate(moves):
+            self.assertTrue(info['action_mask'][env.action_index(move)])
+            observation, reward, terminated, truncated, info = env.step(env.action_index(move) if i % 2 else move)
+            self.assertEqual(terminated, i == len(moves) - 1)
+            self.assertFalse(truncated)
+        self.assertEqual(reward, WIN_REWARD)
+        self.assertEqual(observation.tolist(), [0] * 7)
+        self.assertTrue(env.state.is_win())
+
+    def test_illegal_moves_end_the_episode(self):
+        env = RiverCrossingEnv()
+        env.reset(2, 2)
+        _, reward, terminated, _, info = env.step(['a_1', 'A_2'])
+        self.assertEqual((reward, terminated, info['illegal_reason']), (ILLEGAL_MOVE_REWARD, True, UNSAFE_BOAT))
+        env.reset(2, 2)
+        env.step(['A_1', 'a_1'])
+        _, _, _, _, info = env.step(['A_2'])
+        self.assertEqual(info['illegal_reason'], NOT_ON_SOURCE_BANK)
+        self.assertEqual(env.state, GameState(N=2, boat_capacity=2, left_bank_individuals={'a_2', 'A_2'},
+                                              right_bank_individuals={'a_1', 'A_1'}, boat_on_left=False))
+
+    def test_action_index_out_of_range(self):
+        env = RiverCrossingEnv()
+        env.reset(2, 2)
+        for action in (-1, env.num_actions):
+            with self.assertRaises(ValueError):
+                env.step(action)
+        self.assertEqual(env.steps, 0)
+        vector_env = VectorRiverCrossingEnv(2, 2, num_envs=3)
+        vector_env.reset()
+        for actions in ([0, -1, 0], [0, 1, len(vector_env.groups)]):
+            with self.assertRaises(ValueError):
+                vector_env.step(actions)
+        self.assertEqual(vector_env.steps.tolist(), [0, 0, 0])
+
+    def test_truncation(self):
+        env = RiverCrossingEnv(max_steps=2)
+        env.reset(2, 2)
+        env.step(['A_1', 'a_1'])
+        _, _, terminated, truncated, _ = env.step(['A_1'])
+        self.assertEqual((terminated, truncated), (False, True))
+
+    def test_vector_env_matches_single_env(self):
+        N, K = 3, 2
+        vector_env = VectorRiverCrossingEnv(N, K, num_envs=64, max_steps=30)
+        observations, info = vector_env.reset()
+        envs = [RiverCrossingEnv(max_steps=30) for _ in range(64)]
+        for env in envs:
+            env.reset(N, K)
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            masks = info['action_mask']
+            # Mostly legal actions, sometimes any action, to exercise both paths
+            actions = np.array([rng.choice(np.flatnonzero(mask)) if rng.random() < 0.9 else rng.integers(len(mask))
+                                for mask in masks])
+            observations, rewards, terminated, truncated, info = vector_env.step(actions)
+            for i, env in enumerate(envs):
+                self.assertTrue(np.array_equal(masks[i], env.action_mask()))
+                observation, reward, env_terminated, env_truncated, _ = env.step(int(actions[i]))
+                self.assertEqual((rewards[i], terminated[i], truncated[i]), (reward, env_terminated, env_truncated))
+                if env_terminated or env_truncated:
+                    self.assertTrue(np.array_equal(info['final_observation'][i], observation))
+                    env.reset(N, K)
+                self.assertTrue(np.array_equal(observations[i], env._observation()))
+
+    def test_vector_env_solves_in_lockstep(self):
+        moves = format_actor_agent_path(bfs_solve(GameState(N=2, boat_capacity=2)))
+        vector_env = VectorRiverCrossingEnv(2, 2, num_envs=5)
+        vector_env.reset()
+        env = RiverCrossingEnv()
+        env.reset(2, 2)
+        for move in moves:
+            _, rewards, terminated, _, _ = vector_env.step(np.full(5, env.action_index(move)))
+        self.assertTrue(terminated.all())
+        self.assertTrue((rewards == WIN_REWARD).all())
+        self.assertTrue((vector_env.left == vector_env.engine.full_mask).all()) # Auto-reset
+
+if __name__ == '__main__':
+    unittest.main()
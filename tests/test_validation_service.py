@@ -0,0 +1,166 @@
+import asyncio
+import json
+import random
+import time
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Adjust path to import from parent directory modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.compact import get_engine
+from game.rules import ACTOR_AGENT, MISSIONARIES_CANNIBALS
+from solvers.batch_validation import check_moves_batch, check_moves_trie
+from solvers.scoring import score_move_masks
+from solvers.search import bfs_solve, format_actor_agent_path
+from game.environment import GameState
+from solvers.validation_service import ValidationService, serve
+
+class TestBatchValidation(unittest.TestCase):
+
+    def test_matches_check_moves(self):
+        rng = random.Random(0)
+        for N, K in [(0, 1), (2, 2), (3, 2), (5, 3), (6, 4)]:
+            engine = get_engine(N, K)
+            groups = list(engine.boat_groups) or [0]
+            candidates = [[]]
+            path = bfs_solve(GameState(N, K)) if N > 0 else None
+            if path is not None:
+                candidates.append([engine.group_to_mask(move) for move in format_actor_agent_path(path)])
+            for _ in range(200):
+                length = rng.randrange(12)
+                if rng.random() < 0.5:
+                    candidates.append([rng.choice(groups) for _ in range(length)])
+                else: # Arbitrary masks, including people outside the 2N real ones
+                    candidates.append([rng.getrandbits(2 * N + 2) for _ in range(length)])
+            expected = [engine.check_moves(candidate) for candidate in candidates]
+            self.assertEqual(check_moves_batch(N, K, candidates), expected, (N, K))
+
+    def test_empty_batch(self):
+        self.assertEqual(check_moves_batch(3, 2, []), [])
+        self.assertEqual(check_moves_trie(3, 2, []), [])
+
+    def test_trie_matches_check_moves(self):
+        rng = random.Random(1)
+        for N, K, rules in [(0, 1, ACTOR_AGENT), (3, 2, ACTOR_AGENT), (5, 3, ACTOR_AGENT), (6, 4, ACTOR_AGENT),
+                            (3, 2, MISSIONARIES_CANNIBALS)]:
+            engine = get_engine(N, K, rules)
+            groups = list(engine.boat_groups) or [0]
+            stems = [[rng.choice(groups) for _ in range(rng.randrange(15))] for _ in range(20)]
+            candidates = [[]]
+            for _ in range(500): # Heavy prefix overlap: a shared stem, cut somewhere, plus a short tail
+                stem = rng.choice(stems)
+                tail = [rng.choice(groups) if rng.random() < 0.7 else rng.getrandbits(2 * N + 2)
+                        for _ in range(rng.randrange(5))]
+                candidates.append(stem[:rng.randrange(len(stem) + 1)] + tail)
+            candidates += candidates[:50] # Exact duplicates
+            expected = [engine.check_moves(candidate) for candidate in candidates]
+            self.assertEqual(check_moves_trie(N, K, candidates, rules), expected, (N, K, rules))
+
+class TestValidationService(unittest.TestCase):
+
+    def run_clients(self, requests_per_client, clients=8):
+        async def client(port, requests):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for request in requests: # Pipelined: everything is sent before reading answers
+                writer.write(json.dumps(request).encode("utf-8") + b"\n")
+            await writer.drain()
+            answers = [json.loads(await reader.readline()) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+            return answers
+
+        async def main():
+            service = ValidationService(max_delay=0.01)
+            server = await serve(service, port=0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                results = await asyncio.gather(*(client(port, requests_per_client(i)) for i in range(clients)))
+                return service, results
+            finally:
+                server.close()
+                await server.wait_closed()
+                await service.stop()
+
+        return asyncio.run(main())
+
+    def test_concurrent_validation_matches_check_moves(self):
+        engine = get_engine(3, 2)
+        solution = format_actor_agent_path(bfs_solve(GameState(3, 2)))
+
+        def requests(client):
+            batch = []
+            for i in range(20):
+                moves = solution[:len(solution) - i % 3] # Some complete, some stop short of the goal
+                if i % 5 == 0:
+                    moves = [["a_1", "a_2", "a_3"]] + moves # Boat too small
+                batch.append({"id": f"{client}-{i}", "op": "validate", "n": 3, "k": 2, "moves": moves})
+            return batch
+
+        service, results = self.run_clients(requests)
+        for client, answers in enumerate(results):
+            by_id = {answer["id"]: answer for answer in answers}
+            for request in requests(client):
+                reason, applied, _ = engine.check_moves([engine.group_to_mask(m) for m in request["moves"]])
+                answer = by_id[request["id"]]
+                self.assertEqual(answer["valid"], reason is None)
+                self.assertEqual(answer["failure_reason"], reason)
+                self.assertEqual(answer["failed_move_index"], applied if reason is not None else None)
+        metrics = service.metrics()
+        self.assertEqual(metrics["requests"], 8 * 20)
+        self.assertGreater(metrics["mean_batch_size"], 1) # Requests were actually batched together
+
+    def test_score_text_metrics_and_errors(self):
+        solution = format_actor_agent_path(bfs_solve(GameState(2, 2)))
+
+        def requests(client):
+            return [
+                {"id": 1, "op": "score", "n": 2, "k": 2, "moves_text": str(solution)},
+                {"id": 2, "op": "validate", "n": 2, "k": 2, "moves": [["Z_9"]]},
+                {"id": 3, "op": "teleport", "n": 2, "k": 2, "moves": []},
+                {"id": 4, "op": "validate", "n": 2},
+                {"id": 5, "op": "validate", "n": 32, "k": 2, "moves": []}, # Above MAX_N
+                {"id": 6, "op": "score", "n": 12, "k": 4, "moves": []}, # Distance table too large to build
+            ]
+
+        service, results = self.run_clients(requests, clients=1)
+        by_id = {answer["id"]: answer for answer in results[0]}
+        self.assertTrue(by_id[1]["valid"])
+        self.assertEqual(by_id[1]["optimality_gap"], 0)
+        self.assertEqual((by_id[2]["valid"], by_id[2]["failed_move_index"]), (False, 0))
+        self.assertIn("error", by_id[3])
+        self.assertIn("error", by_id[4])
+        self.assertIn("too large", by_id[5]["error"])
+        self.assertIn("too large", by_id[6]["error"])
+
+        async def ask_metrics():
+            return await service.submit({"id": 9, "op": "metrics"})
+        metrics = asyncio.run(ask_metrics())
+        for key in ("requests", "batches", "mean_batch_size", "p50_ms", "p99_ms"):
+            self.assertIn(key, metrics)
+        self.assertEqual(metrics["id"], 9)
+
+    def test_slow_batches_leave_the_event_loop_free(self):
+        slow_score = lambda *args: time.sleep(0.5) or score_move_masks(*args)
+
+        async def main():
+            service = ValidationService()
+            try:
+                score = asyncio.ensure_future(service.submit({"id": 1, "op": "score", "n": 2, "k": 2, "moves": []}))
+                start = time.perf_counter()
+                await asyncio.sleep(0.1) # The score is worked off meanwhile; a blocked loop would oversleep
+                slept = time.perf_counter() - start
+                self.assertFalse(score.done())
+                return slept, await score
+            finally:
+                await service.stop()
+
+        with mock.patch("solvers.validation_service.score_move_masks", slow_score):
+            slept, score = asyncio.run(main())
+        self.assertLess(slept, 0.3)
+        self.assertEqual(score["id"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,5 @@
-import sys
-import os
 import time
 
-# Adjust sys.path to allow importing from solvers directory
-sys.path.append(os.path.abspath(os.path.dirname(__file__)))
-
 # Attempt to import only the heuristic solver
 try:
     from solvers.heuristic import solve_k4_n_greater_equal_6_heuristic